@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+"""
+oauthlib.oauth2.rfc6749.grant_types
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+from __future__ import unicode_literals, absolute_import
+
+from .authorization_code import AuthorizationCodeGrant
+from .implicit import ImplicitGrant
+from .resource_owner_password_credentials import ResourceOwnerPasswordCredentialsGrant
+from .client_credentials import ClientCredentialsGrant
+from .refresh_token import RefreshTokenGrant
+from .openid_connect import OpenIDConnectBase
+from .openid_connect import OpenIDConnectAuthCode
+from .openid_connect import OpenIDConnectImplicit
+from .openid_connect import OpenIDConnectHybrid
+from .openid_connect import OIDCNoPrompt
+from .openid_connect import AuthCodeGrantDispatcher
@@ -0,0 +1,105 @@
+"""Compare the minidom response decoder with the single-pass decoder.
+
+Usage:
+
+    $ python -m benchmarks.decoder [--invoices 20000] [--line-items 3]
+
+Each decoder runs in a fresh subprocess so that the peak memory
+(maximum resident set size) reported for it isn't polluted by the
+other decoder.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import resource
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from xml.dom.minidom import parseString
+
+from mock import Mock
+
+from xero import Xero
+
+from . import payloads
+
+
+def decode_minidom(manager, content):
+    dom = parseString(content)
+    return manager._get_results(manager.convert_to_dict(manager.walk_dom(dom)))
+
+
+def decode_single_pass(manager, content):
+    return manager._get_results(manager.decoder.decode(content))
+
+
+DECODERS = {
+    'minidom': decode_minidom,
+    'single-pass': decode_single_pass,
+}
+
+
+def measure(decoder, path, repeat):
+    "Decode the payload in this process; returns timing and memory"
+    manager = Xero(Mock()).invoices
+    with open(path, 'rb') as payload:
+        content = payload.read()
+    decode = DECODERS[decoder]
+
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for i in range(repeat):
+        start = time.time()
+        result = decode(manager, content)
+        timings.append(time.time() - start)
+        del result
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        'decoder': decoder,
+        'bytes': len(content),
+        'best': min(timings),
+        'peak_kb': peak - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=20000)
+    parser.add_argument('--line-items', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--decoder', choices=sorted(DECODERS), help=argparse.SUPPRESS)
+    parser.add_argument('--payload', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.decoder:
+        print(json.dumps(measure(args.decoder, args.payload, args.repeat)))
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    try:
+        with os.fdopen(fd, 'wb') as payload:
+            payload.write(payloads.invoices(args.invoices, args.line_items))
+
+        print('%d invoices, %d line items each' % (args.invoices, args.line_items))
+        for decoder in sorted(DECODERS):
+            output = subprocess.check_output([
+                sys.executable, '-m', 'benchmarks.decoder',
+                '--repeat', str(args.repeat),
+                '--decoder', decoder,
+                '--payload', path,
+            ])
+            result = json.loads(output)
+            print('%-12s %8.3fs  peak +%8d KB  (%d bytes)' % (
+                result['decoder'], result['best'], result['peak_kb'], result['bytes']))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
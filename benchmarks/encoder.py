@@ -0,0 +1,62 @@
+"""Compare the ElementTree request serializer with the streaming encoder.
+
+Usage:
+
+    $ python -m benchmarks.encoder [--invoices 5000] [--line-items 5]
+
+Serializes the body of a request saving a list of invoices, decoded
+(without any conversion) from a synthetic Invoices response.
+"""
+from __future__ import print_function
+
+import argparse
+import time
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from mock import Mock
+
+from xero import Xero
+
+from . import payloads
+
+
+def encode_elementtree(manager, data):
+    root = Element(manager.name)
+    for d in data:
+        manager.dict_to_xml(SubElement(root, manager.singular), d)
+    return tostring(root)
+
+
+def encode_streaming(manager, data):
+    return manager.encoder.encode(manager.name, manager.singular, data)
+
+
+ENCODERS = [
+    ('elementtree', encode_elementtree),
+    ('streaming', encode_streaming),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=5000)
+    parser.add_argument('--line-items', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    manager = Xero(Mock(), decoding='raw').invoices
+    content = payloads.invoices(args.invoices, args.line_items)
+    data = manager._get_results(manager.decoder.decode(content))
+    print('%d invoices, %d line items each' % (args.invoices, args.line_items))
+
+    for name, encode in ENCODERS:
+        timings = []
+        for i in range(args.repeat):
+            start = time.time()
+            body = encode(manager, data)
+            timings.append(time.time() - start)
+        print('%-12s %8.3fs  (%d bytes)' % (name, min(timings), len(body)))
+
+
+if __name__ == '__main__':
+    main()
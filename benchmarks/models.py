@@ -0,0 +1,89 @@
+"""Compare the memory held by records decoded as dicts and as models.
+
+Usage:
+
+    $ python -m benchmarks.models [--invoices 20000] [--line-items 5]
+
+Each representation is decoded (and kept) in a fresh subprocess; the
+growth of its maximum resident set size is the memory the records take.
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock import Mock
+
+from xero import Xero
+
+from . import payloads
+
+REPRESENTATIONS = {
+    'dicts': False,
+    'models': True,
+}
+
+
+def measure(representation, path):
+    "Decode the payload in this process, keeping the records"
+    manager = Xero(Mock(), models=REPRESENTATIONS[representation]).invoices
+    with open(path, 'rb') as payload:
+        content = payload.read()
+
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    records = manager._get_results(manager.decoder.decode(content))
+    elapsed = time.time() - start
+    del content
+    gc.collect()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        'representation': representation,
+        'records': len(records),
+        'time': elapsed,
+        'peak_kb': peak - baseline,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=20000)
+    parser.add_argument('--line-items', type=int, default=5)
+    parser.add_argument('--representation', choices=sorted(REPRESENTATIONS), help=argparse.SUPPRESS)
+    parser.add_argument('--payload', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.representation:
+        print(json.dumps(measure(args.representation, args.payload)))
+        return
+
+    fd, path = tempfile.mkstemp(suffix='.xml')
+    try:
+        with os.fdopen(fd, 'wb') as payload:
+            payload.write(payloads.invoices(args.invoices, args.line_items))
+
+        print('%d invoices, %d line items each' % (args.invoices, args.line_items))
+        for representation in sorted(REPRESENTATIONS):
+            output = subprocess.check_output([
+                sys.executable, '-m', 'benchmarks.models',
+                '--representation', representation,
+                '--payload', path,
+            ])
+            result = json.loads(output)
+            print('%-8s %8.3fs  peak +%8d KB' % (
+                result['representation'], result['time'], result['peak_kb']))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
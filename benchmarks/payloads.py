@@ -0,0 +1,225 @@
+"""Synthetic Xero API payloads for the benchmarks."""
+from datetime import date, datetime, timedelta
+import json
+import random
+import uuid
+from xml.etree import cElementTree
+
+from xero.schema import parse_datetime
+from xero.sync import to_utc
+
+RESPONSE_HEADER = (
+    u'<Response xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+    u'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+    u'  <Id>%s</Id>\n'
+    u'  <Status>OK</Status>\n'
+    u'  <ProviderName>PyXero Benchmarks</ProviderName>\n'
+    u'  <DateTimeUTC>2013-05-31T06:07:35.3732465Z</DateTimeUTC>\n'
+)
+
+
+INVOICE_STATUSES = (u'DRAFT', u'AUTHORISED', u'AUTHORISED', u'PAID')
+PHONE_TYPES = (u'DEFAULT', u'DDI', u'MOBILE', u'FAX')
+ADDRESS_TYPES = (u'POBOX', u'STREET')
+FIRST_NAMES = (u'Alice', u'Bruce', u'Chloe', u'Dinh', u'Emma', u'Farid', u'Grace', u'Hiroshi')
+LAST_NAMES = (u'Nguyen', u'Smith', u'Jones', u'Williams', u'Brown', u'Wilson', u'Taylor', u'Singh')
+CITIES = (u'Sydney', u'Melbourne', u'Brisbane', u'Perth', u'Adelaide', u'Hobart', u'Darwin')
+
+
+def _uuid(rand):
+    return unicode(uuid.UUID(int=rand.getrandbits(128)))
+
+
+def line_item_xml(rand, index):
+    quantity = rand.randint(1, 20)
+    amount = rand.randint(100, 100000) / 100.0
+    return (
+        u'        <LineItem>\n'
+        u'          <Description>Line item %d</Description>\n'
+        u'          <Quantity>%d.0000</Quantity>\n'
+        u'          <UnitAmount>%.2f</UnitAmount>\n'
+        u'          <TaxType>OUTPUT</TaxType>\n'
+        u'          <TaxAmount>%.2f</TaxAmount>\n'
+        u'          <LineAmount>%.2f</LineAmount>\n'
+        u'          <AccountCode>200</AccountCode>\n'
+        u'          <LineItemID>%s</LineItemID>\n'
+        u'        </LineItem>\n'
+    ) % (index, quantity, amount, amount * quantity / 10,
+         amount * quantity, _uuid(rand))
+
+
+def invoice_xml(rand, index, line_items):
+    status = rand.choice(INVOICE_STATUSES)
+    issued = date(2013, 1, 1) + timedelta(days=rand.randint(0, 365))
+    updated = datetime(2013, 1, 1) + timedelta(seconds=rand.randint(0, 3e7))
+    return u''.join([
+        u'    <Invoice>\n'
+        u'      <Contact>\n'
+        u'        <ContactID>%s</ContactID>\n'
+        u'        <Name>Customer %d</Name>\n'
+        u'      </Contact>\n'
+        u'      <Date>%sT00:00:00</Date>\n'
+        u'      <DueDate>%sT00:00:00</DueDate>\n'
+        u'      <Status>%s</Status>\n'
+        u'      <LineAmountTypes>Exclusive</LineAmountTypes>\n'
+        u'      <LineItems>\n' % (
+            _uuid(rand), index, issued.isoformat(),
+            (issued + timedelta(days=14)).isoformat(), status),
+        u''.join(line_item_xml(rand, i) for i in range(line_items)),
+        u'      </LineItems>\n'
+        u'      <SubTotal>100.00</SubTotal>\n'
+        u'      <TotalTax>10.00</TotalTax>\n'
+        u'      <Total>110.00</Total>\n'
+        u'      <UpdatedDateUTC>%s</UpdatedDateUTC>\n'
+        u'      <CurrencyCode>AUD</CurrencyCode>\n'
+        u'      <Type>ACCREC</Type>\n'
+        u'      <InvoiceID>%s</InvoiceID>\n'
+        u'      <InvoiceNumber>INV-%05d</InvoiceNumber>\n'
+        u'      <AmountDue>110.00</AmountDue>\n'
+        u'      <AmountPaid>0.00</AmountPaid>\n'
+        u'      <HasAttachments>false</HasAttachments>\n'
+        u'    </Invoice>\n' % (
+            updated.isoformat(), _uuid(rand), index),
+    ])
+
+
+def invoice_records(count, line_items=3, seed=0):
+    "The XML of `count` invoices"
+    rand = random.Random(seed)
+    return [invoice_xml(rand, i, line_items) for i in range(count)]
+
+
+def phone_xml(rand, phone_type):
+    return (
+        u'        <Phone>\n'
+        u'          <PhoneType>%s</PhoneType>\n'
+        u'          <PhoneNumber>%04d %04d</PhoneNumber>\n'
+        u'          <PhoneAreaCode>0%d</PhoneAreaCode>\n'
+        u'          <PhoneCountryCode>61</PhoneCountryCode>\n'
+        u'        </Phone>\n'
+    ) % (phone_type, rand.randint(0, 9999), rand.randint(0, 9999), rand.choice([2, 3, 7, 8]))
+
+
+def address_xml(rand, address_type):
+    return (
+        u'        <Address>\n'
+        u'          <AddressType>%s</AddressType>\n'
+        u'          <AddressLine1>%d %s Street</AddressLine1>\n'
+        u'          <City>%s</City>\n'
+        u'          <PostalCode>%04d</PostalCode>\n'
+        u'          <Country>Australia</Country>\n'
+        u'        </Address>\n'
+    ) % (address_type, rand.randint(1, 500), rand.choice(LAST_NAMES),
+         rand.choice(CITIES), rand.randint(2000, 7999))
+
+
+def contact_xml(rand, index, phones, addresses):
+    first, last = rand.choice(FIRST_NAMES), rand.choice(LAST_NAMES)
+    updated = datetime(2013, 1, 1) + timedelta(seconds=rand.randint(0, 3e7))
+    return u''.join([
+        u'    <Contact>\n'
+        u'      <ContactID>%s</ContactID>\n'
+        u'      <ContactNumber>C%05d</ContactNumber>\n'
+        u'      <ContactStatus>ACTIVE</ContactStatus>\n'
+        u'      <Name>%s %s %d</Name>\n'
+        u'      <FirstName>%s</FirstName>\n'
+        u'      <LastName>%s</LastName>\n'
+        u'      <EmailAddress>%s.%s@example.com</EmailAddress>\n'
+        u'      <Addresses>\n' % (
+            _uuid(rand), index, first, last, index, first, last, first.lower(), last.lower()),
+        u''.join(address_xml(rand, ADDRESS_TYPES[i % len(ADDRESS_TYPES)]) for i in range(addresses)),
+        u'      </Addresses>\n'
+        u'      <Phones>\n',
+        u''.join(phone_xml(rand, PHONE_TYPES[i % len(PHONE_TYPES)]) for i in range(phones)),
+        u'      </Phones>\n'
+        u'      <UpdatedDateUTC>%s</UpdatedDateUTC>\n'
+        u'      <IsSupplier>false</IsSupplier>\n'
+        u'      <IsCustomer>true</IsCustomer>\n'
+        u'      <HasAttachments>false</HasAttachments>\n'
+        u'    </Contact>\n' % updated.isoformat(),
+    ])
+
+
+def contact_records(count, phones=4, addresses=2, seed=0):
+    "The XML of `count` contacts, each with `phones` phones and `addresses` addresses"
+    rand = random.Random(seed)
+    return [contact_xml(rand, i, phones, addresses) for i in range(count)]
+
+
+def employee_xml(rand, index):
+    first, last = rand.choice(FIRST_NAMES), rand.choice(LAST_NAMES)
+    born = date(1950, 1, 1) + timedelta(days=rand.randint(0, 18000))
+    started = date(2005, 1, 1) + timedelta(days=rand.randint(0, 3000))
+    updated = datetime(2013, 1, 1) + timedelta(seconds=rand.randint(0, 3e7))
+    return (
+        u'    <Employee>\n'
+        u'      <EmployeeID>%s</EmployeeID>\n'
+        u'      <FirstName>%s</FirstName>\n'
+        u'      <LastName>%s</LastName>\n'
+        u'      <Status>ACTIVE</Status>\n'
+        u'      <Email>%s.%s.%d@example.com</Email>\n'
+        u'      <DateOfBirth>%sT00:00:00</DateOfBirth>\n'
+        u'      <StartDate>%sT00:00:00</StartDate>\n'
+        u'      <UpdatedDateUTC>%s</UpdatedDateUTC>\n'
+        u'    </Employee>\n'
+    ) % (_uuid(rand), first, last, first.lower(), last.lower(), index,
+         born.isoformat(), started.isoformat(), updated.isoformat())
+
+
+def employee_records(count, seed=0):
+    "The XML of `count` (payroll) employees"
+    rand = random.Random(seed)
+    return [employee_xml(rand, i) for i in range(count)]
+
+
+def response(collection, records, seed=0):
+    "A response (as UTF-8 bytes) holding the XML of some records"
+    return u''.join([
+        RESPONSE_HEADER % _uuid(random.Random(seed)),
+        u'  <%s>\n' % collection,
+        u''.join(records),
+        u'  </%s>\n' % collection,
+        u'</Response>\n',
+    ]).encode('utf-8')
+
+
+def invoices(count, line_items=3, seed=0):
+    "An Invoices response (as UTF-8 bytes) with `count` invoices"
+    return response(u'Invoices', invoice_records(count, line_items, seed), seed)
+
+
+def contacts(count, phones=4, addresses=2, seed=0):
+    "A Contacts response (as UTF-8 bytes) with `count` contacts"
+    return response(u'Contacts', contact_records(count, phones, addresses, seed), seed)
+
+
+# How to write the fields of the payloads in JSON
+JSON_ARRAYS = (u'Invoices', u'LineItems')
+JSON_DATES = (u'Date', u'DueDate', u'UpdatedDateUTC', u'DateTimeUTC')
+JSON_NUMBERS = (u'Quantity', u'UnitAmount', u'TaxAmount', u'LineAmount',
+                u'SubTotal', u'TotalTax', u'Total', u'AmountDue', u'AmountPaid')
+EPOCH = datetime(1970, 1, 1)
+
+
+def _json_value(element):
+    "An element of an XML payload, as Xero would write it in JSON"
+    if len(element):
+        if element.tag in JSON_ARRAYS:
+            return [_json_value(child) for child in element]
+        return dict((child.tag, _json_value(child)) for child in element)
+
+    text = element.text or u''
+    if element.tag in JSON_DATES:
+        moment = to_utc(parse_datetime(text)) - EPOCH
+        return u'/Date(%d+0000)/' % (moment.days * 86400000 + moment.seconds * 1000 + moment.microseconds // 1000)
+    if element.tag in JSON_NUMBERS:
+        return float(text)
+    if text in (u'true', u'false'):
+        return text == u'true'
+    return text
+
+
+def invoices_json(count, line_items=3, seed=0):
+    "The same Invoices response as invoices(), in JSON (as UTF-8 bytes)"
+    root = cElementTree.fromstring(invoices(count, line_items, seed))
+    return json.dumps(_json_value(root), ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,66 @@
+"""Measure the cost of converting field values while decoding.
+
+Usage:
+
+    $ python -m benchmarks.schema [--invoices 10000] [--line-items 5]
+
+Decodes an Invoices payload (50,000 line items by default) with the
+single-pass decoder, using:
+
+ * none     - no field conversion at all, as a baseline
+ * dateutil - dateutil's general purpose parser for every timestamp
+ * native   - the compiled schema, with its ISO 8601 fast path
+ * typed    - the same, also converting amounts into Decimals
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+from dateutil.parser import parse
+
+from xero.decoder import XMLDecoder
+from xero.manager import Manager
+from xero.schema import CONVERTERS, Schema
+
+from . import payloads
+
+DATEUTIL_CONVERTERS = dict(
+    CONVERTERS,
+    datetime=parse,
+    date=lambda val: parse(val).date(),
+)
+
+SCHEMAS = [
+    ('none', Schema(u'Invoice', Manager.MULTI_LINES, {})),
+    ('dateutil', Schema(u'Invoice', Manager.MULTI_LINES, Manager._field_types(),
+                        converters=DATEUTIL_CONVERTERS)),
+    ('native', Schema(u'Invoice', Manager.MULTI_LINES, Manager._field_types())),
+    ('typed', Schema(u'Invoice', Manager.MULTI_LINES,
+                     Manager._field_types(('decimal', 'boolean', 'datetime', 'date')))),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=10000)
+    parser.add_argument('--line-items', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    content = payloads.invoices(args.invoices, args.line_items)
+    print('%d invoices, %d line items each (%d bytes)' % (
+        args.invoices, args.line_items, len(content)))
+
+    for name, schema in SCHEMAS:
+        decoder = XMLDecoder(schema)
+        timings = []
+        for i in range(args.repeat):
+            start = time.time()
+            decoder.decode(content)
+            timings.append(time.time() - start)
+        print('%-10s %8.3fs' % (name, min(timings)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Compare calls/sec with and without a pooled, keep-alive HTTP session.
+
+Usage:
+
+    $ python -m benchmarks.session [--calls 500]
+
+"per-call" reproduces the old behavior of issuing every request through
+the module level requests functions, which open a new connection for
+each call. "pooled" uses the Session a Xero instance shares between its
+managers. The stub server is plain HTTP on localhost, so this only
+measures the cost of the TCP handshake; against api.xero.com each new
+connection also pays for a TLS handshake and a real round trip.
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import requests
+
+from xero.manager import Manager
+from xero.transport import make_session
+
+from . import payloads
+from .stub import StubServer
+
+
+def run(url, session, calls):
+    manager = Manager(u'Invoices', None, url=url, session=session)
+    start = time.time()
+    for i in range(calls):
+        manager.all()
+    elapsed = time.time() - start
+    if session is not requests:
+        session.close()
+    return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--invoices', type=int, default=1)
+    args = parser.parse_args()
+
+    with StubServer(payloads.invoices(args.invoices)) as server:
+        for label, session in (('per-call', requests), ('pooled', make_session())):
+            print('%-10s %8.1f calls/sec' % (label, run(server.url, session, args.calls)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Measure the time taken to import xero and construct a client.
+
+Usage:
+
+    $ python -m benchmarks.startup [--repeat 10] [--constructions 1000]
+          [--against ../pyxero-0.5.2 ...]
+
+Each measurement is made in a fresh interpreter (the best of `repeat`
+is reported): the time taken by `import xero`, the number of modules
+it imports (and which of the heavier dependencies are among them), and
+the time taken to construct a Xero client and get a single manager for
+the first time, as a short-lived process would (including anything
+imported on the way). Then, the average time taken to construct a
+client, and to construct one and get a manager, once everything has
+been imported. With --against, the same measurements are made with the
+xero package of other checkouts.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from timeit import default_timer as timer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependencies that are expensive to import, and needn't be imported
+# until they're used.
+HEAVY_MODULES = ('requests', 'dateutil', 'xml.dom.minidom', 'multiprocessing.pool', 'uuid',
+                 'sqlite3', 'cProfile', 'xml.etree.ElementTree')
+
+
+class Credentials(object):
+    oauth = None
+    oauth_token = None
+
+
+def measure(checkout, constructions):
+    "Import xero and construct clients in this process; returns timings"
+    sys.path.insert(0, checkout)
+    before = set(sys.modules)
+    start = timer()
+    import xero
+    imported = timer() - start
+    modules = [name for name in set(sys.modules) - before if sys.modules[name] is not None]
+
+    from xero import Xero
+    credentials = Credentials()
+    start = timer()
+    Xero(credentials).invoices
+    first = timer() - start
+
+    start = timer()
+    for i in range(constructions):
+        Xero(credentials)
+    constructed = timer() - start
+
+    start = timer()
+    for i in range(constructions):
+        Xero(credentials).invoices
+    used = timer() - start
+
+    return {
+        'version': getattr(xero, 'VERSION', None),
+        'import': imported,
+        'modules': len(modules),
+        'heavy': [name for name in HEAVY_MODULES if name in modules],
+        'first': first,
+        'construct': constructed / constructions,
+        'manager': used / constructions,
+    }
+
+
+def run(checkout, constructions):
+    "Measure in a fresh interpreter, with the xero package of `checkout`"
+    output = subprocess.check_output([
+        sys.executable, '-m', 'benchmarks.startup',
+        '--worker', checkout,
+        '--constructions', str(constructions),
+    ], cwd=ROOT)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--constructions', type=int, default=1000)
+    parser.add_argument('--against', action='append', default=[], metavar='CHECKOUT',
+                        help='also measure the xero package of another checkout (may be repeated)')
+    parser.add_argument('--worker', metavar='CHECKOUT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args.worker, args.constructions)))
+        return
+
+    print('%-16s %8s %10s %8s %10s %12s %12s  %s' % (
+        'Checkout', 'Version', 'Import ms', 'Modules', 'First ms',
+        'Xero() us', '+manager us', 'Heavy modules imported by import'))
+    for checkout in [ROOT] + [os.path.abspath(path) for path in args.against]:
+        results = [run(checkout, args.constructions) for i in range(args.repeat)]
+        best = dict((key, min(result[key] for result in results))
+                    for key in ('import', 'first', 'construct', 'manager'))
+        print('%-16s %8s %10.1f %8d %10.1f %12.1f %12.1f  %s' % (
+            os.path.basename(checkout)[:16], results[0]['version'], best['import'] * 1000,
+            results[0]['modules'], best['first'] * 1000, best['construct'] * 1e6, best['manager'] * 1e6,
+            ', '.join(results[0]['heavy']) or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""A local HTTP server that stands in for the Xero API in benchmarks.
+
+Usage:
+
+    >>> records = {u'Invoices': payloads.invoice_records(1000)}
+    >>> with StubServer(records=records, rate_limit=(60, 1.0)) as server:
+    ...     manager = Manager(u'Invoices', None, url=server.api_url)
+
+With `records` (a map of endpoint names onto the XML of their records),
+it answers like api.xro/2.0 and payroll.xro/1.0 do: a collection, or a
+single record by ID; filtered by the `where` clauses that test for
+equality (others are ignored), and by `IDs`; in pages of `page_size`
+records when a `page` is requested; and with the records posted or put
+to an endpoint (which aren't stored). With `rate_limit`, (requests,
+seconds), requests beyond that many in any window of that length are
+refused with a 503, as Xero does.
+
+With a `payload` instead, that payload is the response to every GET.
+"""
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from collections import deque
+import math
+import re
+from SocketServer import ThreadingMixIn
+import threading
+import time
+from urlparse import parse_qs, urlparse
+
+from .payloads import RESPONSE_HEADER
+
+# The prefixes of the APIs, after the host (see xero.constants)
+API_PATHS = ('/api.xro/2.0', '/payroll.xro/1.0')
+
+PAGE_SIZE = 100
+
+RATE_LIMITED = 'oauth_problem=rate%20limit%20exceeded&oauth_problem_advice=please%20wait%20before%20retrying%20the%20xero%20api'
+NOT_FOUND = "The resource you're looking for cannot be found"
+
+# A where clause we can evaluate, e.g. Status=="PAID" or Contact.Name=="X"
+EQUALS = re.compile(r'^\s*([\w.]+)\s*==\s*"?([^"]*)"?\s*$')
+
+
+class Endpoint(object):
+    "The records held by an endpoint of the stub"
+
+    def __init__(self, name, records, page_size=PAGE_SIZE):
+        self.name = name
+        self.page_size = page_size
+        self.singular = name[:-1] if name.endswith('s') else name
+        self.records = records
+        # The records by (lower case) ID
+        id_pattern = re.compile(r'<%sID>([^<]+)</%sID>' % (self.singular, self.singular))
+        self.ids = {}
+        for record in records:
+            match = id_pattern.search(record)
+            if match:
+                self.ids[match.group(1).lower()] = record
+
+    def select(self, query):
+        "The records matching a query string"
+        records = self.records
+        if 'IDs' in query:
+            ids = [id.lower() for id in query['IDs'][0].split(',')]
+            records = [self.ids[id] for id in ids if id in self.ids]
+
+        for clause in query.get('where', [''])[0].split('&&'):
+            match = EQUALS.match(clause)
+            if match:
+                field = match.group(1).split('.')[-1]
+                element = u'<%s>%s</%s>' % (field, match.group(2), field)
+                records = [record for record in records if element in record]
+
+        if 'page' in query:
+            page = int(query['page'][0])
+            records = records[(page - 1) * self.page_size:page * self.page_size]
+        return records
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1, so that clients can keep connections alive.
+    protocol_version = 'HTTP/1.1'
+    # Headers are written one at a time; without this, Nagle's
+    # algorithm stalls every response on a kept-alive connection.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.throttled():
+            return
+        if self.server.payload is not None:
+            return self.respond(200, self.server.payload)
+
+        endpoint, id, query = self.route()
+        if endpoint is None:
+            return self.respond(404, NOT_FOUND, 'text/html')
+        if id is not None:
+            record = endpoint.ids.get(id.lower())
+            if record is None:
+                return self.respond(404, NOT_FOUND, 'text/html')
+            records = [record]
+        else:
+            records = endpoint.select(query)
+        self.respond(200, self.collection(endpoint.name, records))
+
+    def do_POST(self):
+        if self.throttled():
+            return
+        body = self.rfile.read(int(self.headers.getheader('content-length') or 0))
+        endpoint, id, query = self.route()
+        if endpoint is None:
+            return self.respond(404, NOT_FOUND, 'text/html')
+        # Echo the records, as Xero does once they're saved.
+        xml = parse_qs(body).get('xml', [''])[0].decode('utf-8')
+        if xml.startswith(u'<%s>' % endpoint.name):
+            xml = xml[len(endpoint.name) + 2:-len(endpoint.name) - 3]
+        self.respond(200, self.collection(endpoint.name, [xml]))
+
+    do_PUT = do_POST
+
+    def route(self):
+        "The Endpoint, record ID (if any) and query of the request"
+        url = urlparse(self.path)
+        for prefix in API_PATHS:
+            if url.path.startswith(prefix + '/'):
+                parts = url.path[len(prefix) + 1:].split('/')
+                endpoint = self.server.endpoints.get(parts[0])
+                id = parts[1] if len(parts) > 1 else None
+                return endpoint, id, parse_qs(url.query)
+        return None, None, None
+
+    def throttled(self):
+        "Refuse the request (with a 503) if it exceeds the rate limit"
+        retry_after = self.server.throttle()
+        if retry_after is None:
+            return False
+        if self.command in ('POST', 'PUT'):
+            self.rfile.read(int(self.headers.getheader('content-length') or 0))
+        self.respond(503, RATE_LIMITED, 'text/html', {'Retry-After': str(retry_after)})
+        return True
+
+    def collection(self, name, records):
+        return u''.join([
+            RESPONSE_HEADER % u'',
+            u'  <%s>\n' % name,
+            u''.join(records),
+            u'  </%s>\n' % name,
+            u'</Response>\n',
+        ]).encode('utf-8')
+
+    def respond(self, status, body, content_type='text/xml; charset=utf-8', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload=None, handler=StubHandler, records=None, rate_limit=None,
+                 page_size=PAGE_SIZE):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.payload = payload
+        self.endpoints = {}
+        for name, endpoint_records in (records or {}).items():
+            self.endpoints[name] = Endpoint(name, endpoint_records, page_size)
+
+        self.rate_limit = rate_limit
+        self.requests = deque()
+        self.lock = threading.Lock()
+        # The number of requests received, and refused
+        self.received = 0
+        self.refused = 0
+
+    @property
+    def url(self):
+        return 'http://%s:%d' % self.server_address
+
+    @property
+    def api_url(self):
+        return self.url + API_PATHS[0]
+
+    @property
+    def payroll_url(self):
+        return self.url + API_PATHS[1]
+
+    def throttle(self):
+        """Count a request against the rate limit. Returns None if it's
+        allowed, or the number of seconds to wait if not."""
+        with self.lock:
+            self.received += 1
+            if not self.rate_limit:
+                return None
+            limit, window = self.rate_limit
+            now = time.time()
+            while self.requests and self.requests[0] <= now - window:
+                self.requests.popleft()
+            if len(self.requests) < limit:
+                self.requests.append(now)
+                return None
+            self.refused += 1
+            return int(math.ceil(self.requests[0] + window - now))
+
+    def __enter__(self):
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
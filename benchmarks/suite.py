@@ -0,0 +1,242 @@
+"""Measure throughput, latency and memory of API calls against a local stub of Xero.
+
+Usage:
+
+    $ python -m benchmarks.suite [--invoices 1000] [--line-items 3] [--contacts 1000]
+          [--calls 20] [--rate-limit 60 --rate-window 60] [--only Invoices.get]
+          [--decode-processes 4]
+          [--against ../pyxero-0.5.2 ...] [--json]
+
+A stub server (see benchmarks.stub) is loaded with synthetic invoices,
+contacts and payroll employees, and each benchmark makes `calls` calls
+to it: getting an invoice, all invoices, filtered invoices, all
+contacts, saving a batch of contacts, and all employees. For each, the
+throughput, the latency percentiles, the number of requests refused by
+the rate limit, and the peak memory (the growth of the maximum
+resident set size) are reported.
+
+Every benchmark runs in a fresh subprocess, so that its peak memory
+isn't polluted by the others. With --against, the same benchmarks are
+also run with the xero package of another checkout (e.g. one made with
+`git worktree add ../pyxero-0.5.2 v0.5.2`), against the same stub, to
+compare versions. Only the Manager API is used, so any version can be
+measured; except with --decode-processes, which decodes responses in a
+pool of that many processes (with a version that supports it).
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def contact(index):
+    "A contact to save"
+    return {
+        'Name': u'Benchmark contact %d' % index,
+        'EmailAddress': u'contact%d@example.com' % index,
+        'Addresses': [
+            {'AddressType': 'POBOX', 'AddressLine1': u'PO Box %d' % index, 'City': u'Sydney'},
+            {'AddressType': 'STREET', 'AddressLine1': u'%d George Street' % index, 'City': u'Sydney'},
+        ],
+        'Phones': [
+            {'PhoneType': 'DEFAULT', 'PhoneNumber': u'9%03d 0000' % (index % 1000), 'PhoneAreaCode': u'02'},
+            {'PhoneType': 'MOBILE', 'PhoneNumber': u'0400 %03d 000' % (index % 1000)},
+        ],
+    }
+
+
+def get_invoice(manager, config):
+    ids = config['ids']
+    return lambda i: manager.get(ids[i % len(ids)])
+
+
+def get_all(manager, config):
+    return lambda i: manager.all()
+
+
+def filter_invoices(manager, config):
+    return lambda i: manager.filter(Status='PAID')
+
+
+def save_contacts(manager, config):
+    contacts = [contact(j) for j in range(config['save_batch'])]
+    return lambda i: manager.save(contacts)
+
+
+# Each benchmark: name, endpoint, API ('api' or 'payroll'), and a
+# function of the manager (and configuration) returning the call to
+# make, as a function of the call's index.
+BENCHMARKS = [
+    ('Invoices.get', u'Invoices', 'api', get_invoice),
+    ('Invoices.all', u'Invoices', 'api', get_all),
+    ('Invoices.filter', u'Invoices', 'api', filter_invoices),
+    ('Contacts.all', u'Contacts', 'api', get_all),
+    ('Contacts.save', u'Contacts', 'api', save_contacts),
+    ('Employees.all', u'Employees', 'payroll', get_all),
+]
+
+
+def retry_after(exception):
+    "How long Xero asked us to wait before retrying (in seconds)"
+    headers = getattr(getattr(exception, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def percentile(values, fraction):
+    "The nearest-rank percentile of a sorted list"
+    index = max(int(round(fraction * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def measure(config):
+    "Run a benchmark in this process; returns timing and memory"
+    # The xero package of the checkout being measured.
+    sys.path.insert(0, config['checkout'])
+    from xero.manager import Manager
+    import xero
+
+    name, endpoint, api, setup = [b for b in BENCHMARKS if b[0] == config['benchmark']][0]
+    options = {}
+    if config['decode_processes']:
+        from multiprocessing import Pool
+        options['decode_pool'] = Pool(config['decode_processes'])
+    manager = Manager(endpoint, None, url=config['%s_url' % api], **options)
+    call = setup(manager, config)
+
+    gc.collect()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    latencies = []
+    start = time.time()
+    for i in range(config['calls']):
+        began = time.time()
+        while True:
+            try:
+                result = call(i)
+                break
+            except Exception as e:
+                # Versions without retries raise the rate limit error.
+                if type(e).__name__ != 'XeroRateLimitExceeded':
+                    raise
+                time.sleep(retry_after(e))
+        latencies.append(time.time() - began)
+        del result
+    elapsed = time.time() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    latencies.sort()
+    return {
+        'benchmark': name,
+        'version': getattr(xero, 'VERSION', None),
+        'calls': len(latencies),
+        'throughput': len(latencies) / elapsed,
+        'p50': percentile(latencies, 0.5),
+        'p90': percentile(latencies, 0.9),
+        'p99': percentile(latencies, 0.99),
+        'peak_kb': peak - baseline,
+    }
+
+
+def run(server, checkout, name, config):
+    "Run a benchmark in a subprocess, with the xero package of `checkout`"
+    config = dict(config, checkout=checkout, benchmark=name)
+    refused = server.refused
+    worker = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.suite', '--worker'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=ROOT,
+    )
+    output, error = worker.communicate(json.dumps(config))
+    if worker.returncode:
+        raise RuntimeError('%s failed in %s' % (name, checkout))
+    result = json.loads(output)
+    result['checkout'] = checkout
+    result['throttled'] = server.refused - refused
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=1000)
+    parser.add_argument('--line-items', type=int, default=3)
+    parser.add_argument('--contacts', type=int, default=1000)
+    parser.add_argument('--phones', type=int, default=4)
+    parser.add_argument('--addresses', type=int, default=2)
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--save-batch', type=int, default=50,
+                        help='the number of contacts saved by each call')
+    parser.add_argument('--rate-limit', type=int, default=0,
+                        help='the number of requests the stub allows per window (default: unlimited)')
+    parser.add_argument('--rate-window', type=float, default=60.0,
+                        help='the length of the rate limit window, in seconds')
+    parser.add_argument('--decode-processes', type=int, default=0,
+                        help='decode responses in a pool of this many processes')
+    parser.add_argument('--only', action='append', choices=[b[0] for b in BENCHMARKS],
+                        help='run only this benchmark (may be repeated)')
+    parser.add_argument('--against', action='append', default=[], metavar='CHECKOUT',
+                        help='also measure the xero package of another checkout (may be repeated)')
+    parser.add_argument('--json', action='store_true', help='report the results as JSON')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(json.loads(sys.stdin.read()))))
+        return
+
+    # Only the parent needs the stub (and the current checkout).
+    from . import payloads
+    from .stub import StubServer
+
+    records = {
+        u'Invoices': payloads.invoice_records(args.invoices, args.line_items),
+        u'Contacts': payloads.contact_records(args.contacts, args.phones, args.addresses),
+        u'Employees': payloads.employee_records(args.employees),
+    }
+    rate_limit = (args.rate_limit, args.rate_window) if args.rate_limit else None
+    checkouts = [ROOT] + [os.path.abspath(path) for path in args.against]
+
+    results = []
+    with StubServer(records=records, rate_limit=rate_limit) as server:
+        config = {
+            'api_url': server.api_url,
+            'payroll_url': server.payroll_url,
+            'calls': args.calls,
+            'save_batch': args.save_batch,
+            'decode_processes': args.decode_processes,
+            'ids': sorted(server.endpoints[u'Invoices'].ids)[:100],
+        }
+        if not args.json:
+            print('%d invoices (%d line items each), %d contacts (%d phones, %d addresses), %d employees' % (
+                args.invoices, args.line_items, args.contacts, args.phones, args.addresses, args.employees))
+            print('%-16s %-16s %8s %6s %10s %9s %9s %9s %9s %10s' % (
+                'Benchmark', 'Checkout', 'Version', 'Calls', 'Calls/sec',
+                'p50 ms', 'p90 ms', 'p99 ms', 'Throttled', 'Peak +KB'))
+
+        for name, endpoint, api, setup in BENCHMARKS:
+            if args.only and name not in args.only:
+                continue
+            for checkout in checkouts:
+                result = run(server, checkout, name, config)
+                results.append(result)
+                if not args.json:
+                    print('%-16s %-16s %8s %6d %10.1f %9.1f %9.1f %9.1f %9d %10d' % (
+                        name, os.path.basename(checkout)[:16], result['version'], result['calls'],
+                        result['throughput'], result['p50'] * 1000, result['p90'] * 1000,
+                        result['p99'] * 1000, result['throttled'], result['peak_kb']))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
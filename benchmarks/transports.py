@@ -0,0 +1,44 @@
+"""Compare decoding the same response requested in XML and in JSON.
+
+Usage:
+
+    $ python -m benchmarks.transports [--invoices 10000] [--line-items 5]
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+from mock import Mock
+
+from xero import Xero
+
+from . import payloads
+
+FORMATS = [
+    ('xml', payloads.invoices),
+    ('json', payloads.invoices_json),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=10000)
+    parser.add_argument('--line-items', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print('%d invoices, %d line items each' % (args.invoices, args.line_items))
+    for format, payload in FORMATS:
+        manager = Xero(Mock(), format=format).invoices
+        content = payload(args.invoices, args.line_items)
+        timings = []
+        for i in range(args.repeat):
+            start = time.time()
+            manager._get_results(manager.decoder.decode(content))
+            timings.append(time.time() - start)
+        print('%-5s %8.3fs  (%d bytes)' % (format, min(timings), len(content)))
+
+
+if __name__ == '__main__':
+    main()
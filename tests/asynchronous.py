@@ -0,0 +1,45 @@
+from __future__ import unicode_literals
+
+import unittest
+
+from mock import Mock, patch
+
+from xero.asynchronous import AsyncXero
+from xero.exceptions import *
+
+
+class AsyncXeroTest(unittest.TestCase):
+    def setUp(self):
+        self.xero = AsyncXero(Mock(), workers=2)
+
+    def tearDown(self):
+        self.xero.close()
+
+    @patch('requests.Session.get')
+    def test_get(self, r_get):
+        "Calls return a result that can be waited on"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8', text="""<Response>
+  <Status>OK</Status>
+  <Contacts>
+    <Contact>
+      <ContactID>755f1475-d255-43a8-bedc-5ea7fd26c71f</ContactID>
+      <Name>Yarra Transport</Name>
+    </Contact>
+  </Contacts>
+</Response>""")
+
+        result = self.xero.contacts.get('755f1475-d255-43a8-bedc-5ea7fd26c71f')
+
+        contact = result.get(timeout=5)
+        self.assertEqual(contact['Name'], 'Yarra Transport')
+        self.assertEqual(r_get.call_args[0][0], 'https://api.xero.com/api.xro/2.0/Contacts/755f1475-d255-43a8-bedc-5ea7fd26c71f')
+
+    @patch('requests.Session.get')
+    def test_error(self, r_get):
+        "Errors are raised when the result is collected"
+        r_get.return_value = Mock(status_code=404, text='The resource you\'re looking for cannot be found')
+
+        result = self.xero.invoices.get('deadbeef')
+
+        with self.assertRaises(XeroNotFound):
+            result.get(timeout=5)
@@ -7,7 +7,7 @@ from xero.exceptions import *
 
 
 class PublicCredentialsTest(unittest.TestCase):
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_initial_constructor(self, r_post):
         "Initial construction causes a requst to get a request token"
         r_post.return_value = Mock(status_code=200, text='oauth_token=token&oauth_token_secret=token_secret')
@@ -28,7 +28,7 @@ class PublicCredentialsTest(unittest.TestCase):
             'verified': False
         })
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_bad_credentials(self, r_post):
         "Initial construction with bad credentials raises an exception"
         r_post.return_value = Mock(status_code=401, text='oauth_problem=consumer_key_unknown&oauth_problem_advice=Consumer%20key%20was%20not%20recognised')
@@ -39,7 +39,7 @@ class PublicCredentialsTest(unittest.TestCase):
                 consumer_secret='unknown'
             )
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_unvalidated_constructor(self, r_post):
         "Credentials with an unverified request token can be constructed"
         credentials = PublicCredentials(
@@ -60,7 +60,7 @@ class PublicCredentialsTest(unittest.TestCase):
         # No HTTP requests were made
         self.assertFalse(r_post.called)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_validated_constructor(self, r_post):
         "A validated set of credentials can be reconstructed"
         credentials = PublicCredentials(
@@ -87,7 +87,7 @@ class PublicCredentialsTest(unittest.TestCase):
         # No HTTP requests were made
         self.assertFalse(r_post.called)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_url(self, r_post):
         "The request token URL can be obtained"
         r_post.return_value = Mock(status_code=200, text='oauth_token=token&oauth_token_secret=token_secret')
@@ -99,7 +99,7 @@ class PublicCredentialsTest(unittest.TestCase):
 
         self.assertEquals(credentials.url, 'https://api.xero.com/oauth/Authorize?oauth_token=token')
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_verify(self, r_post):
         "Unverfied credentials can be verified"
         r_post.return_value = Mock(status_code=200, text='oauth_token=verified_token&oauth_token_secret=verified_token_secret')
@@ -129,7 +129,7 @@ class PublicCredentialsTest(unittest.TestCase):
         except XeroNotVerified:
             self.fail('Credentials should have been verified')
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_verify_failure(self, r_post):
         "If verification credentials are bad, an error is raised"
         r_post.return_value = Mock(status_code=401, text='oauth_problem=bad_verifier&oauth_problem_advice=The consumer was denied access to this resource.')
@@ -0,0 +1,212 @@
+from __future__ import unicode_literals
+
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.cache import ClientCache, FileCache, MemoryCache
+from xero.manager import Manager
+
+
+class CacheTests(object):
+    "Tests that apply to every cache backend"
+
+    def test_get_set(self):
+        "Values can be cached, replaced and deleted"
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.set('key', b'value', 60)
+        self.assertEqual(self.cache.get('key'), b'value')
+        self.cache.set('key', b'other', 60)
+        self.assertEqual(self.cache.get('key'), b'other')
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+
+    @patch('time.time')
+    def test_expiry(self, time):
+        "Values expire after their TTL"
+        time.return_value = 1000.0
+        self.cache.set('key', b'value', 60)
+        time.return_value = 1059.0
+        self.assertEqual(self.cache.get('key'), b'value')
+        time.return_value = 1060.0
+        self.assertIsNone(self.cache.get('key'))
+
+
+class MemoryCacheTest(CacheTests, unittest.TestCase):
+    def setUp(self):
+        self.cache = MemoryCache(maxsize=2)
+
+    def test_lru(self):
+        "When full, the least recently used value is evicted"
+        self.cache.set('a', b'1', 60)
+        self.cache.set('b', b'2', 60)
+        self.cache.get('a')
+        self.cache.set('c', b'3', 60)
+
+        self.assertEqual(self.cache.get('a'), b'1')
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), b'3')
+
+
+class FileCacheTest(CacheTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = FileCache(self.directory, maxsize=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @patch('os.utime', side_effect=OSError(2, 'No such file or directory'))
+    def test_removed(self, utime):
+        "A value removed while it's being read is still returned"
+        self.cache.set('key', b'value', 60)
+        self.assertEqual(self.cache.get('key'), b'value')
+        self.assertTrue(utime.called)
+
+
+class ClientCacheTest(unittest.TestCase):
+    def test_client(self):
+        "Shared cache clients are given prefixed keys, and a timeout"
+        client = Mock()
+        cache = ClientCache(client)
+
+        cache.set('key', b'value', 60)
+        client.set.assert_called_once_with('pyxero:key', b'value', 60)
+        cache.get('key')
+        client.get.assert_called_once_with('pyxero:key')
+
+
+class ManagerCacheTest(unittest.TestCase):
+    TAX_RATES = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8', text="""<Response>
+  <Status>OK</Status>
+  <TaxRates>
+    <TaxRate><Name>GST on Income</Name><TaxType>OUTPUT</TaxType></TaxRate>
+    <TaxRate><Name>GST Free Income</Name><TaxType>EXEMPTOUTPUT</TaxType></TaxRate>
+  </TaxRates>
+</Response>""")
+
+    @patch('requests.Session.get')
+    def test_tenant(self, r_get):
+        "Caching requires a tenant, which isn't readable in the cache's keys"
+        r_get.return_value = self.TAX_RATES
+        credentials = Mock(oauth_token='secret-token')
+        self.assertRaises(ValueError, Xero, credentials, cache=MemoryCache())
+        self.assertRaises(ValueError, Manager, 'TaxRates', None, cache=MemoryCache())
+
+        cache = MemoryCache()
+        Xero(credentials, cache=cache, tenant='secret-org').taxrates.all()
+        self.assertTrue(cache.entries)
+        for key in cache.entries:
+            self.assertFalse('secret' in key)
+
+    @patch('requests.Session.get')
+    def test_cached(self, r_get):
+        "Results of reference data endpoints are cached per organisation"
+        r_get.return_value = self.TAX_RATES
+        cache = MemoryCache()
+        xero = Xero(Mock(), cache=cache, tenant='org1')
+
+        tax_rates = xero.taxrates.all()
+        tax_rates[0]['TaxType'] = 'INPUT'
+        self.assertEqual(xero.taxrates.all()[0]['TaxType'], 'OUTPUT')
+        self.assertEqual(r_get.call_count, 1)
+
+        # Other organisations have their own cache entries
+        Xero(Mock(), cache=cache, tenant='org2').taxrates.all()
+        self.assertEqual(r_get.call_count, 2)
+
+        # Other endpoints aren't cached unless a TTL is given
+        xero.contacts.all()
+        xero.contacts.all()
+        self.assertEqual(r_get.call_count, 4)
+
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
+    def test_invalidated(self, r_get, r_put):
+        "Saving to an endpoint invalidates its cached results"
+        r_get.return_value = self.TAX_RATES
+        r_put.return_value = self.TAX_RATES
+        xero = Xero(Mock(), cache=MemoryCache(), tenant='org1')
+
+        xero.taxrates.all()
+        xero.taxrates.put({'Name': 'GST on Expenses', 'TaxType': 'INPUT'})
+        xero.taxrates.all()
+        self.assertEqual(r_get.call_count, 2)
+
+    def contacts(self, *names, **kwargs):
+        return Mock(status_code=kwargs.get('status_code', 200),
+                    headers={'content-type': 'text/xml; charset=utf-8', 'date': 'Fri, 31 May 2013 06:10:00 GMT'},
+                    encoding='utf-8', text='<Response><Status>OK</Status><Contacts>%s</Contacts></Response>' % ''.join(
+                        '<Contact><ContactID>%s</ContactID><Name>%s</Name></Contact>' % (name[0], name)
+                        for name in names))
+
+    @patch('requests.Session.get')
+    def test_revalidated(self, r_get):
+        "Expired collections are revalidated, and changes merged into them"
+        r_get.side_effect = [
+            self.contacts('Alpha', 'Bravo'),
+            self.contacts(status_code=304),
+            self.contacts('Bob', 'Charlie'),
+        ]
+        xero = Xero(Mock(), cache=MemoryCache(), cache_ttls={'Contacts': 0}, tenant='org1')
+
+        self.assertEqual([c['Name'] for c in xero.contacts.all()], ['Alpha', 'Bravo'])
+        self.assertIsNone(r_get.call_args[1]['headers'])
+
+        self.assertEqual([c['Name'] for c in xero.contacts.all()], ['Alpha', 'Bravo'])
+        self.assertEqual(r_get.call_args[1]['headers'], {'If-Modified-Since': 'Fri, 31 May 2013 06:09:00 GMT'})
+
+        self.assertEqual([c['Name'] for c in xero.contacts.all()], ['Alpha', 'Bob', 'Charlie'])
+        self.assertEqual(r_get.call_count, 3)
+
+    @patch('time.time', return_value=1000000.0)
+    @patch('requests.Session.get')
+    def test_deleted(self, r_get, now):
+        "Revalidation doesn't keep deleted records forever; results are requested in full again"
+        r_get.side_effect = [
+            self.contacts('Alpha', 'Bravo'),
+            self.contacts('Alpha'),
+            self.contacts('Alpha'),
+        ]
+        xero = Xero(Mock(), cache=MemoryCache(), cache_ttls={'Contacts': 0}, tenant='org1')
+
+        self.assertEqual([c['Name'] for c in xero.contacts.all()], ['Alpha', 'Bravo'])
+        now.return_value += xero.contacts.CACHE_STALE_TTL / 2
+        self.assertEqual([c['Name'] for c in xero.contacts.all()], ['Alpha', 'Bravo'])
+        self.assertIn('If-Modified-Since', r_get.call_args[1]['headers'])
+
+        # Bravo was deleted; that's seen once the results are requested in full.
+        now.return_value += xero.contacts.CACHE_STALE_TTL / 2 + 1
+        self.assertEqual(xero.contacts.all(), {'ContactID': 'A', 'Name': 'Alpha'})
+        self.assertIsNone(r_get.call_args[1]['headers'])
+
+    @patch('requests.Session.get')
+    def test_record_revalidated(self, r_get):
+        "A revalidated record with no changes is kept"
+        r_get.side_effect = [
+            self.contacts('Alpha'),
+            self.contacts(),
+            self.contacts('Able'),
+        ]
+        xero = Xero(Mock(), cache=MemoryCache(), cache_ttls={'Contacts': 0}, tenant='org1')
+
+        self.assertEqual(xero.contacts.get('A'), {'ContactID': 'A', 'Name': 'Alpha'})
+        self.assertEqual(xero.contacts.get('A'), {'ContactID': 'A', 'Name': 'Alpha'})
+        self.assertEqual(r_get.call_args[1]['headers'], {'If-Modified-Since': 'Fri, 31 May 2013 06:09:00 GMT'})
+        self.assertEqual(xero.contacts.get('A'), {'ContactID': 'A', 'Name': 'Able'})
+
+    @patch('requests.Session.get')
+    def test_filtered_not_revalidated(self, r_get):
+        "Filtered collections are requested in full once they expire"
+        r_get.side_effect = [
+            self.contacts('Alpha', 'Bravo'),
+            self.contacts('Bravo'),
+        ]
+        xero = Xero(Mock(), cache=MemoryCache(), cache_ttls={'Contacts': 0}, tenant='org1')
+
+        xero.contacts.filter(Name__contains='a')
+        self.assertEqual(xero.contacts.filter(Name__contains='a'), {'ContactID': 'B', 'Name': 'Bravo'})
+        self.assertIsNone(r_get.call_args[1]['headers'])
@@ -0,0 +1,117 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+from datetime import date
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.columnar import Columns
+
+from .decoder import INVOICES, INVOICES_JSON, TRACKED_INVOICE
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.manager = Xero(Mock()).invoices
+        data = self.manager.decoder.decode(INVOICES.encode('utf-8'))
+        self.invoices = self.manager._get_results(data)
+
+    def columns(self, **kwargs):
+        return Columns(collections=self.manager.schema.collections, **kwargs).extend(self.invoices)
+
+    def test_flatten(self):
+        "Each record is a row; nested records are flattened, collections left out"
+        columns = self.columns()
+        self.assertEqual(len(columns), 2)
+        data = columns.to_pydict()
+        self.assertEqual(data['Contact.Name'], [None, 'John Sürname'])
+        self.assertEqual(data['Date'], [date(2013, 2, 1), date(2013, 3, 1)])
+        self.assertNotIn('LineItems', data)
+        self.assertFalse([name for name in data if name.startswith('LineItems.')])
+
+    def test_explode(self):
+        "Each item of an exploded collection is a row, repeating its record"
+        columns = self.columns(explode='LineItems')
+        self.assertEqual(len(columns), 3)
+        data = columns.to_pydict()
+        self.assertEqual(data['LineItems.Description'], ['Line item 1', 'Line item 2', 'Only line item'])
+        self.assertEqual(data['LineItems.Quantity'], ['1.0000', None, None])
+        self.assertEqual(data['Total'], ['850.00', '850.00', '10.00'])
+
+    def test_fields(self):
+        "The columns kept can be restricted"
+        columns = self.columns(fields=['InvoiceID', 'LineItems.UnitAmount'], explode='LineItems')
+        self.assertEqual(list(columns.to_pydict().items()), [
+            ('InvoiceID', ['0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f'] * 2 + ['a61fd1d9-8ee0-4d09-b3b1-9b1fce3b4a4c']),
+            ('LineItems.UnitAmount', ['100.00', '750.00', '10.00']),
+        ])
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        array = self.columns(explode='LineItems').to_numpy()
+        self.assertEqual(array.shape, (3,))
+        self.assertEqual(array['Date'].dtype, numpy.dtype('datetime64[D]'))
+        self.assertEqual(array['UpdatedDateUTC'].dtype, numpy.dtype('datetime64[us]'))
+        self.assertEqual(list(array['LineItems.Description']), ['Line item 1', 'Line item 2', 'Only line item'])
+
+    @unittest.skipIf(pyarrow is None, 'PyArrow is not installed')
+    def test_arrow(self):
+        table = self.columns(explode='LineItems').to_arrow()
+        self.assertEqual(table.num_rows, 3)
+
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'invoices.parquet')
+            self.columns(explode='LineItems').to_parquet(path)
+            self.assertTrue(pyarrow.parquet.read_table(path).equals(table))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_decode_columns(self):
+        "Columns appended to by the decoder hold the same as those of the decoded records"
+        for document in (INVOICES, TRACKED_INVOICE):
+            content = document.encode('utf-8')
+            records = list(self.manager.decoder.iterdecode([content], 'Invoices'))
+            for options in ({}, {'explode': 'LineItems'}, {'explode': 'Contact'}):
+                collections = self.manager.schema.collections
+                expected = Columns(collections=collections, **options).extend(records)
+                columns = Columns(collections=collections, **options)
+                count = self.manager.decoder.decode_columns([content[:50], content[50:]], 'Invoices', columns)
+                self.assertEqual(count, len(records))
+                self.assertEqual(len(columns), len(expected))
+                self.assertEqual(dict(columns.to_pydict()), dict(expected.to_pydict()))
+
+    @patch('requests.Session.get')
+    def test_manager(self, r_get):
+        "A manager streams every page of records into columns"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                                  iter_content=lambda size: [INVOICES.encode('utf-8')])
+
+        columns = Xero(Mock()).invoices.columns(explode='LineItems', Status='PAID')
+        self.assertIn('page=1', r_get.call_args[0][0])
+        self.assertTrue(r_get.call_args[1]['stream'])
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.to_pydict()['LineItems.Description'],
+                         ['Line item 1', 'Line item 2', 'Only line item'])
+        self.assertTrue(r_get.return_value.close.called)
+
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'application/json'},
+                                  iter_content=lambda size: [INVOICES_JSON.encode('utf-8')])
+        json = Xero(Mock(), format='json').invoices.columns(explode='LineItems', prefetch=1)
+        self.assertEqual(dict(json.to_pydict()), dict(columns.to_pydict()))
@@ -0,0 +1,279 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import unittest
+from xml.dom.minidom import parseString
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.manager import Manager
+
+
+INVOICES = """<Response xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <Id>5c6a2ef6-6a2d-4b87-8b5b-e0fe52b1b6f9</Id>
+  <Status>OK</Status>
+  <ProviderName>PyXero</ProviderName>
+  <DateTimeUTC>2013-05-31T06:07:35.3732465Z</DateTimeUTC>
+  <Invoices>
+    <Invoice>
+      <Contact>
+        <ContactID>3e776c4b-ea9e-4bb1-96be-6b0c7a71a37f</ContactID>
+      </Contact>
+      <Date>2013-02-01T00:00:00</Date>
+      <DueDate>2013-02-15T00:00:00</DueDate>
+      <Status>PAID</Status>
+      <LineItems>
+        <LineItem>
+          <Description>Line item 1</Description>
+          <Quantity>1.0000</Quantity>
+          <UnitAmount>100.00</UnitAmount>
+        </LineItem>
+        <LineItem>
+          <Description>Line item 2</Description>
+          <UnitAmount>750.00</UnitAmount>
+        </LineItem>
+      </LineItems>
+      <Total>850.00</Total>
+      <UpdatedDateUTC>2013-05-31T06:04:20.78</UpdatedDateUTC>
+      <FullyPaidOnDate xsi:nil="true" />
+      <Payments />
+      <InvoiceID>0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f</InvoiceID>
+    </Invoice>
+    <Invoice>
+      <Contact>
+        <ContactID>755f1475-d255-43a8-bedc-5ea7fd26c71f</ContactID>
+        <Name>John S\xfcrname</Name>
+      </Contact>
+      <Date>2013-03-01T00:00:00</Date>
+      <LineItems>
+        <LineItem>
+          <Description>Only line item</Description>
+          <UnitAmount>10.00</UnitAmount>
+        </LineItem>
+      </LineItems>
+      <Total>10.00</Total>
+      <InvoiceID>a61fd1d9-8ee0-4d09-b3b1-9b1fce3b4a4c</InvoiceID>
+    </Invoice>
+  </Invoices>
+</Response>
+"""
+
+SINGLE_CONTACT = """<Response>
+  <Id>dbb54b2b-8fdb-4277-ad03-2df50ce760fa</Id>
+  <Status>OK</Status>
+  <Contacts>
+    <Contact>
+      <ContactID>755f1475-d255-43a8-bedc-5ea7fd26c71f</ContactID>
+      <Name>Yarra Transport</Name>
+      <Phones>
+        <Phone>
+          <PhoneType>DDI</PhoneType>
+        </Phone>
+      </Phones>
+      <IsSupplier>false</IsSupplier>
+      <IsCustomer>true</IsCustomer>
+    </Contact>
+  </Contacts>
+</Response>
+"""
+
+# INVOICES, as Xero would return it in JSON.
+INVOICES_JSON = """{
+  "Id": "5c6a2ef6-6a2d-4b87-8b5b-e0fe52b1b6f9",
+  "Status": "OK",
+  "ProviderName": "PyXero",
+  "DateTimeUTC": "\\/Date(1369980455373)\\/",
+  "Invoices": [
+    {
+      "Contact": {
+        "ContactID": "3e776c4b-ea9e-4bb1-96be-6b0c7a71a37f"
+      },
+      "Date": "\\/Date(1359676800000+0000)\\/",
+      "DateString": "2013-02-01T00:00:00",
+      "DueDate": "\\/Date(1360886400000+0000)\\/",
+      "Status": "PAID",
+      "LineItems": [
+        {
+          "Description": "Line item 1",
+          "Quantity": 1.0000,
+          "UnitAmount": 100.00
+        },
+        {
+          "Description": "Line item 2",
+          "UnitAmount": 750.00
+        }
+      ],
+      "Total": 850.00,
+      "UpdatedDateUTC": "\\/Date(1369980260780+0000)\\/",
+      "FullyPaidOnDate": null,
+      "Payments": [],
+      "InvoiceID": "0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f"
+    },
+    {
+      "Contact": {
+        "ContactID": "755f1475-d255-43a8-bedc-5ea7fd26c71f",
+        "Name": "John S\xfcrname"
+      },
+      "Date": "\\/Date(1362096000000+0000)\\/",
+      "LineItems": [
+        {
+          "Description": "Only line item",
+          "UnitAmount": 10.00
+        }
+      ],
+      "Total": 10.00,
+      "InvoiceID": "a61fd1d9-8ee0-4d09-b3b1-9b1fce3b4a4c"
+    }
+  ]
+}
+"""
+
+# An invoice with several tracking categories on a line item, and other
+# collections of several items, in XML and JSON.
+TRACKED_INVOICE = """<Response>
+  <Status>OK</Status>
+  <Invoices>
+    <Invoice>
+      <InvoiceID>0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f</InvoiceID>
+      <Contact>
+        <Name>Yarra Transport</Name>
+        <Addresses>
+          <Address><AddressType>POBOX</AddressType><City>Melbourne</City></Address>
+          <Address><AddressType>STREET</AddressType><City>Sydney</City></Address>
+        </Addresses>
+        <Phones>
+          <Phone><PhoneType>DDI</PhoneType></Phone>
+          <Phone><PhoneType>MOBILE</PhoneType></Phone>
+        </Phones>
+      </Contact>
+      <LineItems>
+        <LineItem>
+          <Description>Tracked</Description>
+          <Tracking>
+            <TrackingCategory><Name>Region</Name><Option>North</Option></TrackingCategory>
+            <TrackingCategory><Name>Project</Name><Option>Apollo</Option></TrackingCategory>
+          </Tracking>
+        </LineItem>
+        <LineItem>
+          <Description>Tracked once</Description>
+          <Tracking>
+            <TrackingCategory><Name>Region</Name><Option>South</Option></TrackingCategory>
+          </Tracking>
+        </LineItem>
+      </LineItems>
+    </Invoice>
+  </Invoices>
+</Response>
+"""
+
+TRACKED_INVOICE_JSON = """{
+  "Status": "OK",
+  "Invoices": [
+    {
+      "InvoiceID": "0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f",
+      "Contact": {
+        "Name": "Yarra Transport",
+        "Addresses": [
+          {"AddressType": "POBOX", "City": "Melbourne"},
+          {"AddressType": "STREET", "City": "Sydney"}
+        ],
+        "Phones": [{"PhoneType": "DDI"}, {"PhoneType": "MOBILE"}]
+      },
+      "LineItems": [
+        {
+          "Description": "Tracked",
+          "Tracking": [
+            {"Name": "Region", "Option": "North"},
+            {"Name": "Project", "Option": "Apollo"}
+          ]
+        },
+        {
+          "Description": "Tracked once",
+          "Tracking": [{"Name": "Region", "Option": "South"}]
+        }
+      ]
+    }
+  ]
+}
+"""
+
+
+class XMLDecoderTest(unittest.TestCase):
+    def assertDecodesLikeMinidom(self, manager, content):
+        content = content.encode('utf-8')
+        expected = manager.convert_to_dict(manager.walk_dom(parseString(content)))
+        self.assertEqual(manager.decoder.decode(content), expected)
+        return expected
+
+    def test_collection(self):
+        "A multi-record response decodes the same way as the minidom path"
+        xero = Xero(Mock())
+        data = self.assertDecodesLikeMinidom(xero.invoices, INVOICES)
+
+        invoices = xero.invoices._get_results(data)
+        self.assertEqual(len(invoices), 2)
+        self.assertEqual(invoices[1]['Contact']['Name'], 'John Sürname')
+
+    def test_single_record(self):
+        "A single record (and a single collection item) decodes as a dict"
+        xero = Xero(Mock())
+        data = self.assertDecodesLikeMinidom(xero.contacts, SINGLE_CONTACT)
+
+        contact = xero.contacts._get_results(data)
+        self.assertEqual(contact['Phones'], {'Phone': {'PhoneType': 'DDI'}})
+        self.assertIs(contact['IsSupplier'], False)
+        self.assertIs(contact['IsCustomer'], True)
+
+    def test_json(self):
+        "A JSON response decodes into the same results as the XML one"
+        xml = Xero(Mock()).invoices
+        expected = xml._get_results(xml.decoder.decode(INVOICES.encode('utf-8')))
+
+        manager = Xero(Mock(), format='json').invoices
+        content = INVOICES_JSON.encode('utf-8')
+        self.assertEqual(manager._get_results(manager.decoder.decode(content)), expected)
+        self.assertEqual(list(manager.decoder.iterdecode([content], 'Invoices')), expected)
+
+    def test_json_collections(self):
+        "Collections with irregular item tags (e.g. Tracking) decode as they do from XML"
+        xml = Xero(Mock()).invoices
+        expected = xml._get_results(xml.decoder.decode(TRACKED_INVOICE.encode('utf-8')))
+        tracking = expected['LineItems'][0]['Tracking']
+        self.assertEqual([category['Name'] for category in tracking], ['Region', 'Project'])
+        self.assertEqual(len(expected['Contact']['Addresses']), 2)
+
+        manager = Xero(Mock(), format='json').invoices
+        content = TRACKED_INVOICE_JSON.encode('utf-8')
+        self.assertEqual(manager._get_results(manager.decoder.decode(content)), expected)
+
+
+class DecodePoolTest(unittest.TestCase):
+    def setUp(self):
+        from multiprocessing import Pool
+        self.pool = Pool(1)
+
+    def tearDown(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    @patch('requests.Session.get')
+    def test_decode_pool(self, r_get):
+        "Large responses are decoded in the pool, into the same results"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                                  encoding='utf-8', text=INVOICES)
+        expected = Xero(Mock(), decoding='typed').invoices.all()
+        pool = Mock(wraps=self.pool)
+
+        xero = Xero(Mock(), decoding='typed', decode_pool=pool)
+        self.assertEqual(xero.invoices.all(), expected)
+        # This response is too small to be worth sending to the pool
+        self.assertFalse(pool.apply.called)
+
+        with patch.object(Manager, 'DECODE_POOL_THRESHOLD', 0):
+            self.assertEqual(xero.invoices.all(), expected)
+            self.assertEqual(pool.apply.call_count, 1)
+
+            models = Xero(Mock(), models=True, decode_pool=pool).invoices.all()
+            self.assertEqual(type(models[0]).__name__, 'Invoice')
+            self.assertEqual(models, Xero(Mock(), models=True).invoices.all())
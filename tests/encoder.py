@@ -0,0 +1,88 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+from datetime import date, datetime
+from decimal import Decimal
+import unittest
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from mock import Mock
+
+from xero import Xero
+from xero.encoder import XMLEncoder
+
+
+CONTACT = {
+    'Name': 'Bayside Club & Co <Pty>',
+    'ContactNumber': '"1001"',
+    'EmailAddress': '',
+    'Addresses': [
+        {'AddressType': 'POBOX', 'City': 'Sydney'},
+        {'AddressType': 'STREET'},
+    ],
+    'Phones': [],
+    'ContactGroups': {},
+}
+
+INVOICE = {
+    'Type': 'ACCREC',
+    'Contact': {'ContactID': '3e776c4b-ea9e-4bb1-96be-6b0c7a71a37f'},
+    'LineItems': [
+        {'Description': 'Line item 1', 'Quantity': '1.0', 'UnitAmount': '100.00'},
+        {'Description': 'Line item 2', 'Quantity': '2.0', 'UnitAmount': '750.00'},
+    ],
+    'Tracking': [{'Name': 'Region'}, {'Option': 'North'}],
+    'Date': date(2013, 2, 1),
+    'DueDate': date(2013, 2, 15),
+    'InvoiceNumber': 'X0001',
+}
+
+
+class XMLEncoderTest(unittest.TestCase):
+    def tostring(self, manager, data):
+        "The body of a save request, as serialized by ElementTree"
+        if isinstance(data, list):
+            root = Element(manager.name)
+            for d in data:
+                manager.dict_to_xml(SubElement(root, manager.singular), d)
+        else:
+            root = manager.dict_to_xml(Element(manager.singular), data)
+        return tostring(root)
+
+    def test_same_as_elementtree(self):
+        "Records are encoded exactly as ElementTree would"
+        xero = Xero(Mock())
+        for manager, data in [
+                (xero.contacts, CONTACT),
+                (xero.contacts, [CONTACT, {'Name': 'Yarra Transport'}]),
+                (xero.contacts, []),
+                (xero.contacts, {}),
+                (xero.invoices, INVOICE)]:
+            self.assertEqual(manager._prepare_data_for_save(data), self.tostring(manager, data))
+
+    def test_typed_values(self):
+        "Values are formatted by type, rather than with str()"
+        xml = XMLEncoder().encode('Invoices', 'Invoice', {
+            'Reference': 'Sürname',
+            'SentToContact': True,
+            'UpdatedDateUTC': datetime(2013, 5, 31, 6, 4, 20),
+            'Total': Decimal('850.00'),
+            'Url': None,
+        })
+        for part in [
+                b'<Reference>S&#252;rname</Reference>',
+                b'<SentToContact>true</SentToContact>',
+                b'<UpdatedDateUTC>2013-05-31T06:04:20</UpdatedDateUTC>',
+                b'<Total>850.00</Total>',
+                b'<Url />']:
+            self.assertIn(part, xml)
+
+    def test_iterencode(self):
+        "A list of records is encoded in a chunk per record"
+        chunks = list(XMLEncoder().iterencode('Contacts', 'Contact', [{'Name': 'A'}, {'Name': 'B'}]))
+        self.assertEqual(chunks, [
+            b'<Contacts>',
+            b'<Contact><Name>A</Name></Contact>',
+            b'<Contact><Name>B</Name></Contact>',
+            b'</Contacts>',
+        ])
@@ -12,7 +12,7 @@ from xero.exceptions import *
 
 class ExceptionsTest(unittest.TestCase):
 
-    @patch('requests.put')
+    @patch('requests.Session.put')
     def test_bad_request(self, r_put):
         "Data with validation errors raises a bad request exception"
         # Verified response from the live API
@@ -97,7 +97,39 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroBadRequest, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.put')
+    def test_bad_request_json(self, r_put):
+        "Validation errors are extracted from a JSON response"
+        r_put.return_value = Mock(status_code=400, text="""{
+  "ErrorNumber": 10,
+  "Type": "ValidationException",
+  "Message": "A validation exception occurred",
+  "Elements": [
+    {
+      "ValidationErrors": [
+        {"Message": "One or more line items must be specified"},
+        {"Message": "A Contact must be specified for this type of transaction"}
+      ]
+    }
+  ]
+}""")
+
+        credentials = Mock()
+        xero = Xero(credentials, format='json')
+
+        try:
+            xero.invoices.put({'Type': 'ACCREC'})
+            self.fail("Should raise a XeroBadRequest.")
+
+        except XeroBadRequest, e:
+            self.assertEqual(e.message, 'A validation exception occurred')
+            self.assertEqual(e.errors, [
+                'One or more line items must be specified',
+                'A Contact must be specified for this type of transaction',
+            ])
+            self.assertEqual(r_put.call_args[1]['headers'], {'Accept': 'application/json'})
+
+    @patch('requests.Session.get')
     def test_unauthorized_invalid(self, r_get):
         "A session with an invalid token raises an unauthorized exception"
         # Verified response from the live API
@@ -121,7 +153,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroUnauthorized, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_unauthorized_expired(self, r_get):
         "A session with an expired token raises an unauthorized exception"
         # Verified response from the live API
@@ -145,7 +177,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroUnauthorized, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_forbidden(self, r_get):
         "In case of an SSL failure, a Forbidden exception is raised"
         # This is unconfirmed; haven't been able to verify this response from API.
@@ -168,7 +200,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroForbidden, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_not_found(self, r_get):
         "If you request an object that doesn't exist, a Not Found exception is raised"
         # Verified response from the live API
@@ -191,7 +223,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroNotFound, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_internal_error(self, r_get):
         "In case of an SSL failure, a Forbidden exception is raised"
         # This is unconfirmed; haven't been able to verify this response from API.
@@ -214,7 +246,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroInternalError, not %s" % e)
 
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_not_implemented(self, r_post):
         "In case of an SSL failure, a Forbidden exception is raised"
         # Verified response from the live API
@@ -241,7 +273,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroNotImplemented, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_rate_limit_exceeded(self, r_get):
         "If you exceed the rate limit, an exception is raised."
         # Response based off Xero documentation; not confirmed by reality.
@@ -265,7 +297,7 @@ class ExceptionsTest(unittest.TestCase):
         except Exception, e:
             self.fail("Should raise a XeroRateLimitExceeded, not %s" % e)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_not_available(self, r_get):
         "If Xero goes down for maintenance, an exception is raised"
         # Response based off Xero documentation; not confirmed by reality.
@@ -2,12 +2,16 @@
 from __future__ import unicode_literals
 
 from datetime import date
+from decimal import Decimal
+import subprocess
+import sys
 import unittest
 from xml.dom.minidom import parseString
 
 from mock import Mock, patch
 
 from xero import Xero
+from xero.exceptions import XeroNotFound
 
 
 class ManagerTest(unittest.TestCase):
@@ -57,7 +61,7 @@ class ManagerTest(unittest.TestCase):
         # Original should match reproduced version, embedded inside a parent key
         self.assertEqual(original, reproduced)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_unicode_content(self, r_get):
         "If you exceed the rate limit, an exception is raised."
         # Verified response from Xero API.
@@ -126,3 +130,257 @@ class ManagerTest(unittest.TestCase):
 
         self.assertEqual(contact['FirstName'], 'John')
         self.assertEqual(contact['LastName'], 'Sürname')
+
+    @patch('requests.Session.get')
+    def test_iter_all(self, r_get):
+        "Records are yielded as they arrive, before the response is complete"
+        content = """<Response>
+  <Id>5c6a2ef6-6a2d-4b87-8b5b-e0fe52b1b6f9</Id>
+  <Status>OK</Status>
+  <Contacts>
+    <Contact>
+      <ContactID>755f1475-d255-43a8-bedc-5ea7fd26c71f</ContactID>
+      <Name>Yarra Transport</Name>
+      <IsSupplier>false</IsSupplier>
+    </Contact>
+    <Contact>
+      <ContactID>3e776c4b-ea9e-4bb1-96be-6b0c7a71a37f</ContactID>
+      <Name>John Sürname</Name>
+      <IsSupplier>true</IsSupplier>
+    </Contact>
+  </Contacts>
+</Response>
+""".encode('utf-8')
+        boundary = content.index(b'<Contact>', content.index(b'</Contact>'))
+        delivered = []
+
+        def iter_content(chunk_size):
+            for chunk in (content[:boundary], content[boundary:]):
+                delivered.append(chunk)
+                yield chunk
+
+        r_get.return_value = Mock(status_code=200, iter_content=iter_content)
+
+        credentials = Mock()
+        xero = Xero(credentials)
+
+        contacts = xero.contacts.iter_all()
+        self.assertTrue(r_get.call_args[1]['stream'])
+
+        first = next(contacts)
+        self.assertEqual(len(delivered), 1)
+        self.assertEqual(first['Name'], 'Yarra Transport')
+        self.assertIs(first['IsSupplier'], False)
+
+        self.assertEqual([c['Name'] for c in contacts], ['John Sürname'])
+        self.assertTrue(r_get.return_value.close.called)
+
+    @patch('requests.Session.get')
+    def test_decoding_modes(self, r_get):
+        "Values can be decoded as Decimals, or left as unicode"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8', text="""<Response>
+  <Status>OK</Status>
+  <Invoices>
+    <Invoice>
+      <InvoiceID>0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f</InvoiceID>
+      <Date>2013-02-01T00:00:00</Date>
+      <LineItems>
+        <LineItem>
+          <Quantity>1.0000</Quantity>
+          <UnitAmount>100.00</UnitAmount>
+        </LineItem>
+        <LineItem>
+          <Quantity>2.0000</Quantity>
+          <UnitAmount>375.00</UnitAmount>
+        </LineItem>
+      </LineItems>
+      <Total>850.00</Total>
+    </Invoice>
+  </Invoices>
+</Response>""")
+
+        credentials = Mock()
+
+        invoice = Xero(credentials).invoices.all()
+        self.assertEqual(invoice['Date'], date(2013, 2, 1))
+        self.assertEqual(invoice['Total'], '850.00')
+
+        invoice = Xero(credentials, decoding='typed').invoices.all()
+        self.assertEqual(invoice['Date'], date(2013, 2, 1))
+        self.assertEqual(invoice['Total'], Decimal('850.00'))
+        self.assertEqual(
+            [(l['Quantity'], l['UnitAmount']) for l in invoice['LineItems']],
+            [(Decimal('1.0000'), Decimal('100.00')), (Decimal('2.0000'), Decimal('375.00'))]
+        )
+
+        invoice = Xero(credentials, decoding='raw').invoices.all()
+        self.assertEqual(invoice['Date'], '2013-02-01T00:00:00')
+        self.assertEqual(invoice['Total'], '850.00')
+
+        self.assertRaises(ValueError, Xero, credentials, decoding='fast')
+
+    def paged_contacts(self, uri, **kwargs):
+        "A fake Contacts endpoint returning 5 contacts in pages of 2"
+        page = int(uri.split('page=')[1])
+        contacts = ''.join(
+            '<Contact><ContactID>%d</ContactID><Name>Contact %d</Name></Contact>' % (i, i)
+            for i in range(5)[(page - 1) * 2:page * 2]
+        )
+        return Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                    text='<Response><Status>OK</Status><Contacts>%s</Contacts></Response>' % contacts)
+
+    @patch('requests.Session.get')
+    def test_paginate(self, r_get):
+        "Pages are requested lazily until a short page is returned"
+        r_get.side_effect = self.paged_contacts
+
+        credentials = Mock()
+        xero = Xero(credentials)
+        xero.contacts.PAGE_SIZE = 2
+
+        contacts = xero.contacts.paginate(Name__contains='Contact')
+        self.assertEqual(next(contacts)['ContactID'], '0')
+        self.assertEqual(r_get.call_count, 1)
+
+        self.assertEqual([c['ContactID'] for c in contacts], ['1', '2', '3', '4'])
+        self.assertEqual(r_get.call_count, 3)
+        self.assertIn('where=Name.contains%28%22Contact%22%29&page=3', r_get.call_args[0][0])
+
+    @patch('requests.Session.get')
+    def test_all_pages(self, r_get):
+        "All pages can be fetched in bulk, prefetching the next page"
+        r_get.side_effect = self.paged_contacts
+
+        credentials = Mock()
+        xero = Xero(credentials)
+        xero.contacts.PAGE_SIZE = 2
+
+        contacts = xero.contacts.all_pages(prefetch=2)
+        self.assertEqual([c['ContactID'] for c in contacts], ['0', '1', '2', '3', '4'])
+
+    def test_shared_session(self):
+        "All the managers of a Xero instance share a single HTTP session"
+        credentials = Mock()
+        xero = Xero(credentials)
+
+        self.assertIs(xero.contacts.session, xero.session)
+        self.assertIs(xero.employees.session, xero.session)
+
+        session = Mock()
+        session.get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                                        encoding='utf-8', text='<Response><Status>OK</Status></Response>')
+        xero = Xero(credentials, session=session)
+        xero.invoices.all()
+        self.assertIs(xero.invoices.session, session)
+        self.assertEqual(session.get.call_args[0][0], 'https://api.xero.com/api.xro/2.0/Invoices')
+
+    def test_lazy_managers(self):
+        "Managers are constructed when they're first used, and then kept"
+        xero = Xero(Mock())
+        self.assertNotIn('invoices', vars(xero))
+
+        invoices = xero.invoices
+        self.assertIs(xero.invoices, invoices)
+        self.assertEqual(invoices.name, 'Invoices')
+        self.assertEqual(xero.payruns.url, 'https://api.xero.com/payroll.xro/1.0')
+        self.assertNotIn('contacts', vars(xero))
+        self.assertRaises(AttributeError, getattr, xero, 'widgets')
+
+    def test_deferred_imports(self):
+        "Importing xero doesn't import the dependencies that are slow to import"
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, xero; print(sorted(m for m in ("requests", "dateutil", "xml.dom.minidom") if m in sys.modules))'
+        ])
+        self.assertEqual(output.strip(), '[]')
+
+    @patch('requests.Session.get')
+    def test_get_many(self, r_get):
+        "Records can be retrieved by ID in bulk, without one failure aborting the rest"
+        def get(uri, **kwargs):
+            id = uri.rsplit('/', 1)[1]
+            if id == 'missing':
+                return Mock(status_code=404, text="The resource you're looking for cannot be found")
+            return Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                        text='<Response><Accounts><Account><AccountID>%s</AccountID></Account></Accounts></Response>' % id)
+        r_get.side_effect = get
+
+        credentials = Mock()
+        xero = Xero(credentials)
+
+        accounts = xero.accounts.get_many(['a1', 'missing', 'a3'], concurrency=2)
+        self.assertEqual(accounts[0], {'AccountID': 'a1'})
+        self.assertIsInstance(accounts[1], XeroNotFound)
+        self.assertEqual(accounts[2], {'AccountID': 'a3'})
+
+    @patch('requests.Session.get')
+    def test_get_many_batched(self, r_get):
+        "Endpoints that accept an IDs parameter are queried in batches"
+        def get(uri, **kwargs):
+            ids = uri.split('IDs=')[1].lower().split(',')
+            return Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                        text='<Response><Invoices>%s</Invoices></Response>' % ''.join(
+                            '<Invoice><InvoiceID>%s</InvoiceID><Status>PAID</Status></Invoice>' % id
+                            for id in ids if id != 'missing'))
+        r_get.side_effect = get
+
+        credentials = Mock()
+        xero = Xero(credentials)
+        xero.invoices.MAX_URI_LENGTH = len('https://api.xero.com/api.xro/2.0/Invoices?IDs=') + 14
+
+        ids = ['i0001', 'I0002', 'missing', 'i0004']
+        invoices = xero.invoices.get_many(ids)
+        self.assertEqual(r_get.call_count, 2)
+        self.assertEqual([i and i['InvoiceID'] for i in invoices], ['i0001', 'i0002', None, 'i0004'])
+
+    @patch('requests.Session.post')
+    def test_save_many(self, r_post):
+        "Records are saved in chunks, collecting the errors for each record"
+        responses = [
+            Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8', text="""<Response>
+  <Status>OK</Status>
+  <Contacts>
+    <Contact status="OK">
+      <ContactID>755f1475-d255-43a8-bedc-5ea7fd26c71f</ContactID>
+      <Name>Yarra Transport</Name>
+      <StatusAttributeString>OK</StatusAttributeString>
+    </Contact>
+    <Contact status="ERROR">
+      <Name>Bayside Club</Name>
+      <EmailAddress>not an email</EmailAddress>
+      <StatusAttributeString>ERROR</StatusAttributeString>
+      <ValidationErrors>
+        <ValidationError>
+          <Message>Email address must be valid.</Message>
+        </ValidationError>
+        <ValidationError>
+          <Message>The contact name Bayside Club is already assigned to another contact.</Message>
+        </ValidationError>
+      </ValidationErrors>
+    </Contact>
+  </Contacts>
+</Response>"""),
+            Mock(status_code=503, text="The Xero API is currently offline for maintenance"),
+        ]
+        r_post.side_effect = responses
+
+        credentials = Mock()
+        xero = Xero(credentials)
+
+        results = xero.contacts.save_many([
+            {'Name': 'Yarra Transport'},
+            {'Name': 'Bayside Club', 'EmailAddress': 'not an email'},
+            {'Name': 'City Agency'},
+        ], chunk_size=2)
+
+        self.assertEqual(r_post.call_count, 2)
+        self.assertTrue(r_post.call_args[0][0].endswith('/Contacts?summarizeErrors=false'))
+
+        self.assertEqual(results[0][0]['ContactID'], '755f1475-d255-43a8-bedc-5ea7fd26c71f')
+        self.assertEqual(results[0][1], [])
+        self.assertEqual(results[1][0]['Name'], 'Bayside Club')
+        self.assertEqual(results[1][1], [
+            'Email address must be valid.',
+            'The contact name Bayside Club is already assigned to another contact.',
+        ])
+        self.assertEqual(results[2], (None, ['The Xero API is currently offline for maintenance']))
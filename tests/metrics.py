@@ -0,0 +1,112 @@
+import socket
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.hooks import Hook
+from xero.metrics import Histogram, MetricsCollector
+from xero.retry import RetryPolicy
+
+
+RATE_LIMITED = 'oauth_problem=rate%20limit%20exceeded&oauth_problem_advice=please%20wait%20before%20retrying%20the%20xero%20api'
+
+ACCOUNTS = '<Response><Accounts><Account><Code>200</Code></Account><Account><Code>400</Code></Account></Accounts></Response>'
+
+
+class Recorder(Hook):
+    "Records the events it observes"
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, manager, method, uri, headers):
+        self.events.append(('before_request', manager.name, method))
+
+    def after_response(self, manager, method, uri, response, elapsed):
+        self.events.append(('after_response', response.status_code))
+
+    def on_error(self, manager, method, uri, exception, attempt, delay):
+        self.events.append(('on_error', type(exception).__name__, attempt, delay))
+
+    def on_decode(self, manager, method, response, elapsed, records):
+        self.events.append(('on_decode', method, records))
+
+
+class MetricsTest(unittest.TestCase):
+    def responses(self):
+        return [
+            Mock(status_code=503, headers={'Retry-After': '3'}, text=RATE_LIMITED),
+            Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8', 'content-length': str(len(ACCOUNTS))},
+                 encoding='utf-8', text=ACCOUNTS),
+        ]
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_hooks(self, r_get, sleep):
+        "Hooks observe every attempt, error and decode"
+        r_get.side_effect = self.responses()
+        recorder = Recorder()
+
+        xero = Xero(Mock(), hooks=[recorder], retry_policy=RetryPolicy())
+        xero.accounts.all()
+
+        self.assertEqual(recorder.events, [
+            ('before_request', 'Accounts', 'get'),
+            ('after_response', 503),
+            ('on_error', 'XeroRateLimitExceeded', 1, 3.0),
+            ('before_request', 'Accounts', 'get'),
+            ('after_response', 200),
+            ('on_decode', 'get', 2),
+        ])
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_prometheus(self, r_get, sleep):
+        "Metrics are collected per endpoint and method, and exported for Prometheus"
+        r_get.side_effect = self.responses()
+        metrics = MetricsCollector()
+
+        xero = Xero(Mock(), hooks=[metrics], retry_policy=RetryPolicy())
+        xero.accounts.all()
+
+        self.assertEqual(metrics.requests(), {('Accounts', 'get'): 2})
+
+        text = metrics.prometheus()
+        self.assertIn('# TYPE xero_request_duration_seconds histogram\n', text)
+        self.assertIn('xero_request_duration_seconds_count{endpoint="Accounts",method="get"} 2\n', text)
+        self.assertIn('xero_response_size_bytes_bucket{endpoint="Accounts",method="get",le="1024"} 1\n', text)
+        self.assertIn('xero_responses_total{endpoint="Accounts",method="get",status="503"} 1\n', text)
+        self.assertIn('xero_errors_total{endpoint="Accounts",method="get",error="XeroRateLimitExceeded"} 1\n', text)
+        self.assertIn('xero_retries_total{endpoint="Accounts",method="get"} 1\n', text)
+        self.assertIn('xero_records_decoded_total{endpoint="Accounts",method="get"} 2\n', text)
+
+    @patch('requests.Session.get')
+    def test_statsd(self, r_get):
+        "Observations are sent to StatsD as they're made"
+        r_get.side_effect = self.responses()[1:]
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        try:
+            metrics = MetricsCollector(statsd=server.getsockname())
+            Xero(Mock(), hooks=[metrics]).accounts.all()
+
+            lines = [server.recv(1024) for i in range(5)]
+        finally:
+            server.close()
+
+        self.assertTrue(lines[0].startswith('xero.Accounts.get.request:'))
+        self.assertTrue(lines[0].endswith('|ms'))
+        self.assertIn('xero.Accounts.get.responses.200:1|c', lines)
+        self.assertIn('xero.Accounts.get.bytes:%d|c' % len(ACCOUNTS), lines)
+        self.assertIn('xero.Accounts.get.records:2|c', lines)
+
+    def test_histogram(self):
+        histogram = Histogram([1, 5, 10])
+        for value in [0.5, 1, 3, 7, 20]:
+            histogram.observe(value)
+
+        self.assertEqual(list(histogram.cumulative()), [(1, 2), (5, 3), (10, 4)])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.sum, 31.5)
@@ -0,0 +1,63 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+from datetime import date
+import cPickle as pickle
+import unittest
+
+from mock import Mock
+
+from xero import Xero
+from xero.models import Invoice, LineItem, Record
+
+from .decoder import INVOICES
+
+
+class ModelsTest(unittest.TestCase):
+    def test_decode(self):
+        "Records decode into models that hold the same data as the dicts"
+        content = INVOICES.encode('utf-8')
+        expected = Xero(Mock()).invoices.decoder.decode(content)
+        invoices = Xero(Mock(), models=True).invoices
+        data = invoices.decoder.decode(content)
+        self.assertEqual(data, expected)
+
+        first, second = invoices._get_results(data)
+        self.assertIsInstance(first, Invoice)
+        self.assertEqual(first.Date, date(2013, 2, 1))
+        self.assertEqual(first.Total, '850.00')
+        self.assertIsInstance(first.LineItems[0], LineItem)
+        self.assertEqual(first.LineItems[1].Description, 'Line item 2')
+        self.assertEqual(second.Contact.Name, 'John Sürname')
+
+        # Fields that weren't returned are None
+        self.assertIsNone(second.DueDate)
+        self.assertNotIn('DueDate', second)
+        self.assertIsNone(second.get('DueDate'))
+        self.assertRaises(KeyError, lambda: second['DueDate'])
+        self.assertRaises(AttributeError, lambda: second.Nonsense)
+
+        self.assertEqual(first.to_dict(), expected['Response']['Invoices'][0])
+
+    def test_extra_fields(self):
+        "Unknown fields are kept, but don't get a slot"
+        line_item = LineItem({'Description': 'Widget', 'Colour': 'Blue'})
+        self.assertEqual(line_item.Description, 'Widget')
+        self.assertEqual(line_item.Colour, 'Blue')
+        self.assertEqual(line_item['Colour'], 'Blue')
+        self.assertEqual(line_item.extra, {'Colour': 'Blue'})
+        self.assertEqual(sorted(line_item.keys()), ['Colour', 'Description'])
+        self.assertFalse(hasattr(line_item, '__dict__'))
+
+    def test_pickle(self):
+        "Records can be pickled, e.g. to be cached"
+        invoice = Invoice({
+            'InvoiceID': 'abc',
+            'LineItems': [LineItem({'Description': 'Widget'})],
+            'Colour': 'Blue',
+        })
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copy = pickle.loads(pickle.dumps(invoice, protocol))
+            self.assertIsInstance(copy, Invoice)
+            self.assertEqual(copy, invoice)
+            self.assertIsInstance(copy.LineItems[0], Record)
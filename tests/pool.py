@@ -0,0 +1,117 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+
+from mock import Mock, patch
+
+from xero.cache import MemoryCache
+from xero.pool import XeroPool
+
+
+class XeroPoolTest(unittest.TestCase):
+    def credentials(self, token):
+        credentials = Mock()
+        credentials.oauth_token = token
+        return credentials
+
+    def test_clients(self):
+        "Each tenant has a client, built once, sharing the pool's resources"
+        cache = MemoryCache()
+        pool = XeroPool(cache=cache, decoding='typed')
+        pool.register('acme', self.credentials('acme-token'))
+        pool.register('globex', self.credentials('globex-token'))
+        self.assertEqual(sorted(pool.tenants()), ['acme', 'globex'])
+        self.assertEqual(len(pool), 2)
+        self.assertTrue('acme' in pool)
+
+        acme, globex = pool['acme'], pool.get('globex')
+        self.assertIs(pool['acme'], acme)
+        self.assertEqual((acme.tenant, acme.decoding), ('acme', 'typed'))
+        self.assertIs(acme.session, globex.session)
+        self.assertIs(acme.cache, cache)
+        self.assertIs(acme.invoices.decoder, globex.invoices.decoder)
+        self.assertIs(acme.invoices.encoder, globex.contacts.encoder)
+
+        # Each tenant has a budget of its own, within the application's
+        self.assertEqual(acme.rate_limiter.key, 'acme')
+        self.assertIs(acme.rate_limiter.within, pool.app_limiter)
+        self.assertIs(acme.rate_limiter.backend, globex.rate_limiter.backend)
+
+        self.assertRaises(KeyError, pool.get, 'initech')
+
+        # New credentials replace the client
+        pool.register('acme', self.credentials('new-token'))
+        self.assertIsNot(pool['acme'], acme)
+        pool.unregister('acme')
+        self.assertRaises(KeyError, pool.get, 'acme')
+
+    def test_loader(self):
+        "Tenants that aren't registered are loaded"
+        loader = Mock(side_effect=lambda tenant: self.credentials(tenant) if tenant == 'acme' else None)
+        pool = XeroPool(loader=loader)
+
+        self.assertEqual(pool['acme'].credentials.oauth_token, 'acme')
+        self.assertRaises(KeyError, pool.get, 'initech')
+        pool['acme']
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(pool.tenants(), ['acme'])
+
+    @patch('requests.Session.get')
+    def test_rate_limits(self, r_get):
+        "Every request counts against its tenant's and the application's budget"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                                  encoding='utf-8', text='<Response><Status>OK</Status></Response>')
+        pool = XeroPool(per_minute=2, per_day=None, app_per_minute=3)
+        pool.register('acme', self.credentials('acme'))
+        pool.register('globex', self.credentials('globex'))
+
+        pool['acme'].contacts.all()
+        pool['acme'].contacts.all()
+        pool['globex'].contacts.all()
+        now = time.time()
+        # acme's budget, and the application's, are spent; globex's isn't
+        self.assertTrue(pool.backend.reserve('acme', [(2, 60)], now))
+        self.assertTrue(pool.backend.reserve('app', [(3, 60)], now))
+        self.assertEqual(pool.backend.reserve('globex', [(2, 60)], now), 0)
+
+    def test_run(self):
+        "Tasks are run in turn for each tenant, with a cap on each tenant"
+        pool = XeroPool()
+        for tenant in ('noisy', 'quiet1', 'quiet2'):
+            pool.register(tenant, self.credentials(tenant))
+
+        started = []
+        lock = threading.Lock()
+        running = {}
+        peak = {}
+
+        def task(name):
+            def run(client):
+                with lock:
+                    started.append(client.tenant)
+                    running[client.tenant] = running.get(client.tenant, 0) + 1
+                    peak[client.tenant] = max(peak.get(client.tenant, 0), running[client.tenant])
+                time.sleep(0.01)
+                with lock:
+                    running[client.tenant] -= 1
+                if name == 'fail':
+                    raise ValueError(name)
+                return name
+            return run
+
+        tasks = [('noisy', task('n%d' % i)) for i in range(6)]
+        tasks += [('quiet1', task('q1')), ('quiet2', task('fail'))]
+        results = pool.run(tasks, workers=3, per_tenant=1)
+
+        self.assertEqual(results[:7], ['n0', 'n1', 'n2', 'n3', 'n4', 'n5', 'q1'])
+        self.assertTrue(isinstance(results[7], ValueError))
+        # The quiet tenants didn't wait for the noisy one's backlog
+        self.assertEqual(sorted(started[:3]), ['noisy', 'quiet1', 'quiet2'])
+        self.assertEqual(peak['noisy'], 1)
+
+        results = pool.map(lambda client: client.tenant, tenants=['quiet1', 'missing'])
+        self.assertEqual(results['quiet1'], 'quiet1')
+        self.assertTrue(isinstance(results['missing'], KeyError))
+        self.assertEqual(pool.run([]), [])
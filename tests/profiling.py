@@ -0,0 +1,99 @@
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+import pstats
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.exceptions import XeroNotFound
+from xero.profiling import PHASES, Profiler
+
+from .decoder import INVOICES
+
+
+class ProfilerTest(unittest.TestCase):
+    def response(self, content=INVOICES):
+        return Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                    encoding='utf-8', text=content)
+
+    @patch('requests.Session.get')
+    def test_phases(self, r_get):
+        "Each call is timed, and its time split into phases"
+        r_get.return_value = self.response()
+        profiler = Profiler()
+        xero = Xero(Mock(), profiler=profiler)
+
+        invoices = xero.invoices.all()
+
+        # Profiling doesn't change the results
+        self.assertEqual(invoices, Xero(Mock()).invoices._decode(self.response()))
+
+        call, = profiler.calls
+        self.assertEqual((call.endpoint, call.method), ('Invoices', 'get'))
+        self.assertEqual((call.requests, call.records, call.error), (1, 2, None))
+        # DateTimeUTC; Date, DueDate, UpdatedDateUTC; Date
+        self.assertEqual(call.conversions, 5)
+
+        phases = call.phases()
+        self.assertEqual(sorted(phases), sorted(PHASES))
+        self.assertTrue(all(elapsed >= 0 for elapsed in phases.values()))
+        self.assertAlmostEqual(sum(phases.values()), call.total, places=3)
+
+        totals = profiler.totals[('Invoices', 'get')]
+        self.assertEqual((totals.calls, totals.records), (1, 2))
+
+        report = profiler.report().splitlines()
+        self.assertTrue(report[0].startswith('Endpoint'))
+        self.assertTrue(report[1].startswith('Invoices             get         1      0        1        2'))
+
+    @patch('requests.Session.get')
+    def test_errors(self, r_get):
+        "Failed calls are counted"
+        r_get.return_value = Mock(status_code=404, text='The resource you\'re looking for cannot be found')
+        xero = Xero(Mock(), profiler=True)
+
+        self.assertRaises(XeroNotFound, xero.invoices.get, 'missing')
+
+        call, = xero.profiler.calls
+        self.assertEqual((call.requests, call.records, call.error), (1, 0, 'XeroNotFound'))
+        self.assertEqual(xero.profiler.totals[('Invoices', 'get')].errors, 1)
+
+    @patch('requests.Session.get')
+    def test_stream(self, r_get):
+        "A streamed call is timed until its response has been consumed"
+        r_get.return_value = Mock(status_code=200, iter_content=lambda size: [INVOICES.encode('utf-8')])
+        xero = Xero(Mock(), profiler=True)
+
+        records = xero.invoices.iter_all()
+        self.assertFalse(xero.profiler.calls)
+        self.assertEqual(len(list(records)), 2)
+
+        call, = xero.profiler.calls
+        self.assertEqual((call.endpoint, call.records, call.conversions), ('Invoices', 2, 5))
+
+    @patch('requests.Session.get')
+    def test_cprofile(self, r_get):
+        "With cprofile, calls are also profiled with cProfile"
+        r_get.return_value = self.response()
+        profiler = Profiler(cprofile=True)
+        self.assertRaises(ValueError, profiler.stats)
+
+        Xero(Mock(), profiler=profiler).invoices.all()
+
+        stats = profiler.stats()
+        self.assertTrue([
+            function for (filename, line, function) in stats.stats
+            if filename.endswith(os.path.join('xero', 'decoder.py'))
+        ])
+
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'xero.prof')
+            profiler.dump_stats(filename)
+            self.assertTrue(pstats.Stats(filename).total_calls)
+        finally:
+            shutil.rmtree(directory)
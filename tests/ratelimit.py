@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.ratelimit import FileBackend, MemoryBackend, RateLimiter
+
+
+class BackendTests(object):
+    "Tests that apply to every rate limiting backend"
+
+    def test_limits(self):
+        "Requests are only allowed while every limit has room"
+        limits = [(2, 60), (3, 86400)]
+
+        self.assertEqual(self.backend.reserve('org', limits, 1000.0), 0)
+        self.assertEqual(self.backend.reserve('org', limits, 1010.0), 0)
+        # The minute is full until the first call's (one second) slot
+        # is 60s old.
+        self.assertEqual(self.backend.reserve('org', limits, 1030.0), 31.0)
+        self.assertEqual(self.backend.reserve('org', limits, 1060.0), 1.0)
+        self.assertEqual(self.backend.reserve('org', limits, 1061.0), 0)
+        # The day is now full, until the end of the first calls' (24
+        # minute) slot is a day old.
+        self.assertEqual(self.backend.reserve('org', limits, 1200.0), 86400.0 + 1440.0 - 1200.0)
+
+    def test_keys(self):
+        "Each key has its own quota"
+        limits = [(1, 60)]
+
+        self.assertEqual(self.backend.reserve('org1', limits, 1000.0), 0)
+        self.assertEqual(self.backend.reserve('org2', limits, 1000.0), 0)
+        self.assertEqual(self.backend.reserve('org1', limits, 1000.0), 61.0)
+
+    def test_reserve_all(self):
+        "A request is counted against every key at once, or against none of them"
+        reservations = [('org1', [(2, 60)]), ('app', [(2, 60)])]
+
+        self.assertEqual(self.backend.reserve_all(reservations, 1000.0), 0)
+        self.assertEqual(self.backend.reserve('org2', [(2, 60)], 1000.0), 0)
+        self.assertEqual(self.backend.reserve('app', [(2, 60)], 1000.0), 0)
+        # The app's limit is reached, so org1 can't make its second request.
+        self.assertEqual(self.backend.reserve_all(reservations, 1010.0), 51.0)
+        self.assertEqual(self.backend.reserve('org1', [(2, 60)], 1010.0), 0)
+
+
+class MemoryBackendTest(BackendTests, unittest.TestCase):
+    def setUp(self):
+        self.backend = MemoryBackend()
+
+    def test_compact(self):
+        "The state of a limit doesn't grow with the number of requests"
+        limits = [(100000, 60), (100000, 86400)]
+        for i in range(3000):
+            self.assertEqual(self.backend.reserve('org', limits, 1000.0 + i * 0.1), 0)
+
+        windows = self.backend.windows['org']
+        self.assertEqual(sum(windows[60].values()), 610)
+        self.assertTrue(len(windows[60]) <= 61)
+        self.assertEqual(sum(windows[86400].values()), 3000)
+
+
+class FileBackendTest(BackendTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.backend = FileBackend(os.path.join(self.directory, 'ratelimit'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_shared(self):
+        "Backends using the same file share the same quota"
+        limits = [(1, 60)]
+        other = FileBackend(self.backend.path)
+
+        self.assertEqual(self.backend.reserve('org', limits, 1000.0), 0)
+        self.assertEqual(other.reserve('org', limits, 1000.0), 61.0)
+
+
+class RateLimiterTest(unittest.TestCase):
+    @patch('time.sleep')
+    @patch('time.time')
+    def test_acquire(self, time, sleep):
+        "Acquiring waits until a request can be made"
+        time.side_effect = [1000.0, 1001.0, 1061.0]
+        limiter = RateLimiter(per_minute=1, per_day=None)
+
+        limiter.acquire()
+        self.assertFalse(sleep.called)
+
+        limiter.acquire()
+        sleep.assert_called_once_with(60.0)
+
+    @patch('time.sleep')
+    @patch('time.time')
+    def test_within(self, time, sleep):
+        "A limiter within another waits until both allow a request"
+        time.side_effect = [1000.0, 1000.0, 1061.0]
+        app = RateLimiter(per_minute=1, per_day=None, key='app')
+        org1 = RateLimiter(per_minute=10, per_day=None, key='org1', within=app)
+        org2 = RateLimiter(per_minute=10, per_day=None, key='org2', within=app)
+        self.assertIs(org1.backend, app.backend)
+
+        org1.acquire()
+        self.assertFalse(sleep.called)
+        org2.acquire()
+        sleep.assert_called_once_with(61.0)
+        self.assertRaises(ValueError, RateLimiter, backend=MemoryBackend(), within=app)
+
+    @patch('requests.Session.get')
+    def test_managers_share_limiter(self, r_get):
+        "Every request made by a Xero instance goes through its rate limiter"
+        r_get.return_value = Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'},
+                                  encoding='utf-8', text='<Response><Status>OK</Status></Response>')
+        limiter = Mock()
+        xero = Xero(Mock(), rate_limiter=limiter)
+
+        xero.contacts.all()
+        xero.employees.all()
+        self.assertEqual(limiter.acquire.call_count, 2)
@@ -0,0 +1,107 @@
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.exceptions import *
+from xero.retry import RetryPolicy
+
+
+RATE_LIMITED = 'oauth_problem=rate%20limit%20exceeded&oauth_problem_advice=please%20wait%20before%20retrying%20the%20xero%20api'
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def rate_limited(self, advice='please wait before retrying the xero api', headers=None):
+        response = Mock(headers=headers or {})
+        return XeroRateLimitExceeded(response, {
+            'oauth_problem': ['rate limit exceeded'],
+            'oauth_problem_advice': [advice],
+        })
+
+    def test_backoff(self):
+        "The wait grows exponentially, up to a maximum"
+        policy = RetryPolicy(backoff=2.0, max_backoff=10.0, jitter=False)
+        error = XeroInternalError(Mock(headers={}, text='Internal error'))
+
+        self.assertEqual(
+            [policy.delay('get', attempt, error, 0) for attempt in range(1, 5)],
+            [2.0, 4.0, 8.0, 10.0]
+        )
+
+    def test_limits(self):
+        "Retries stop after max_attempts, or when they'd take too long"
+        policy = RetryPolicy(max_attempts=3, backoff=2.0, max_elapsed=30.0, jitter=False)
+        error = XeroNotAvailable(Mock(headers={}, text='The Xero API is currently offline for maintenance'))
+
+        self.assertEqual(policy.delay('get', 2, error, 0), 4.0)
+        self.assertIsNone(policy.delay('get', 3, error, 0))
+        self.assertIsNone(policy.delay('get', 2, error, 27.0))
+
+    def test_idempotency(self):
+        "Only requests that weren't processed are retried for every method"
+        policy = RetryPolicy()
+        error = XeroInternalError(Mock(headers={}, text='Internal error'))
+
+        self.assertTrue(policy.should_retry('get', error))
+        self.assertFalse(policy.should_retry('post', error))
+        self.assertFalse(policy.should_retry('put', error))
+        self.assertTrue(policy.should_retry('post', self.rate_limited()))
+        self.assertTrue(RetryPolicy(retry_non_idempotent=True).should_retry('post', error))
+        self.assertFalse(policy.should_retry('get', XeroNotFound(Mock(text='Not found'))))
+
+    def test_rate_limit(self):
+        "Rate limit errors honor Retry-After, and the daily limit isn't retried"
+        policy = RetryPolicy(jitter=False)
+
+        self.assertEqual(policy.delay('get', 1, self.rate_limited(headers={'Retry-After': '17'}), 0), 17.0)
+        self.assertEqual(policy.delay('get', 1, self.rate_limited(), 0), 60.0)
+        self.assertIsNone(policy.delay('get', 1, self.rate_limited(headers={'X-Rate-Limit-Problem': 'Day'}), 0))
+        self.assertIsNone(policy.delay('get', 1, self.rate_limited(advice='the daily limit was exceeded'), 0))
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_retried_request(self, r_get, sleep):
+        "A request that is rate limited is retried"
+        limited = Mock(status_code=503, headers={'Retry-After': '5'}, text=RATE_LIMITED)
+        r_get.side_effect = [
+            limited,
+            Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                 text='<Response><Contacts><Contact><Name>Yarra Transport</Name></Contact></Contacts></Response>'),
+        ]
+        xero = Xero(Mock(), retry_policy=RetryPolicy())
+
+        self.assertEqual(xero.contacts.all(), {'Name': 'Yarra Transport'})
+        self.assertEqual(r_get.call_count, 2)
+        sleep.assert_called_once_with(5.0)
+        self.assertTrue(limited.close.called)
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_gateway_error(self, r_get, sleep):
+        "A GET that fails with a gateway error is retried"
+        r_get.side_effect = [
+            Mock(status_code=502, headers={}, text='Bad Gateway'),
+            Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                 text='<Response><Contacts><Contact><Name>Yarra Transport</Name></Contact></Contacts></Response>'),
+        ]
+        xero = Xero(Mock(), retry_policy=RetryPolicy(jitter=False))
+
+        self.assertEqual(xero.contacts.all(), {'Name': 'Yarra Transport'})
+        self.assertEqual(r_get.call_count, 2)
+        sleep.assert_called_once_with(1.0)
+
+        policy = RetryPolicy()
+        self.assertFalse(policy.should_retry('post', XeroExceptionUnknown(Mock(status_code=504))))
+        self.assertFalse(policy.should_retry('get', XeroExceptionUnknown(Mock(status_code=409))))
+
+    @patch('time.sleep')
+    @patch('requests.Session.put')
+    def test_unsafe_request(self, r_put, sleep):
+        "A PUT that fails with an internal error isn't retried"
+        r_put.return_value = Mock(status_code=500, text='An error occurred in Xero. Check the API Status page http://status.developer.xero.com for current service status.')
+        xero = Xero(Mock(), retry_policy=RetryPolicy())
+
+        with self.assertRaises(XeroInternalError):
+            xero.contacts.put({'Name': 'Yarra Transport'})
+        self.assertEqual(r_put.call_count, 1)
+        self.assertFalse(sleep.called)
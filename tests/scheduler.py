@@ -0,0 +1,128 @@
+from __future__ import unicode_literals
+
+import threading
+import unittest
+
+from mock import Mock
+
+from xero.asynchronous import AsyncXero
+from xero.exceptions import XeroNotFound, XeroRateLimitExceeded
+from xero.scheduler import APP, DONE, FAILED, Scheduler
+
+
+class SchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+        self.lock = threading.Lock()
+        self.clients = {}
+        self.pool = Mock()
+        self.pool.get.side_effect = lambda tenant: self.clients[tenant]
+
+    def client(self, tenant, *errors):
+        "A client whose invoices.all() raises each of `errors` in turn, then succeeds"
+        errors = list(errors)
+
+        def all(**kwargs):
+            with self.lock:
+                self.started.append((tenant, kwargs.get('page')))
+            if errors:
+                raise errors.pop(0)
+            return [tenant]
+
+        client = self.clients[tenant] = Mock()
+        client.invoices.all.side_effect = all
+        return client
+
+    def rate_limited(self, headers):
+        return XeroRateLimitExceeded(Mock(headers=headers), {
+            'oauth_problem': ['rate limit exceeded'],
+            'oauth_problem_advice': ['please wait before retrying the xero api'],
+        })
+
+    def test_fairness(self):
+        "Jobs are started by priority, then in turn for each tenant"
+        for tenant in ('noisy', 'quiet1', 'quiet2'):
+            self.client(tenant)
+        scheduler = Scheduler(self.pool, workers=1)
+        for page in range(4):
+            scheduler.submit('noisy', 'Invoices', 'all', kwargs={'page': page})
+        scheduler.submit('quiet1', 'Invoices', 'all')
+        scheduler.submit('quiet2', 'Invoices', 'all')
+        scheduler.submit('noisy', 'Invoices', 'all', kwargs={'page': 9}, priority=1)
+
+        jobs = scheduler.run()
+
+        self.assertEqual([job.state for job in jobs], [DONE] * 7)
+        self.assertEqual(jobs[0].result, ['noisy'])
+        self.assertEqual(self.started[0], ('noisy', 9))
+        self.assertEqual(sorted(tenant for tenant, page in self.started[1:4]), ['noisy', 'quiet1', 'quiet2'])
+        self.assertEqual(self.started[4:], [('noisy', 1), ('noisy', 2), ('noisy', 3)])
+
+    def test_per_tenant(self):
+        "No more than per_tenant jobs of a tenant run at once"
+        running = []
+        peak = []
+        condition = threading.Condition()
+
+        def operation(manager):
+            with condition:
+                running.append(1)
+                peak.append(len(running))
+                condition.wait(0.01)
+                running.pop()
+
+        self.client('noisy')
+        scheduler = Scheduler(self.pool, workers=4, per_tenant=2)
+        for i in range(6):
+            scheduler.submit('noisy', 'Invoices', operation)
+        scheduler.run()
+        self.assertEqual(max(peak), 2)
+
+    def test_throttled(self):
+        "Throttled jobs wait for their tenant's limit, and fail on the daily limit"
+        self.client('acme', self.rate_limited({'Retry-After': '0.05'}))
+        self.client('globex', self.rate_limited({'X-Rate-Limit-Problem': 'day'}))
+        self.client('initech', XeroNotFound(Mock(text='Not found')))
+        progress = []
+        scheduler = Scheduler(self.pool, workers=2, progress=progress.append)
+
+        acme = scheduler.submit('acme', 'Invoices', 'all')
+        globex = [scheduler.submit('globex', 'Invoices', 'all') for i in range(2)]
+        initech = scheduler.submit('initech', 'Invoices', 'all')
+        scheduler.run()
+
+        self.assertEqual((acme.state, acme.attempts, acme.result), (DONE, 2, ['acme']))
+        self.assertEqual([job.state for job in globex], [FAILED, FAILED])
+        self.assertTrue(isinstance(globex[1].error, XeroRateLimitExceeded))
+        self.assertEqual(len([started for started in self.started if started[0] == 'globex']), 1)
+        self.assertTrue(isinstance(initech.error, XeroNotFound))
+
+        final = scheduler.progress()
+        self.assertEqual((final.total, final.done, final.failed, final.throttled), (4, 1, 3, 2))
+        self.assertEqual((final.remaining, final.running, final.tenants), (0, 0, {}))
+        self.assertEqual(progress[-1].remaining, 0)
+
+    def test_app_limit(self):
+        "When the application's limit is exceeded, no tenant's jobs are started"
+        self.client('acme', self.rate_limited({'Retry-After': '0.05', 'X-Rate-Limit-Problem': 'appminute'}))
+        self.client('globex')
+        scheduler = Scheduler(self.pool, workers=1)
+        scheduler.submit('acme', 'Invoices', 'all')
+        scheduler.submit('acme', 'Invoices', 'all', kwargs={'page': 2})
+        scheduler.submit('globex', 'Invoices', 'all')
+        scheduler.run()
+
+        self.assertEqual(len(self.started), 4)
+        self.assertEqual(list(scheduler.paused), [APP])
+        self.assertEqual(scheduler.progress().done, 3)
+
+    def test_async_client(self):
+        "Jobs aren't run on AsyncXero clients, whose calls return before they've run"
+        self.clients['acme'] = AsyncXero(Mock(), pool=Mock())
+        scheduler = Scheduler(self.pool, workers=1)
+        job = scheduler.submit('acme', 'Invoices', 'all')
+        scheduler.run()
+
+        self.assertEqual(job.state, FAILED)
+        self.assertTrue(isinstance(job.error, TypeError))
+        self.assertFalse(self.clients['acme'].pool.apply_async.called)
@@ -0,0 +1,73 @@
+from __future__ import unicode_literals
+
+from datetime import date
+from decimal import Decimal
+import unittest
+
+from dateutil.parser import parse
+from mock import Mock
+
+from xero import Xero
+from xero.schema import Schema, parse_date, parse_datetime
+
+
+TIMESTAMPS = [
+    '2013-05-31T06:07:35.3732465Z',
+    '2013-05-31T06:04:20.78',
+    '2013-02-01T00:00:00',
+    '2013-05-31T06:07:35+10:00',
+    '2013-05-31T06:07:35-0530',
+    '2013-05-31T06:07',
+    '2013-05-31',
+    'May 31 2013 6:07am',
+]
+
+
+class SchemaTest(unittest.TestCase):
+    def test_parse_datetime(self):
+        "The ISO fast path agrees with dateutil"
+        for timestamp in TIMESTAMPS:
+            parsed = parse_datetime(timestamp)
+            expected = parse(timestamp)
+            self.assertEqual(parsed, expected)
+            self.assertEqual(parsed.utcoffset(), expected.utcoffset())
+
+    def test_parse_date(self):
+        for timestamp in TIMESTAMPS:
+            self.assertEqual(parse_date(timestamp), parse(timestamp).date())
+
+    def test_converters(self):
+        schema = Schema('Invoice', ['LineItem'], {
+            'Date': 'date',
+            'Total': 'decimal',
+            'IsSupplier': 'boolean',
+        })
+        self.assertEqual(schema.collections, frozenset(['LineItem', 'Invoice']))
+        self.assertEqual(schema.converters['Date']('2013-02-01T00:00:00'), date(2013, 2, 1))
+        self.assertEqual(schema.converters['Total']('850.00'), Decimal('850.00'))
+        self.assertEqual(schema.converters['IsSupplier']('true'), True)
+        self.assertNotIn('Name', schema.converters)
+
+    def test_manager_schema(self):
+        "Schemas are compiled once per endpoint, and shared"
+        first = Xero(Mock()).invoices
+        second = Xero(Mock()).invoices
+        self.assertIs(first.schema, second.schema)
+        self.assertIsNot(first.schema, Xero(Mock()).contacts.schema)
+
+        self.assertEqual(first.schema.fields['UpdatedDateUTC'], 'datetime')
+        self.assertEqual(first.schema.fields['Date'], 'date')
+        self.assertEqual(first.schema.fields['IsSupplier'], 'boolean')
+        # Amounts are left as strings.
+        self.assertNotIn('Total', first.schema.fields)
+
+        self.assertEqual(
+            first.decoder.decode(
+                b'<Response><Invoices><Invoice><Date>2013-02-01T00:00:00</Date>'
+                b'<Total>10.00</Total></Invoice></Invoices></Response>'
+            ),
+            {'Response': {'Invoices': {'Invoice': {
+                'Date': date(2013, 2, 1),
+                'Total': '10.00',
+            }}}}
+        )
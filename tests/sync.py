@@ -0,0 +1,92 @@
+from __future__ import unicode_literals
+
+from datetime import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock, patch
+
+from xero import Xero
+from xero.sync import FileStore, MemoryStore, SQLiteStore, Sync
+
+
+class StoreTests(object):
+    "Tests that apply to every watermark store"
+
+    def test_watermarks(self):
+        "Watermarks are stored per tenant and endpoint"
+        self.assertIsNone(self.store.get('org1', 'Invoices'))
+
+        self.store.set('org1', 'Invoices', datetime(2013, 5, 31, 6, 4, 20, 780000))
+        self.store.set('org1', 'Contacts', datetime(2013, 1, 1))
+        self.store.set('org2', 'Invoices', datetime(2013, 2, 1))
+        self.store.set('org1', 'Contacts', datetime(2013, 3, 1))
+
+        self.assertEqual(self.store.get('org1', 'Invoices'), datetime(2013, 5, 31, 6, 4, 20, 780000))
+        self.assertEqual(self.store.get('org1', 'Contacts'), datetime(2013, 3, 1))
+        self.assertEqual(self.store.get('org2', 'Invoices'), datetime(2013, 2, 1))
+
+
+class MemoryStoreTest(StoreTests, unittest.TestCase):
+    def setUp(self):
+        self.store = MemoryStore()
+
+
+class FileStoreTest(StoreTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = FileStore(os.path.join(self.directory, 'watermarks.json'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+class SQLiteStoreTest(StoreTests, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.store = SQLiteStore(os.path.join(self.directory, 'watermarks.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+class SyncTest(unittest.TestCase):
+    def response(self, *updated):
+        contacts = ''.join(
+            '<Contact><ContactID>%d</ContactID><UpdatedDateUTC>%s</UpdatedDateUTC></Contact>' % (i, u)
+            for i, u in enumerate(updated)
+        )
+        return Mock(status_code=200, headers={'content-type': 'text/xml; charset=utf-8'}, encoding='utf-8',
+                    text='<Response><Status>OK</Status><Contacts>%s</Contacts></Response>' % contacts)
+
+    @patch('requests.Session.get')
+    def test_changes(self, r_get):
+        "Each sync only requests the records changed since the previous one"
+        r_get.side_effect = [
+            self.response('2013-05-31T06:04:20.78', '2013-06-02T10:00:00'),
+            self.response('2013-06-03T11:30:00'),
+        ]
+        store = MemoryStore()
+        sync = Sync(Xero(Mock()), store, tenant='org1')
+
+        changes = sync.changes('Contacts')
+        self.assertEqual(len(list(changes)), 2)
+        self.assertIsNone(r_get.call_args[1]['headers'])
+        self.assertEqual(store.get('org1', 'Contacts'), datetime(2013, 6, 2, 10, 0))
+
+        changes = sync.changes('Contacts')
+        self.assertEqual([c['ContactID'] for c in changes], ['0'])
+        self.assertEqual(r_get.call_args[1]['headers'], {'If-Modified-Since': 'Sun, 02 Jun 2013 10:00:00 GMT'})
+        self.assertEqual(store.get('org1', 'Contacts'), datetime(2013, 6, 3, 11, 30))
+
+    @patch('requests.Session.get')
+    def test_interrupted(self, r_get):
+        "The watermark isn't moved until every change has been consumed"
+        r_get.return_value = self.response('2013-05-31T06:04:20.78', '2013-06-02T10:00:00')
+        store = MemoryStore()
+        sync = Sync(Xero(Mock()), store, tenant='org1')
+
+        next(sync.changes('Contacts'))
+        self.assertIsNone(store.get('org1', 'Contacts'))
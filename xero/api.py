@@ -1,5 +1,6 @@
 from .manager import Manager
-from .constants import XERO_PAYROLL_API_URL
+from .constants import XERO_API_URL, XERO_PAYROLL_API_URL
+from .transport import make_session, DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES
 
 class Xero(object):
     """An ORM-like interface to the Xero API"""
@@ -11,13 +12,100 @@ class Xero(object):
                            u'PayrollCalendars', u'PayRuns', u'Payslip',
                            u'SuperFunds', u'SuperFundProducts', u'Timesheets')
 
-    def __init__(self, credentials):
-        # Iterate through the list of objects we support, for
-        # each of them create an attribute on our self that is
-        # the lowercase name of the object and attach it to an
-        # instance of a Manager object to operate on it
+    def __init__(self, credentials, session=None,
+                 pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 rate_limiter=None, retry_policy=None,
+                 cache=None, cache_ttls=None, tenant=None, decoding='native',
+                 models=False, format='xml', hooks=None, profiler=None,
+                 decode_pool=None):
+        # All managers share a single HTTP session (and so, a single
+        # pool of keep-alive connections). `pool_size` and `max_retries`
+        # configure that pool, unless an existing session is provided.
+        # It's created when it's first needed; see __getattr__.
+        if session is not None:
+            self.session = session
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.credentials = credentials
+
+        # If provided, a RateLimiter that paces the requests of all
+        # managers to stay within Xero's limits.
+        self.rate_limiter = rate_limiter
+
+        # If provided, a RetryPolicy that decides which failed requests
+        # are retried, and when.
+        self.retry_policy = retry_policy
+
+        # If provided, a cache for the results of requests to the
+        # endpoints that have a TTL in `cache_ttls` (by default, the
+        # endpoints holding reference data). Cached results belong to
+        # `tenant`, which identifies the organisation, and must be given
+        # (see Manager._check_tenant).
+        Manager._check_tenant(cache, tenant)
+        self.cache = cache
+        self.cache_ttls = cache_ttls
+        self.tenant = tenant
+
+        # How field values are decoded: 'native' (booleans, dates and
+        # datetimes), 'typed' (also Decimal amounts), or 'raw' (no
+        # conversion at all).
+        self.decoding = decoding
+
+        # Decode records into the compact classes of xero.models,
+        # rather than dicts.
+        self.models = models
+
+        # Request responses in JSON ('json') rather than XML ('xml').
+        # Either way, results have the same form.
+        Manager._check_options(decoding, format)
+        self.format = format
+
+        # Hooks (see xero.hooks.Hook) that observe every request made,
+        # e.g. a xero.metrics.MetricsCollector.
+        self.hooks = hooks
+
+        # A xero.profiling.Profiler (or True, for a new one) that times
+        # the phases of every call, shared by every manager.
+        if profiler is True:
+            from .profiling import Profiler
+            profiler = Profiler()
+        self.profiler = profiler
+
+        # A multiprocessing.Pool that large responses are decoded in,
+        # shared by every manager.
+        self.decode_pool = decode_pool
+
+    def __getattr__(self, name):
+        """Construct the HTTP session, and the managers, when first used.
+
+        Each object we support is available as an attribute with the
+        lowercase name of the object, holding a Manager to operate on
+        it. Most programs only use a few of them, so each manager is
+        only constructed (and kept) when it's first asked for.
+        """
+        if name == 'session':
+            value = make_session(self.pool_size, self.max_retries)
+        else:
+            value = self._object_manager(name)
+        # If another thread got there first, use what it made.
+        return self.__dict__.setdefault(name, value)
+
+    def _object_manager(self, attribute):
+        "Construct the manager held by an attribute"
         for name in self.OBJECT_LIST:
-            setattr(self, name.lower(), Manager(name, credentials.oauth))
-        
+            if name.lower() == attribute:
+                return self._manager(name)
         for name in self.PAYROLL_OBJECT_LIST:
-            setattr(self, name.lower(), Manager(name, credentials.oauth, url=XERO_PAYROLL_API_URL))
+            if name.lower() == attribute:
+                return self._manager(name, url=XERO_PAYROLL_API_URL)
+        raise AttributeError(attribute)
+
+    def _manager(self, name, url=XERO_API_URL):
+        "Construct the manager for the named API object"
+        return Manager(name, self.credentials.oauth, url=url, session=self.session,
+                       rate_limiter=self.rate_limiter, retry_policy=self.retry_policy,
+                       cache=self.cache, cache_ttls=self.cache_ttls, tenant=self.tenant,
+                       decoding=self.decoding, models=self.models, format=self.format,
+                       hooks=self.hooks, profiler=self.profiler,
+                       decode_pool=self.decode_pool)
+
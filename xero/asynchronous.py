@@ -0,0 +1,76 @@
+from multiprocessing.pool import ThreadPool
+
+from .api import Xero
+from .constants import XERO_API_URL
+from .manager import Manager
+from .transport import DEFAULT_POOL_SIZE
+
+
+class AsyncManager(object):
+    """A non-blocking counterpart to a Manager.
+
+    Each API method submits the call to a thread pool and immediately
+    returns an AsyncResult; call get() on it to wait for (and obtain)
+    the result, or to raise the Xero exception describing the failure:
+
+        >>> invoice = xero.invoices.get(u'...')
+        >>> contacts = xero.contacts.all()
+        >>> invoice.get()['Total'], len(contacts.get())
+
+    URL building, filtering, serialization and error handling are all
+    performed by the wrapped (synchronous) Manager, which remains
+    available as `manager` for the streaming methods.
+    """
+    ASYNC_METHODS = Manager.DECORATED_METHODS + ('all_pages',)
+
+    def __init__(self, manager, pool):
+        self.manager = manager
+        self.pool = pool
+
+    @property
+    def name(self):
+        return self.manager.name
+
+
+def _submit(method_name):
+    "An AsyncManager method submitting a call to its Manager's method to the pool"
+    def wrapper(self, *args, **kwargs):
+        return self.pool.apply_async(getattr(self.manager, method_name), args, kwargs)
+
+    wrapper.__name__ = method_name
+    return wrapper
+
+
+# The methods are made once, here, rather than for every manager.
+for method_name in AsyncManager.ASYNC_METHODS:
+    setattr(AsyncManager, method_name, _submit(method_name))
+
+
+class AsyncXero(Xero):
+    """A Xero client whose API calls don't block the caller.
+
+    Calls from every manager are run on a shared pool of `workers`
+    threads. Several clients (e.g., one per organisation) can share a
+    single pool and HTTP session, so that requests for many
+    organisations can be in flight at once:
+
+        >>> pool = ThreadPool(50)
+        >>> clients = [AsyncXero(c, pool=pool) for c in credentials]
+        >>> results = [client.invoices.all() for client in clients]
+        >>> invoices = [result.get() for result in results]
+    """
+    def __init__(self, credentials, pool=None, workers=DEFAULT_POOL_SIZE, **kwargs):
+        self._owns_pool = pool is None
+        self.pool = pool or ThreadPool(workers)
+        kwargs.setdefault('pool_size', workers)
+        super(AsyncXero, self).__init__(credentials, **kwargs)
+
+    def _manager(self, name, url=XERO_API_URL):
+        manager = super(AsyncXero, self)._manager(name, url=url)
+        return AsyncManager(manager, self.pool)
+
+    def close(self):
+        "Wait for outstanding calls to complete, and shut down the thread pool"
+        if self._owns_pool:
+            self.pool.close()
+            self.pool.join()
@@ -1,4 +1,3 @@
-import requests
 from requests_oauthlib import OAuth1
 from oauthlib.oauth1 import SIGNATURE_RSA, SIGNATURE_TYPE_AUTH_HEADER
 from urlparse import parse_qs
@@ -6,6 +5,7 @@ from urllib import urlencode
 
 from .constants import REQUEST_TOKEN_URL, AUTHORIZE_URL, ACCESS_TOKEN_URL
 from .exceptions import *
+from .transport import make_session
 
 
 class PrivateCredentials(object):
@@ -82,7 +82,7 @@ class PublicCredentials(object):
     def __init__(self, consumer_key, consumer_secret,
                  callback_uri=None, verified=False,
                  oauth_token=None, oauth_token_secret=None,
-                 scope=None):
+                 scope=None, session=None):
         """Construct the auth instance.
 
         Must provide the consumer key and secret.
@@ -91,6 +91,9 @@ class PublicCredentials(object):
         
         The scope_list should be provided when required by the API,
         for instance, this is required when accessing the PayrollAPI.
+
+        A requests Session may be provided to reuse its connections
+        for the OAuth requests; otherwise a new one is created.
         """
         self.consumer_key = consumer_key
         self.consumer_secret = consumer_secret
@@ -102,6 +105,7 @@ class PublicCredentials(object):
         #     self.scope_list = ['payroll.%s' % s.lower() for s in Xero.PAYROLL_OBJECT_LIST]
         # else:
         self.scope_list = list(scope or [])
+        self.session = session or make_session()
         self._oauth = None
 
         if oauth_token and oauth_token_secret:
@@ -124,7 +128,7 @@ class PublicCredentials(object):
                 callback_uri=self.callback_uri
             )
 
-            response = requests.post(url=REQUEST_TOKEN_URL, auth=oauth)
+            response = self.session.post(url=REQUEST_TOKEN_URL, auth=oauth)
 
             if response.status_code == 200:
                 credentials = parse_qs(response.text)
@@ -202,7 +206,7 @@ class PublicCredentials(object):
         )
 
         # Make the verification request, gettiung back an access token
-        response = requests.post(url=ACCESS_TOKEN_URL, auth=oauth)
+        response = self.session.post(url=ACCESS_TOKEN_URL, auth=oauth)
 
         if response.status_code == 200:
             credentials = parse_qs(response.text)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+# How long (in seconds) the results of each endpoint are cached by
+# default. These endpoints hold reference data that rarely changes;
+# results from endpoints that aren't listed aren't cached at all.
+DEFAULT_CACHE_TTLS = {
+    u'Accounts': 15 * 60,
+    u'Currencies': 60 * 60,
+    u'Organisations': 60 * 60,
+    u'TaxRates': 60 * 60,
+    u'TrackingCategories': 15 * 60,
+}
+
+# How long the generation of an endpoint's cached results is kept.
+# Once it's gone, the results cached under it are simply not found.
+GENERATION_TTL = 30 * 24 * 60 * 60
+
+
+class MemoryCache(object):
+    """An in-process cache, holding up to `maxsize` entries.
+
+    When full, the least recently used entry is evicted. The cache is
+    shared by all the threads that use the same instance.
+    """
+    def __init__(self, maxsize=1000):
+        # OrderedDict is imported here, so that importing this module
+        # (as every Manager does) works on Python 2.6.
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                expires, value = self.entries.pop(key)
+            except KeyError:
+                return None
+            if expires is not None and expires <= time.time():
+                return None
+            # Reinsert the entry, marking it as most recently used.
+            self.entries[key] = (expires, value)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.time() + ttl if ttl else None, value)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class FileCache(object):
+    """A cache on disk, holding up to `maxsize` entries in `directory`.
+
+    Each entry is a file; when the cache is full, the least recently
+    used entries are removed. The cache can be shared by any processes
+    that can access the directory.
+    """
+    def __init__(self, directory, maxsize=1000):
+        self.directory = directory
+        self.maxsize = maxsize
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key).hexdigest())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as entry:
+                expires = float(entry.readline())
+                value = entry.read()
+        except (IOError, ValueError):
+            return None
+        if expires and expires <= time.time():
+            return None
+        # Mark the entry as recently used (unless it has been removed
+        # in the meantime).
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value, ttl=None):
+        fd, path = tempfile.mkstemp(dir=self.directory, prefix='.')
+        with os.fdopen(fd, 'wb') as entry:
+            entry.write(b'%r\n' % (time.time() + ttl if ttl else 0.0))
+            entry.write(value)
+        os.rename(path, self._path(key))
+        self._evict()
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        "Remove the least recently used entries beyond maxsize"
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.startswith('.'):
+                continue
+            try:
+                entries.append((os.path.getmtime(os.path.join(self.directory, name)), name))
+            except OSError:
+                pass
+        entries.sort()
+        for mtime, name in entries[:max(0, len(entries) - self.maxsize)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class ClientCache(object):
+    """Adapts a shared cache client (e.g., memcached or a Django cache).
+
+    The client must provide get(key), set(key, value, timeout) and
+    delete(key) methods. Entries are always set with a timeout.
+    """
+    def __init__(self, client, prefix='pyxero:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
@@ -0,0 +1,218 @@
+"""Collect records into columns, for bulk analysis.
+
+Usage:
+
+    >>> columns = xero.invoices.columns(explode=u'LineItems', Status='AUTHORISED')
+    >>> columns.to_numpy()       # A NumPy structured array
+    >>> columns.to_arrow()       # A PyArrow Table
+    >>> columns.to_parquet('invoices.parquet')
+
+Records are flattened into one row each (or, when a collection is
+exploded, one row per item in that collection), with a column for each
+field. Nested records become dotted columns (u'Contact.Name'), as do
+the fields of the exploded items (u'LineItems.UnitAmount'); any other
+collections are left out. NumPy and PyArrow are only imported when a
+conversion to them is requested.
+"""
+from collections import OrderedDict
+from datetime import date, datetime
+
+from .models import Record
+from .sync import to_utc
+
+
+def is_record(value):
+    return isinstance(value, (dict, Record))
+
+
+def is_collection(value, collections):
+    """Is a decoded value a collection?
+
+    A collection with several items is decoded as a list; with a single
+    item, as a dict holding that item under its tag (one of
+    `collections`).
+    """
+    if isinstance(value, list):
+        return True
+    if is_record(value):
+        keys = value.keys()
+        return len(keys) == 1 and keys[0] in collections
+    return False
+
+
+def unwrap(value, collections):
+    "The items of a decoded collection, as a list"
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if is_collection(value, collections):
+        return [value[value.keys()[0]]]
+    return [value]
+
+
+def flatten(record, collections, prefix=u''):
+    "Yield a (column, value) pair for each field of a record, except collections"
+    for key, value in record.items():
+        if is_collection(value, collections):
+            continue
+        elif is_record(value):
+            for item in flatten(value, collections, prefix + key + u'.'):
+                yield item
+        else:
+            yield prefix + key, value
+
+
+class Columns(object):
+    """Column buffers that records are appended to, one at a time.
+
+    `fields` restricts (and orders) the columns that are kept; by
+    default, there is a column for every field seen, and rows that
+    don't have a field hold None in that column. If `explode` names a
+    collection field (e.g., u'LineItems'), each item in it gets a row
+    of its own, repeating the fields of the record that holds it.
+    `collections` is the set of tag names that represent an item in a
+    collection (see Manager.MULTI_LINES).
+    """
+    def __init__(self, fields=None, explode=None, collections=()):
+        self.fields = fields
+        self.explode = explode
+        self.collections = frozenset(collections)
+        self.length = 0
+        self.data = OrderedDict((field, []) for field in fields or ())
+
+    def __len__(self):
+        return self.length
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+        return self
+
+    def append(self, record):
+        "Append a record (a dict, or a xero.models record)"
+        row = list(flatten(record, self.collections))
+        items = None
+        if self.explode:
+            items = [
+                list(flatten(item, self.collections))
+                for item in unwrap(record.get(self.explode), self.collections)
+            ]
+        self.add(row, items)
+
+    def add(self, row, items=None):
+        """Append a record that has already been flattened.
+
+        `row` holds the (column, value) pairs of the record, and `items`
+        the pairs of each item of the exploded collection (if any); so
+        XMLDecoder.decode_columns() can append records without building
+        them first.
+        """
+        if not items:
+            self._add_row(row)
+            return
+        prefix = self.explode + u'.'
+        for item in items:
+            self._add_row(row + [(prefix + name, value) for name, value in item])
+
+    def _add_row(self, row):
+        length = self.length
+        for name, value in row:
+            column = self.data.get(name)
+            if column is None:
+                if self.fields is not None:
+                    continue
+                column = self.data[name] = [None] * length
+            if len(column) > length:
+                # A field repeated in a record; the last value wins, as
+                # it does when the record is decoded.
+                column[length] = value
+            else:
+                column.append(value)
+        self.length += 1
+        for column in self.data.values():
+            if len(column) < self.length:
+                column.append(None)
+
+    def to_pydict(self):
+        "The columns, as a dict of lists"
+        return OrderedDict((name, list(values)) for name, values in self.data.items())
+
+    def to_numpy(self):
+        """The rows, as a NumPy structured array.
+
+        Column types are inferred from their values: booleans,
+        datetimes (in UTC) and dates become native NumPy types (if no
+        value is missing from a boolean column), numbers become floats
+        (with NaN for missing values), and anything else becomes a
+        unicode string (with u'' for missing values).
+        """
+        import numpy
+
+        columns = [(str(name), numpy_column(numpy, values)) for name, values in self.data.items()]
+        array = numpy.empty(self.length, dtype=[(name, column.dtype) for name, column in columns])
+        for name, column in columns:
+            array[name] = column
+        return array
+
+    def to_arrow(self):
+        "The rows, as a PyArrow Table"
+        import pyarrow
+
+        return pyarrow.Table.from_arrays(
+            [arrow_column(pyarrow, values) for values in self.data.values()],
+            names=[unicode(name) for name in self.data.keys()]
+        )
+
+    def to_parquet(self, path, **kwargs):
+        "Write the rows to a Parquet file. Any kwargs are passed to PyArrow"
+        import pyarrow.parquet
+
+        pyarrow.parquet.write_table(self.to_arrow(), path, **kwargs)
+
+
+def column_type(values):
+    "The type shared by every value in a column (bool, datetime, date, Decimal or unicode)"
+    from decimal import Decimal
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        elif isinstance(value, bool):
+            kinds.add(bool)
+        elif isinstance(value, datetime):
+            kinds.add(datetime)
+        elif isinstance(value, date):
+            kinds.add(date)
+        elif isinstance(value, (Decimal, int, long, float)):
+            kinds.add(Decimal)
+        else:
+            kinds.add(unicode)
+    return kinds.pop() if len(kinds) == 1 else unicode
+
+
+def numpy_column(numpy, values):
+    from decimal import Decimal
+    kind = column_type(values)
+    if kind is bool and None not in values:
+        return numpy.array(values, dtype=bool)
+    elif kind is datetime:
+        return numpy.array([to_utc(v) if v is not None else None for v in values], dtype='datetime64[us]')
+    elif kind is date:
+        return numpy.array(values, dtype='datetime64[D]')
+    elif kind is Decimal:
+        return numpy.array([float(v) if v is not None else numpy.nan for v in values], dtype=float)
+    return numpy.array([unicode(v) if v is not None else u'' for v in values], dtype=unicode)
+
+
+def arrow_column(pyarrow, values):
+    from decimal import Decimal
+    kind = column_type(values)
+    if kind is datetime:
+        return pyarrow.array([to_utc(v) if v is not None else None for v in values], type=pyarrow.timestamp('us'))
+    elif kind is Decimal:
+        # Arrow infers a decimal type only if every value is a Decimal.
+        return pyarrow.array([Decimal(str(v)) if v is not None else None for v in values])
+    elif kind is unicode:
+        return pyarrow.array([unicode(v) if v is not None else None for v in values], type=pyarrow.string())
+    return pyarrow.array(values)
@@ -0,0 +1,423 @@
+from datetime import datetime, timedelta
+import re
+from xml.parsers.expat import ParserCreate
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+# The kinds of child node a parent element can be built from.
+# Mirrors the shapes produced by Manager.walk_dom:
+#  * EMPTY - an element with no content (dropped by the parent)
+#  * LEAF  - an element holding only text
+#  * NODE  - an element holding other elements
+EMPTY, LEAF, NODE = 0, 1, 2
+
+# The dates in Xero's JSON responses, e.g. /Date(1359676800000+0000)/
+JSON_DATE = re.compile(r'^/Date\((-?\d+)([+-]\d{4})?\)/$')
+EPOCH = datetime(1970, 1, 1)
+
+# The tag of the items of each collection, as Xero names them in XML.
+# JSON only names the collection (an array), so the item tags are
+# looked up here; collections that aren't listed are regular plurals
+# of their items (e.g. u'Invoices' holds u'Invoice's).
+COLLECTION_ITEMS = {
+    u'Tracking': u'TrackingCategory',
+    u'TrackingCategories': u'TrackingCategory',
+    u'Addresses': u'Address',
+    u'Currencies': u'Currency',
+}
+
+
+class Decoder(object):
+    """The parts of decoding shared by every response format.
+
+    A decoder describes each element of a response as a (kind, value)
+    pair, and folds the children of each element into its value just
+    as Manager.convert_to_dict() does.
+    """
+    def __init__(self, schema, models=None):
+        self.schema = schema
+        self.singular = schema.singular
+        self.collections = schema.collections
+        self.converters = schema.converters
+        self.models = models or {}
+
+    def build(self, children):
+        """Fold the decoded children of an element into a single value.
+
+        `children` is a list of (tag, kind, value) tuples, in document
+        order. This is the equivalent of Manager.convert_to_dict for an
+        element with more than one child.
+        """
+        out = {}
+        converters = self.converters
+        collections = self.collections
+        for key, kind, value in children:
+            if kind == LEAF:
+                # we're setting a value
+                # check to see if we need to apply any special
+                # formatting to the value
+                converter = converters.get(key)
+                out[key] = converter(value) if converter else value
+
+            elif kind == NODE and key in collections:
+                # our data is a collection and needs to be handled as such
+                if out:
+                    out.append(value)
+                else:
+                    out = [value]
+
+            elif kind == NODE:
+                out[key] = value
+
+        return out
+
+    def fold(self, tag, children):
+        "Reduce the children of an element into a (kind, value) pair"
+        if len(children) > 1:
+            value = self.build(children)
+        elif children:
+            # A single child is wrapped as-is, without any
+            # conversion of leaf values.
+            key, kind, value = children[0]
+            value = {key: value}
+        else:
+            return EMPTY, None
+
+        if tag in self.models and isinstance(value, dict):
+            value = self.models[tag](value)
+        return NODE, value
+
+    def decode_columns(self, chunks, collection, columns):
+        """Append each item of `collection` in a document that arrives
+        as an iterable of chunks to `columns` (a xero.columnar.Columns).
+
+        Returns the number of items appended.
+        """
+        count = 0
+        for record in self.iterdecode(chunks, collection):
+            columns.append(record)
+            count += 1
+        return count
+
+
+class XMLDecoder(Decoder):
+    """A single-pass decoder for Xero XML responses.
+
+    Produces exactly the same structures as running
+    Manager.convert_to_dict() over Manager.walk_dom() of a minidom
+    document, but does it in one pass over the expat event stream,
+    without building a DOM or intermediate tuples. Elements are
+    discarded as soon as they have been folded into their parent.
+
+    Usage:
+
+        >>> decoder = XMLDecoder(schema)
+        >>> decoder.decode(content)
+        {u'Response': {...}}
+
+    The Schema of the endpoint says which tags represent an item in a
+    collection, and how the text of each typed field is converted into
+    a native Python value. If `models` (a map of tag names onto record
+    classes, like xero.models.MODELS) is provided, elements with those
+    tags are built into records rather than dicts.
+    """
+    def decode(self, content):
+        "Decode a complete XML document (as a byte string)"
+        builder = _Builder(self)
+        parser = builder.parser()
+        parser.Parse(content, True)
+        return builder.result
+
+    def iterdecode(self, chunks, collection):
+        """Decode a document that arrives as an iterable of byte chunks.
+
+        Yields each item of `collection` (the top level collection
+        element, e.g. u'Invoices') as soon as its closing tag has been
+        parsed. Items are not retained once they have been yielded.
+        """
+        builder = _Builder(self, collection)
+        parser = builder.parser()
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+            for record in builder.flush():
+                yield record
+        parser.Parse(b'', True)
+        for record in builder.flush():
+            yield record
+
+    def decode_columns(self, chunks, collection, columns):
+        """Append each item of `collection` in a document that arrives
+        as an iterable of chunks to `columns` (a xero.columnar.Columns).
+
+        Items are appended as soon as their closing tag has been parsed,
+        without being built: their fields go straight into the columns.
+        Returns the number of items appended.
+        """
+        builder = _ColumnBuilder(self, collection, columns)
+        parser = builder.parser()
+        for chunk in chunks:
+            parser.Parse(chunk, False)
+        parser.Parse(b'', True)
+        return builder.count
+
+
+class _Builder(object):
+    "The per-document state of an XMLDecoder"
+
+    def __init__(self, decoder, collection=None):
+        self.decoder = decoder
+        self.collection = collection
+        self.result = None
+        # Each entry is [tag, text fragments, decoded children]
+        self.stack = []
+        # Completed collection items that haven't been handed out yet
+        self.records = []
+
+    def parser(self):
+        parser = ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.data
+        return parser
+
+    def start(self, tag, attrs):
+        self.stack.append([tag, [], []])
+
+    def data(self, text):
+        self.stack[-1][1].append(text)
+
+    def end(self, tag):
+        tag, text, children = self.stack.pop()
+        kind, value = self.fold(tag, text, children)
+
+        if self.collection and self.is_record(tag):
+            if kind != EMPTY:
+                self.records.append(value)
+        elif self.stack:
+            self.stack[-1][2].append((tag, kind, value))
+        else:
+            self.result = {tag: value}
+
+    def is_record(self, tag):
+        "Is `tag` (which has just closed) an item of the streamed collection?"
+        return (
+            tag == self.decoder.singular and
+            len(self.stack) == 2 and
+            self.stack[-1][0] == self.collection
+        )
+
+    def flush(self):
+        "Hand out (and forget) the collection items decoded so far"
+        records, self.records = self.records, []
+        return records
+
+    def fold(self, tag, text, children):
+        "Reduce the content of an element into a (kind, value) pair"
+        if children:
+            return self.decoder.fold(tag, children)
+
+        text = u''.join(text).strip()
+        if text:
+            return LEAF, text
+        return EMPTY, None
+
+
+class _ColumnBuilder(_Builder):
+    """The per-document state of XMLDecoder.decode_columns()
+
+    Below an item of the streamed collection, each element is folded
+    into the (column, value) pairs that xero.columnar.flatten() yields
+    for the value the element would be decoded as, and a collection
+    into the pairs of each of its items (which are only kept for the
+    collection being exploded). When the item closes, its pairs are
+    appended to the columns.
+    """
+    def __init__(self, decoder, collection, columns):
+        super(_ColumnBuilder, self).__init__(decoder, collection)
+        self.columns = columns
+        self.count = 0
+
+    def end(self, tag):
+        stack = self.stack
+        if len(stack) < 3 or stack[1][0] != self.collection or stack[2][0] != self.decoder.singular:
+            # Not within an item of the collection
+            return super(_ColumnBuilder, self).end(tag)
+
+        tag, text, children = stack.pop()
+        if len(stack) == 2:
+            self.add(tag, text, children)
+        else:
+            keep = len(stack) == 3 and tag == self.columns.explode
+            stack[-1][2].append((tag,) + self.flatten(tag, text, children, keep))
+
+    def add(self, tag, text, children):
+        "Append an item of the collection, which has just closed, to the columns"
+        kind, row = self.flatten(tag, text, children, False)
+        if kind != NODE:
+            return
+        items = None
+        explode = self.columns.explode
+        if explode:
+            for key, kind, value in children:
+                if key == explode:
+                    items = value if isinstance(value, _Items) else [value] if _is_row(kind, value) else None
+        if isinstance(row, _Items):
+            row = []
+        self.columns.add(row, items)
+        self.count += 1
+
+    def flatten(self, tag, text, children, keep):
+        """Reduce an element into a (kind, value) pair, where the value
+        of a NODE is a list of (column, value) pairs, or the _Items of a
+        collection (empty, unless `keep`)"""
+        if not children:
+            return self.fold(tag, text, children)
+
+        collections = self.decoder.collections
+        if len(children) == 1:
+            # Wrapped as-is, as Decoder.fold() does
+            key, kind, value = children[0]
+            if key in collections:
+                return NODE, _Items([value] if keep and _is_row(kind, value) else ())
+            return NODE, _prefixed(key, kind, value)
+
+        converters = self.decoder.converters
+        row = []
+        items = None
+        for key, kind, value in children:
+            if kind == LEAF:
+                converter = converters.get(key)
+                row.append((key, converter(value) if converter else value))
+            elif kind == NODE and key in collections:
+                if items is None:
+                    items = _Items()
+                if keep and _is_row(kind, value):
+                    items.append(value)
+            elif kind == NODE:
+                row.extend(_prefixed(key, kind, value))
+        if items is not None:
+            return NODE, items
+        return NODE, row
+
+
+class _Items(list):
+    "The items of a collection, each a list of (column, value) pairs"
+
+
+def _is_row(kind, value):
+    "Is a folded value the (column, value) pairs of a record?"
+    return kind == NODE and not isinstance(value, _Items)
+
+
+def _prefixed(key, kind, value):
+    "The (column, value) pairs of a field of a record being flattened"
+    if isinstance(value, _Items):
+        return []
+    if kind == NODE:
+        return [(key + u'.' + name, item) for name, item in value]
+    return [(key, value)]
+
+
+class _Folded(tuple):
+    "A JSON object that has been folded into a (kind, value) pair"
+
+
+class JSONDecoder(Decoder):
+    """A decoder for Xero JSON responses (requested with Accept: application/json).
+
+    Produces the same structures as the XMLDecoder does for the same
+    response in XML, so results don't depend on the format they were
+    requested in. Each JSON array is treated as an element holding an
+    item for each entry, tagged with the singular of the array's name;
+    numbers are kept as the text they were written as; booleans become
+    true/false; and dates (/Date(1359676800000+0000)/) are rewritten in
+    ISO 8601 format, before typed fields are converted by the Schema.
+
+    Uses simplejson, if it's installed.
+    """
+    def __init__(self, schema, models=None, items=COLLECTION_ITEMS):
+        super(JSONDecoder, self).__init__(schema, models)
+        self.items = items
+
+    def decode(self, content):
+        "Decode a complete JSON document"
+        response = json.loads(
+            content,
+            object_pairs_hook=self.fold_object,
+            parse_float=unicode,
+            parse_int=unicode,
+        )
+        kind, value = self.element(u'Response', response)
+        return {u'Response': value}
+
+    def iterdecode(self, chunks, collection):
+        """Decode a document that arrives as an iterable of chunks.
+
+        JSON can't be decoded incrementally: the whole document is
+        decoded first, and then each item of `collection` is yielded.
+        """
+        response = self.decode(b''.join(chunks))[u'Response']
+        items = response.get(collection) if isinstance(response, dict) else None
+        if isinstance(items, list):
+            for item in items:
+                yield item
+        elif isinstance(items, dict) and self.singular in items:
+            yield items[self.singular]
+
+    def fold_object(self, pairs):
+        "Fold the (key, value) pairs of a JSON object, as they're parsed"
+        keys = set(key for key, value in pairs)
+        children = []
+        for key, value in pairs:
+            if key.endswith(u'String') and key[:-6] in keys:
+                # A preformatted copy of a date; XML doesn't have it.
+                continue
+            kind, value = self.element(key, value)
+            if kind != EMPTY:
+                children.append((key, kind, value))
+        return _Folded(self.fold(None, children))
+
+    def element(self, tag, value):
+        "Describe a parsed JSON value as an element with the given tag"
+        if isinstance(value, _Folded):
+            kind, value = value
+            if kind == NODE and tag in self.models and isinstance(value, dict):
+                value = self.models[tag](value)
+            return kind, value
+
+        if isinstance(value, list):
+            item_tag = self.item_tag(tag)
+            children = []
+            for item in value:
+                kind, item = self.element(item_tag, item)
+                if kind != EMPTY:
+                    children.append((item_tag, kind, item))
+            return self.fold(tag, children)
+
+        if value is None:
+            return EMPTY, None
+        if value is True or value is False:
+            return LEAF, u'true' if value else u'false'
+
+        text = value.strip()
+        match = JSON_DATE.match(text)
+        if match:
+            # The milliseconds are the time Xero shows (in the
+            # organisation's timezone); the offset is informational.
+            text = (EPOCH + timedelta(milliseconds=int(match.group(1)))).isoformat()
+        if text:
+            return LEAF, text
+        return EMPTY, None
+
+    def item_tag(self, name):
+        "The tag of the items in the collection `name` (e.g. u'LineItems')"
+        item = self.items.get(name)
+        if item is not None:
+            return item
+        if name.endswith(u's'):
+            return name[:-1]
+        return name
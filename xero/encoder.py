@@ -0,0 +1,115 @@
+from datetime import date, datetime
+
+from .models import Record
+
+# The types of value that are written as an element with child elements.
+MAPPINGS = (dict, Record)
+SEQUENCES = (list, tuple)
+
+
+def format_value(value):
+    """The text of an element holding a value, as unicode.
+
+    Returns None for None (which is written as an empty element).
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return u'true' if value else u'false'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    return unicode(value)
+
+
+def escape(text):
+    "Escape text, as ASCII bytes"
+    text = text.replace(u'&', u'&amp;').replace(u'<', u'&lt;').replace(u'>', u'&gt;')
+    return text.encode('us-ascii', 'xmlcharrefreplace')
+
+
+class XMLEncoder(object):
+    """Writes the XML body of a request to save records.
+
+    Produces exactly the same bytes as ElementTree.tostring() of the
+    tree built by Manager.dict_to_xml() (ASCII, with other characters as
+    character references, and no XML declaration), but writes them
+    straight into a buffer, without building the tree.
+
+    Usage:
+
+        >>> encoder = XMLEncoder(Manager.PLURAL_EXCEPTIONS)
+        >>> encoder.encode(u'Invoices', u'Invoice', [invoice1, invoice2])
+        '<Invoices><Invoice>...</Invoice><Invoice>...</Invoice></Invoices>'
+
+    Values are formatted by type: booleans as true/false, dates and
+    datetimes in ISO 8601 format, and anything else (e.g., Decimals) as
+    its unicode representation.
+    """
+    def __init__(self, plural_exceptions=None):
+        self.plural_exceptions = plural_exceptions or {}
+
+    def encode(self, collection, singular, data):
+        """Encode a record (a dict) as a `singular` element, or a list of
+        records as a `collection` element holding one for each"""
+        return b''.join(self.iterencode(collection, singular, data))
+
+    def iterencode(self, collection, singular, data):
+        "Encode records as encode() does, yielding a chunk per record"
+        if not isinstance(data, SEQUENCES):
+            parts = []
+            self.write(parts, singular, data)
+            yield b''.join(parts)
+            return
+
+        if not data:
+            yield b'<%s />' % escape(collection)
+            return
+
+        yield b'<%s>' % escape(collection)
+        for record in data:
+            parts = []
+            self.write(parts, singular, record)
+            yield b''.join(parts)
+        yield b'</%s>' % escape(collection)
+
+    def write(self, parts, tag, value):
+        "Append the parts of an element holding a value to a list"
+        name = escape(tag)
+        start = len(parts)
+        parts.append(b'<%s>' % name)
+
+        if isinstance(value, MAPPINGS):
+            self.write_fields(parts, value)
+
+        elif isinstance(value, SEQUENCES):
+            # key name is a plural. This means each item
+            # in the list needs to be wrapped in an XML
+            # node that is a singular version of the list name.
+            if tag[-1:] == u's':
+                item_tag = self.plural_exceptions.get(tag[:-1], tag[:-1])
+                for item in value:
+                    self.write(parts, item_tag, item)
+
+            # key name isn't a plural. Just insert the content
+            # of each item as subnodes
+            else:
+                for item in value:
+                    self.write_fields(parts, item)
+
+        else:
+            text = format_value(value)
+            if text:
+                parts.append(escape(text))
+
+        if len(parts) == start + 1:
+            # Nothing inside; an empty element.
+            parts[start] = b'<%s />' % name
+        else:
+            parts.append(b'</%s>' % name)
+
+    def write_fields(self, parts, record):
+        "Append an element for each field of a record"
+        for key in record.keys():
+            self.write(parts, key, record[key])
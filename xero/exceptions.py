@@ -1,5 +1,5 @@
+import json
 from urlparse import parse_qs
-from xml.dom.minidom import parseString
 from xml.parsers.expat import ExpatError
 
 class XeroException(Exception):
@@ -13,12 +13,39 @@ class XeroNotVerified(Exception):
     pass
 
 
+def parseString(content):
+    "Parse an XML document with minidom (which is only imported when needed)"
+    from xml.dom.minidom import parseString
+    return parseString(content)
+
+
+def json_payload(response):
+    "The JSON object in the body of a response, or None if there isn't one"
+    try:
+        payload = json.loads(response.text)
+    except (TypeError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
 class XeroBadRequest(XeroException):
     # HTTP 400: Bad Request
     def __init__(self, response):
         # Extract the messages from the text.
         # parseString takes byte content, not unicode.
-        
+
+        payload = json_payload(response)
+        if payload and 'Message' in payload:
+            # A JSON response; validation errors are reported against
+            # each element.
+            self.errors = [
+                error['Message']
+                for element in payload.get('Elements', [])
+                for error in element.get('ValidationErrors', [])
+            ]
+            super(XeroBadRequest, self).__init__(response, payload['Message'])
+            return
+
         try:
             dom = parseString(response.text.encode(response.encoding))
         except ExpatError:
@@ -71,6 +98,11 @@ class XeroNotImplemented(XeroException):
     def __init__(self, response):
         # Extract the useful error message from the text.
         # parseString takes byte content, not unicode.
+        payload = json_payload(response)
+        if payload and 'Message' in payload:
+            super(XeroNotImplemented, self).__init__(response, payload['Message'])
+            return
+
         dom = parseString(response.text.encode(response.encoding))
         messages = dom.getElementsByTagName('Message')
 
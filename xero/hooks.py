@@ -0,0 +1,31 @@
+class Hook(object):
+    """Observes the requests made by managers, and the decoding of responses.
+
+    Usage:
+
+        >>> class LogRequests(Hook):
+        ...     def after_response(self, manager, method, uri, response, elapsed):
+        ...         log.info('%s %s: %s in %.3fs', method, uri, response.status_code, elapsed)
+        >>> xero = Xero(credentials, hooks=[LogRequests()])
+
+    Subclasses override the events they're interested in; every method
+    is called with the Manager making the request. A hook is shared by
+    every thread that uses the managers it's attached to, so it must be
+    thread safe. Exceptions raised by a hook aren't caught.
+    """
+    def before_request(self, manager, method, uri, headers):
+        "A request is about to be made (once per attempt)"
+
+    def after_response(self, manager, method, uri, response, elapsed):
+        """A response (of any status) has been received, `elapsed`
+        seconds after the request was made. For streamed requests, only
+        the headers have been received."""
+
+    def on_error(self, manager, method, uri, exception, attempt, delay):
+        """An attempt to make a request failed with `exception`. It will
+        be retried after `delay` seconds (or not at all, if None)."""
+
+    def on_decode(self, manager, method, response, elapsed, records):
+        """`records` records were decoded from a response in `elapsed`
+        seconds. For streamed responses, this is reported once the last
+        record has been decoded, and includes the time spent reading."""
@@ -1,17 +1,81 @@
-from xml.dom.minidom import parseString
-from xml.etree.ElementTree import tostring, SubElement, Element
-from datetime import datetime
-from dateutil.parser import parse
+from collections import deque
+import cPickle as pickle
+from datetime import datetime, timedelta
+from functools import wraps
+import hashlib
+import sys
+import time
 import urllib
-import requests
 from urlparse import parse_qs
 
+from .cache import DEFAULT_CACHE_TTLS, GENERATION_TTL
 from .constants import XERO_API_URL
+from .decoder import JSONDecoder, XMLDecoder
+from .encoder import XMLEncoder
 from .exceptions import *
+from .models import MODELS, Record
+from .schema import Schema
+from .transport import make_session
+
+
+# Size of the blocks read from a streamed response
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def as_list(result):
+    "Normalize a decoded result (None, a record, or a list) into a list"
+    if result is None:
+        return []
+    if isinstance(result, (list, tuple)):
+        return list(result)
+    return [result]
+
+
+def validation_errors(record):
+    "The messages of the validation errors reported for a saved record"
+    errors = record and record.get(u'ValidationErrors')
+    if not errors:
+        return []
+    if isinstance(errors, dict):
+        errors = [errors.get(u'ValidationError', errors)]
+    return [error[u'Message'] for error in errors if u'Message' in error]
+
+
+def capture(func, *args, **kwargs):
+    "Call a function, returning (rather than raising) any exception"
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        return e
+
+
+def decode_content(cls, options, content):
+    """Decode a response in a worker process of a Manager's decode_pool.
+
+    Only the Manager class and its decoder options are sent to the
+    worker, which builds (and keeps) the decoder itself.
+    """
+    return cls._decoder(*options).decode(content)
+
+
+def thread_pool(processes):
+    "A pool of threads (multiprocessing is only imported when one is needed)"
+    from multiprocessing.pool import ThreadPool
+    return ThreadPool(processes)
+
+
+class _Fetched(object):
+    "A page that has already been fetched; quacks like an AsyncResult"
+    def __init__(self, result):
+        self.result = result
+
+    def get(self):
+        return self.result
 
 
 class Manager(object):
     DECORATED_METHODS = ('get', 'save', 'filter', 'all', 'put')
+    STREAMED_METHODS = ('iter_all', 'iter_filter')
     
     # Field names we need to convert to native python types.
     DATETIME_FIELDS = (u'UpdatedDateUTC', u'Updated', u'FullyPaidOnDate', 
@@ -20,6 +84,13 @@ class Manager(object):
                    u'PeriodLockDate',)
     BOOLEAN_FIELDS = (u'IsSupplier', u'IsCustomer', u'IsDemoCompany',
                       u'PaysTax')
+    # Money and quantity fields, which can be decoded as Decimals.
+    DECIMAL_FIELDS = (u'SubTotal', u'TotalTax', u'Total', u'TotalDiscount',
+                      u'AmountDue', u'AmountPaid', u'AmountCredited',
+                      u'RemainingCredit', u'Quantity', u'UnitAmount',
+                      u'DiscountRate', u'TaxAmount', u'LineAmount',
+                      u'Amount', u'CurrencyRate', u'Rate', u'EffectiveRate',
+                      u'NumberOfUnits', u'RatePerUnit')
     
     # Fields that are actually an item in a collection need to be
     # listed here. Typically, you'll see them in the XML something
@@ -29,13 +100,82 @@ class Manager(object):
     #  <Phone>...</Phone>
     # </Phones>
     MULTI_LINES = (u'LineItem', u'Phone', u'Address', u'TaxRate',
-                   u'TrackingCategory', u'Option', u'Organisation',)
+                   u'TrackingCategory', u'Option', u'Organisation',
+                   u'ValidationError',)
     PLURAL_EXCEPTIONS = {'Addresse': 'Address'}
 
-    def __init__(self, name, oauth, url=XERO_API_URL):
+    # Endpoints that return their results in pages of PAGE_SIZE
+    # records when a page parameter is provided.
+    PAGED_OBJECTS = (u'Contacts', u'CreditNotes', u'Invoices',
+                     u'Employees', u'LeaveApplications', u'PayRuns',
+                     u'Timesheets')
+    PAGE_SIZE = 100
+
+    # Endpoints that can return several specific records at once,
+    # when given an IDs parameter.
+    IDS_OBJECTS = (u'Contacts', u'Invoices')
+    # Longest URI we'll build when requesting records by ID.
+    MAX_URI_LENGTH = 2000
+
+    # How long (in seconds) after they were last requested in full
+    # cached results can be revalidated, and how far before the time of
+    # the response they were cached from they are revalidated against.
+    CACHE_STALE_TTL = 24 * 60 * 60
+    REVALIDATION_MARGIN = 60
+
+    # Responses smaller than this (in bytes) are decoded in the calling
+    # thread even if there's a decode_pool, as that's cheaper than
+    # sending them to another process and the results back.
+    DECODE_POOL_THRESHOLD = 256 * 1024
+
+    # The types of field converted by each decoding mode:
+    #  * native - booleans, dates and datetimes; amounts are unicode
+    #  * typed  - the same, with amounts and quantities as Decimals
+    #  * raw    - nothing; every value is left as unicode
+    DECODING_MODES = {
+        'native': ('boolean', 'datetime', 'date'),
+        'typed': ('decimal', 'boolean', 'datetime', 'date'),
+        'raw': (),
+    }
+
+    # The formats responses can be requested in
+    FORMATS = ('xml', 'json')
+
+    # The compiled schema of each endpoint (and decoding mode), and the
+    # decoders and encoders (which hold no state of their own between
+    # calls), shared by every manager; and so, by every organisation
+    # of a XeroPool.
+    _schemas = {}
+    _decoders = {}
+    _encoders = {}
+
+    def __init__(self, name, oauth, url=XERO_API_URL, session=None, rate_limiter=None,
+                 retry_policy=None, cache=None, cache_ttls=None, tenant=None,
+                 decoding='native', models=False, format='xml', hooks=None,
+                 profiler=None, decode_pool=None):
         self.oauth = oauth
         self.name = name
         self.url = url
+        # The requests Session used to talk to Xero. A Xero instance
+        # shares a single Session between all its managers, so that
+        # connections are reused.
+        self.session = session or make_session()
+        # An optional RateLimiter, also shared by all the managers of
+        # a Xero instance, that paces requests.
+        self.rate_limiter = rate_limiter
+        # An optional RetryPolicy, deciding which failed requests are
+        # retried, and how long to wait before doing so.
+        self.retry_policy = retry_policy
+        # An optional cache for the results of GET requests, with the
+        # number of seconds results are cached for each endpoint, and
+        # the identity of the organisation they belong to.
+        self._check_tenant(cache, tenant)
+        self.cache = cache
+        self.cache_ttls = DEFAULT_CACHE_TTLS if cache_ttls is None else cache_ttls
+        self.tenant = tenant
+        # Hooks (see xero.hooks.Hook) that observe the requests made,
+        # and the decoding of their responses.
+        self.hooks = list(hooks or ())
 
         # setup our singular variants of the name
         # only if the name ends in 0
@@ -44,21 +184,112 @@ class Manager(object):
         else:
             self.singular = name
 
-        for method_name in self.DECORATED_METHODS:
-            method = getattr(self, method_name)
-            setattr(self, method_name, self._get_data(method))
+        # How field values are converted as responses are decoded;
+        # one of DECODING_MODES.
+        self._check_options(decoding, format)
+        self.decoding = decoding
+        self.schema = self._schema(self.singular, decoding)
+        # Records are decoded into dicts or, if `models` is set, into
+        # the record classes of xero.models.
+        self.models = models
+        # The format responses are requested in: 'xml', or 'json'
+        # (which is cheaper to decode).
+        self.format = format
+        self.decoder = self._decoder(self.singular, decoding, models, format)
+        self.encoder = self._encoder()
+        # An optional pool of processes (a multiprocessing.Pool) that
+        # large responses are decoded in, so that decoding them doesn't
+        # hold up the threads making requests.
+        self.decode_pool = decode_pool
+        self._decoder_options = (self.singular, decoding, models, format)
+
+        # An optional xero.profiling.Profiler, which times each call in
+        # phases; it observes requests as a hook, and decodes responses
+        # (in this process) with an instrumented copy of the decoder.
+        if profiler is True:
+            from .profiling import Profiler
+            profiler = Profiler()
+        self.profiler = profiler
+        if profiler:
+            self.hooks.append(profiler)
+            self.decoder = profiler.instrument(self.decoder)
+
+    @classmethod
+    def _check_options(cls, decoding, format):
+        "Raise ValueError if the decoding mode or response format is unknown"
+        if decoding not in cls.DECODING_MODES:
+            raise ValueError('Unknown decoding mode: %r' % decoding)
+        if format not in cls.FORMATS:
+            raise ValueError('Unknown response format: %r' % format)
+
+    @staticmethod
+    def _check_tenant(cache, tenant):
+        """Raise ValueError if results would be cached without a tenant.
+
+        A cache may be shared by clients for several organisations, so
+        the organisation results belong to must be given explicitly;
+        nothing else (e.g., a token) reliably identifies it.
+        """
+        if cache is not None and tenant is None:
+            raise ValueError('A tenant must be given to cache results')
+
+    @classmethod
+    def _field_types(cls, types=('boolean', 'datetime', 'date')):
+        "Map each field name of the given types onto its type"
+        fields = {}
+        for kind, names in (
+                ('decimal', cls.DECIMAL_FIELDS),
+                ('boolean', cls.BOOLEAN_FIELDS),
+                ('datetime', cls.DATETIME_FIELDS),
+                ('date', cls.DATE_FIELDS)):
+            if kind in types:
+                for name in names:
+                    fields[name] = kind
+        return fields
+
+    @classmethod
+    def _schema(cls, singular, decoding='native'):
+        "The compiled schema of an endpoint, built once per class"
+        key = (cls, singular, decoding)
+        schema = cls._schemas.get(key)
+        if schema is None:
+            fields = cls._field_types(cls.DECODING_MODES[decoding])
+            schema = cls._schemas[key] = Schema(singular, cls.MULTI_LINES, fields)
+        return schema
+
+    @classmethod
+    def _decoder(cls, singular, decoding='native', models=False, format='xml'):
+        "The decoder of an endpoint's responses, built once per class"
+        key = (cls, singular, decoding, bool(models), format)
+        decoder = cls._decoders.get(key)
+        if decoder is None:
+            schema = cls._schema(singular, decoding)
+            if format == 'json':
+                decoder = JSONDecoder(schema, MODELS if models else None)
+            else:
+                decoder = XMLDecoder(schema, MODELS if models else None)
+            decoder = cls._decoders.setdefault(key, decoder)
+        return decoder
+
+    @classmethod
+    def _encoder(cls):
+        "The encoder of request bodies, built once per class"
+        encoder = cls._encoders.get(cls)
+        if encoder is None:
+            encoder = cls._encoders.setdefault(cls, XMLEncoder(cls.PLURAL_EXCEPTIONS))
+        return encoder
 
     def walk_dom(self, dom):
-        tree_list = tuple()
+        tree_list = []
         for node in dom.childNodes:
             tagName = getattr(node, 'tagName', None)
             if tagName:
-                tree_list += (tagName, self.walk_dom(node),)
+                tree_list.extend((tagName, self.walk_dom(node)))
             else:
                 data = node.data.strip()
                 if data:
-                    tree_list += (node.data.strip(),)
-        return tree_list
+                    tree_list.append(data)
+        return tuple(tree_list)
 
     def convert_to_dict(self, deep_list):
         out = {}
@@ -72,16 +303,13 @@ class Manager(object):
                     # check to see if we need to apply any special
                     # formatting to the value
                     val = data[0]
-                    if key in self.BOOLEAN_FIELDS:
-                        val = True if val.lower() == 'true' else False
-                    if key in self.DATETIME_FIELDS:
-                        val = parse(val)
-                    if key in self.DATE_FIELDS:
-                        val = parse(val).date()
+                    converter = self.schema.converters.get(key)
+                    if converter:
+                        val = converter(val)
 
                     out[key] = val
 
-                elif len(data) > 1 and ((key in self.MULTI_LINES) or (key == self.singular)):
+                elif len(data) > 1 and key in self.schema.collections:
                     # our data is a collection and needs to be handled as such
                     if out:
                         out.append(self.convert_to_dict(data))
@@ -100,6 +328,7 @@ class Manager(object):
         return out
 
     def dict_to_xml(self, root_elm, data):
+        from xml.etree.ElementTree import SubElement
         for key in data.keys():
             sub_data = data[key]
             elm = SubElement(root_elm, key)
@@ -110,7 +339,7 @@ class Manager(object):
 
             # Key references a dict. Unroll the dict
             # as it's own XML node with subnodes
-            if isinstance(sub_data, dict):
+            if isinstance(sub_data, (dict, Record)):
                 self.dict_to_xml(elm, sub_data)
 
             # Key references a list/tuple
@@ -136,15 +365,7 @@ class Manager(object):
         return root_elm
 
     def _prepare_data_for_save(self, data):
-        if isinstance(data, list) or isinstance(data, tuple):
-            root_elm = Element(self.name)
-            for d in data:
-                sub_elm = SubElement(root_elm, self.singular)
-                self.dict_to_xml(sub_elm, d)
-        else:
-            root_elm = self.dict_to_xml(Element(self.singular), data)
-
-        return tostring(root_elm)
+        return self.encoder.encode(self.name, self.singular, data)
 
     def _get_results(self, data):
         response = data[u'Response']
@@ -156,66 +377,376 @@ class Manager(object):
         if isinstance(result, dict) and self.singular in result:
             return result[self.singular]
 
-    def _get_data(self, func):
-        def wrapper(*args, **kwargs):
-            uri, method, body, headers = func(*args, **kwargs)
-            response = getattr(requests, method)(uri, data=body, headers=headers, auth=self.oauth)
-
-            if response.status_code == 200:
-                if response.headers['content-type'] == 'application/pdf':
-                    return response.text
-                # parseString takes byte content, not unicode.
-                dom = parseString(response.text.encode(response.encoding))
-                data = self.convert_to_dict(self.walk_dom(dom))
-                return self._get_results(data)
-
-            elif response.status_code == 400:
-                raise XeroBadRequest(response)
-
-            elif response.status_code == 401:
-                raise XeroUnauthorized(response)
-
-            elif response.status_code == 403:
-                raise XeroForbidden(response)
-
-            elif response.status_code == 404:
-                raise XeroNotFound(response)
-
-            elif response.status_code == 500:
-                raise XeroInternalError(response)
-
-            elif response.status_code == 501:
-                raise XeroNotImplemented(response)
-
-            elif response.status_code == 503:
-                # Two 503 responses are possible. Rate limit errors
-                # return encoded content; offline errors don't.
-                # If you parse the response text and there's nothing
-                # encoded, it must be a not-available error.
-                payload = parse_qs(response.text)
-                if payload:
-                    raise XeroRateLimitExceeded(response, payload)
-                else:
-                    raise XeroNotAvailable(response)
-            else:
-                raise XeroExceptionUnknown(response)
+    def _raise_error(self, response):
+        "Raise the exception that describes an unsuccessful response"
+        if response.status_code == 400:
+            raise XeroBadRequest(response)
 
-        return wrapper
+        elif response.status_code == 401:
+            raise XeroUnauthorized(response)
+
+        elif response.status_code == 403:
+            raise XeroForbidden(response)
+
+        elif response.status_code == 404:
+            raise XeroNotFound(response)
+
+        elif response.status_code == 500:
+            raise XeroInternalError(response)
+
+        elif response.status_code == 501:
+            raise XeroNotImplemented(response)
+
+        elif response.status_code == 503:
+            # Two 503 responses are possible. Rate limit errors
+            # return encoded content; offline errors don't.
+            # If you parse the response text and there's nothing
+            # encoded, it must be a not-available error.
+            payload = parse_qs(response.text)
+            if payload:
+                raise XeroRateLimitExceeded(response, payload)
+            else:
+                raise XeroNotAvailable(response)
+        else:
+            raise XeroExceptionUnknown(response)
+
+    def _hook(self, event, *args):
+        "Report an event to every hook that observes it"
+        for hook in self.hooks:
+            observer = getattr(hook, event, None)
+            if observer:
+                observer(self, *args)
+
+    def _request(self, uri, method, body, headers, **kwargs):
+        "Make a request to Xero, waiting for the rate limiter if necessary"
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+        if self.format == 'json':
+            headers = dict(headers or {}, Accept='application/json')
+        return getattr(self.session, method)(uri, data=body, headers=headers, auth=self.oauth, **kwargs)
+
+    def _send(self, uri, method, body, headers, expect=(200,), **kwargs):
+        """Make a request, returning the successful response.
+
+        A response is successful if its status code is in `expect`.
+        Failures are retried as directed by the retry policy; if they
+        can't be, the exception describing the failure is raised.
+        """
+        attempt = 0
+        start = time.time()
+        while True:
+            attempt += 1
+            self._hook('before_request', method, uri, headers)
+            sent = time.time()
+            try:
+                response = self._request(uri, method, body, headers, **kwargs)
+            except Exception as e:
+                exc_info = sys.exc_info()
+                self._hook('on_error', method, uri, e, attempt, None)
+                raise exc_info[0], exc_info[1], exc_info[2]
+            self._hook('after_response', method, uri, response, time.time() - sent)
+
+            if response.status_code in expect:
+                return response
+
+            try:
+                self._raise_error(response)
+            except XeroException as e:
+                exc_info = sys.exc_info()
+                delay = None
+                if self.retry_policy:
+                    delay = self.retry_policy.delay(method, attempt, e, time.time() - start)
+                self._hook('on_error', method, uri, e, attempt, delay)
+                if delay is None:
+                    raise exc_info[0], exc_info[1], exc_info[2]
+            # Release the connection (a streamed response holds on to
+            # it until closed) before waiting to retry.
+            response.close()
+            time.sleep(delay)
+
+    def _fetch(self, uri, method, body, headers):
+        "Make a request, and decode its results"
+        if self.cache and method == 'get' and self.cache_ttls.get(self.name) is not None:
+            return self._get_cached(uri, headers)
+
+        response = self._send(uri, method, body, headers)
+
+        if self.cache and method != 'get':
+            self._invalidate_cache()
+
+        return self._decode(response, method)
+
+    def _decode(self, response, method='get'):
+        "Decode the results held by a successful response"
+        if response.headers['content-type'] == 'application/pdf':
+            return response.text
+        start = time.time()
+        # The decoder takes byte content, not unicode.
+        content = response.text.encode(response.encoding)
+        if (self.decode_pool is not None and not self.profiler and
+                len(content) >= self.DECODE_POOL_THRESHOLD):
+            data = self.decode_pool.apply(decode_content, (type(self), self._decoder_options, content))
+        else:
+            data = self.decoder.decode(content)
+        results = self._get_results(data)
+        self._hook('on_decode', method, response, time.time() - start, len(as_list(results)))
+        return results
+
+    def _get_cached(self, uri, headers):
+        """Retrieve the results of a GET request through the cache.
+
+        Results are served from the cache for the endpoint's TTL. After
+        that, until CACHE_STALE_TTL seconds after they were last requested
+        in full, they are revalidated (where possible) by repeating the
+        request with an If-Modified-Since header: a 304 response (or a
+        record that comes back empty) means the cached results can be
+        used as-is, and a collection that comes back with only the
+        records that changed is merged into the cached results, rather
+        than decoding the whole collection. Records that were deleted
+        don't come back at all, so they are only dropped once the
+        results are requested in full again.
+        """
+        key = self._cache_key(uri, headers)
+        cached = self.cache.get(key)
+        entry = pickle.loads(cached) if cached is not None else None
+        now = time.time()
+        if entry and entry['expires'] > now:
+            return entry['results']
+
+        revalidate = (
+            entry is not None and entry.get('refetch', 0) > now and
+            self._can_revalidate(uri, headers, entry['results'])
+        )
+        if revalidate:
+            headers = dict(headers or {}, **self.prepare_filtering_date(entry['modified']))
+
+        response = self._send(uri, 'get', None, headers, expect=(200, 304))
+        if response.status_code == 304:
+            results = entry['results'] if revalidate else None
+        elif revalidate:
+            results = self._merge_changes(uri, entry['results'], self._decode(response))
+        else:
+            results = self._decode(response)
+
+        ttl = self.cache_ttls[self.name]
+        now = time.time()
+        # Revalidating doesn't put off the next full request.
+        refetch = entry['refetch'] if revalidate else now + ttl + self.CACHE_STALE_TTL
+        entry = {
+            'expires': now + ttl,
+            'refetch': refetch,
+            'modified': self._modified_time(response),
+            'results': results,
+        }
+        self.cache.set(key, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL), max(int(refetch - now) + 1, ttl))
+        return results
+
+    def _can_revalidate(self, uri, headers, results):
+        """Can cached results be revalidated with If-Modified-Since?
+
+        Xero interprets If-Modified-Since as a filter; a collection can
+        only be revalidated if it's unfiltered and unpaged (otherwise
+        records that changed so as to leave the collection would be
+        missed), and every record can be identified, so that changes
+        can be merged into it.
+        """
+        if headers and 'If-Modified-Since' in headers:
+            return False
+        if uri != '/'.join([self.url, self.name]):
+            # A single record
+            return '?' not in uri
+        id_field = self.singular + u'ID'
+        return all(id_field in record for record in as_list(results))
+
+    def _merge_changes(self, uri, results, changes):
+        "Merge the records that changed into cached results"
+        if uri != '/'.join([self.url, self.name]):
+            # A single record; it has been replaced, unless nothing
+            # came back (Xero found no changes to it).
+            return changes if changes else results
+
+        id_field = self.singular + u'ID'
+        records = as_list(results)
+        positions = dict((record[id_field], i) for i, record in enumerate(records))
+        for record in as_list(changes):
+            position = positions.get(record.get(id_field))
+            if position is None:
+                records.append(record)
+            else:
+                records[position] = record
+
+        # Match the shape of the results of a full request.
+        if len(records) == 1:
+            return records[0]
+        return records or None
+
+    def _modified_time(self, response):
+        """The time to revalidate the results of a response against.
+
+        Xero's idea of the time the response was generated (or ours, if
+        it didn't say), less a margin for records modified while it was
+        being generated.
+        """
+        # The email package is slow to import, and only needed here.
+        from email.utils import parsedate
+        date = parsedate((getattr(response, 'headers', None) or {}).get('date') or '')
+        modified = datetime(*date[:6]) if date else datetime.utcnow()
+        return modified - timedelta(seconds=self.REVALIDATION_MARGIN)
+
+    def _cache_generation(self, renew=False):
+        """The token identifying the current generation of cached results.
+
+        Results are cached under the current generation; renewing it
+        invalidates every result cached for the endpoint.
+        """
+        # Like the keys of responses, this is hashed, so the tenant
+        # isn't readable by anything else sharing the cache.
+        key = 'generation:' + hashlib.sha1(repr((self.tenant, self.name))).hexdigest()
+        generation = None if renew else self.cache.get(key)
+        if generation is None:
+            # uuid is slow to import, and seldom needed.
+            import uuid
+            generation = uuid.uuid4().hex
+            self.cache.set(key, generation, GENERATION_TTL)
+        return generation
+
+    def _invalidate_cache(self):
+        "Forget every result cached for this endpoint"
+        self._cache_generation(renew=True)
+
+    def _cache_key(self, uri, headers):
+        "The key a response is cached under"
+        identity = repr((self.tenant, self._cache_generation(), self.decoding, self.models, self.format,
+                         uri, sorted((headers or {}).items())))
+        return 'response:' + hashlib.sha1(identity).hexdigest()
+
+    def _iter_results(self, response, call=None):
+        """Yield each record of a streamed response as soon as it is decoded.
+
+        `call` is the profiler's timing of the request, if it's being
+        profiled; it's finished once the response has been consumed.
+        """
+        start = time.time()
+        records = 0
+        error = None
+        try:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            for record in self.decoder.iterdecode(chunks, self.name):
+                records += 1
+                yield record
+            self._hook('on_decode', 'get', response, time.time() - start, records)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            response.close()
+            if call:
+                self.profiler.finish(call, error)
+
+    def _open_stream(self, uri, method, body, headers, profile=True):
+        """Make a request whose response is streamed.
+
+        Returns the response, and the profiler's timing of the request
+        (if it's being profiled), which is finished once the response
+        has been consumed. The profiler times calls on the thread they
+        started on, so requests made in background threads pass
+        `profile=False`.
+        """
+        call = self.profiler.start(self, method) if self.profiler and profile else None
+        try:
+            response = self._send(uri, method, body, headers, stream=True)
+        except Exception as e:
+            if call:
+                self.profiler.finish(call, type(e).__name__)
+            raise
+        return response, call
+
+    def _discard_stream(self, response, call=None):
+        "Close a streamed response that won't be consumed"
+        response.close()
+        if call:
+            self.profiler.finish(call, None)
+
+    def _decode_columns(self, columns, response, call=None):
+        """Append the records of a streamed response to `columns` as
+        they're decoded; returns the number of records"""
+        start = time.time()
+        error = None
+        try:
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            records = self.decoder.decode_columns(chunks, self.name, columns)
+            self._hook('on_decode', 'get', response, time.time() - start, records)
+            return records
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            response.close()
+            if call:
+                self.profiler.finish(call, error)
 
     def get(self, id, headers=None):
         uri = '/'.join([self.url, self.name, id])
         return uri, 'get', None, headers
 
-    def save_or_put(self, data, method='post', headers=None):
+    def save_or_put(self, data, method='post', headers=None, summarize_errors=True):
         uri = '/'.join([self.url, self.name])
+        if not summarize_errors:
+            # Report validation errors against each record, rather
+            # than failing the whole request.
+            uri += '?summarizeErrors=false'
         body = {'xml': self._prepare_data_for_save(data)}
         return uri, method, body, headers
 
-    def save(self, data):
-        return self.save_or_put(data, method='post')
-
-    def put(self, data):
-        return self.save_or_put(data, method='put')
+    def save(self, data, summarize_errors=True):
+        return self.save_or_put(data, method='post', summarize_errors=summarize_errors)
+
+    def put(self, data, summarize_errors=True):
+        return self.save_or_put(data, method='put', summarize_errors=summarize_errors)
+
+    def save_many(self, data, chunk_size=50, concurrency=1):
+        """Save a (possibly very long) list of records, in chunks.
+
+        Each chunk of `chunk_size` records is saved in a single request,
+        with `concurrency` requests made at once. Records with
+        validation errors don't prevent the rest of their chunk from
+        being saved.
+
+        Returns a list with a (record, errors) pair for each record, in
+        the order given. `record` is the record as Xero returned it:
+        saved, or (if `errors` isn't empty) echoed back unsaved, with
+        its validation errors. `errors` is a list of the messages
+        describing why the record couldn't be saved. If a whole chunk
+        failed (e.g. Xero was unavailable), `record` is None for each
+        record in it, and `errors` describes the failure.
+        """
+        return self._write_many(self.save, data, chunk_size, concurrency)
+
+    def put_many(self, data, chunk_size=50, concurrency=1):
+        "Create a (possibly very long) list of records, in chunks. See save_many()"
+        return self._write_many(self.put, data, chunk_size, concurrency)
+
+    def _write_many(self, write, data, chunk_size, concurrency):
+        data = list(data)
+        chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+        pool = thread_pool(concurrency)
+        try:
+            results = pool.map(lambda chunk: capture(write, chunk, summarize_errors=False), chunks)
+        finally:
+            pool.terminate()
+
+        merged = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                # The whole chunk failed.
+                errors = getattr(result, 'errors', None) or [unicode(result)]
+                merged.extend((None, errors) for record in chunk)
+            else:
+                records = as_list(result)
+                records += [None] * (len(chunk) - len(records))
+                merged.extend((record, validation_errors(record)) for record in records)
+        return merged
 
     def prepare_filtering_date(self, val):
         if isinstance(val, datetime):
@@ -226,6 +757,7 @@ class Manager(object):
 
     def filter(self, **kwargs):
         headers = None
+        query = []
         uri = '/'.join([self.url, self.name])
         if kwargs:
             if 'since' in kwargs:
@@ -233,6 +765,9 @@ class Manager(object):
                 headers = self.prepare_filtering_date(val)
                 del kwargs['since']
 
+            page = kwargs.pop('page', None)
+            ids = kwargs.pop('ids', None)
+
             def get_filter_params():
                 if key in self.BOOLEAN_FIELDS:
                     return 'true' if kwargs[key] else 'false'
@@ -260,10 +795,201 @@ class Manager(object):
             params = [generate_param(key) for key in kwargs.keys()]
 
             if params:
-                uri += '?where=' + urllib.quote('&&'.join(params))
+                query.append('where=' + urllib.quote('&&'.join(params)))
+
+            if ids:
+                query.append('IDs=' + urllib.quote(','.join(ids), safe=','))
+
+            if page is not None:
+                query.append('page=%d' % page)
+
+        if query:
+            uri += '?' + '&'.join(query)
 
         return uri, 'get', None, headers
 
     def all(self):
         uri = '/'.join([self.url, self.name])
         return uri, 'get', None, None
+
+    def paginate(self, prefetch=0, **kwargs):
+        """Iterate over every record matching the filter, page by page.
+
+        Pages are requested (page=1, 2, ...) as the iterator is consumed,
+        until a page with fewer than PAGE_SIZE records is returned.
+        With `prefetch`, up to that many of the following pages are
+        fetched in background threads while the current one is being
+        consumed; this may request up to `prefetch` pages past the end.
+
+        Endpoints that don't support paging are fetched in one request.
+        """
+        if self.name not in self.PAGED_OBJECTS:
+            for record in as_list(self.filter(**kwargs)):
+                yield record
+            return
+
+        pool = thread_pool(prefetch + 1) if prefetch else None
+        pending = deque()
+        page = 1
+        try:
+            while True:
+                while len(pending) <= prefetch:
+                    params = dict(kwargs, page=page)
+                    if pool:
+                        pending.append(pool.apply_async(self.filter, kwds=params))
+                    else:
+                        pending.append(_Fetched(self.filter(**params)))
+                    page += 1
+
+                records = as_list(pending.popleft().get())
+                for record in records:
+                    yield record
+
+                if len(records) < self.PAGE_SIZE:
+                    break
+        finally:
+            if pool:
+                pool.terminate()
+
+    def all_pages(self, prefetch=1, **kwargs):
+        "Fetch every page of records matching the filter, as a single list"
+        return list(self.paginate(prefetch=prefetch, **kwargs))
+
+    def columns(self, fields=None, explode=None, prefetch=0, **kwargs):
+        """Collect every record matching the filter into columns.
+
+        Returns a xero.columnar.Columns, which can be converted into a
+        NumPy structured array or a PyArrow Table (or written to a
+        Parquet file). Each response (each page, from paged endpoints)
+        is streamed, and the fields of each record go straight from the
+        XML decoder into the columns, without building the record. (JSON
+        responses are decoded whole, and their records flattened.) With
+        `prefetch`, up to that many of the following pages are requested
+        in background threads, as paginate() does. See Columns for
+        `fields` and `explode`.
+        """
+        # Only imported when needed, as NumPy and PyArrow are.
+        from .columnar import Columns
+        columns = Columns(fields, explode, self.schema.collections)
+        if self.name not in self.PAGED_OBJECTS:
+            request = type(self).filter.request if kwargs else type(self).all.request
+            self._decode_columns(columns, *self._open_stream(*request(self, **kwargs)))
+            return columns
+
+        pool = thread_pool(prefetch + 1) if prefetch else None
+        pending = deque()
+        page = 1
+        try:
+            while True:
+                while len(pending) <= prefetch:
+                    request = type(self).filter.request(self, **dict(kwargs, page=page))
+                    if pool:
+                        pending.append(pool.apply_async(self._open_stream, request, {'profile': False}))
+                    else:
+                        pending.append(_Fetched(self._open_stream(*request)))
+                    page += 1
+
+                if self._decode_columns(columns, *pending.popleft().get()) < self.PAGE_SIZE:
+                    break
+        finally:
+            # Let go of the pages requested past the end
+            for result in pending:
+                opened = capture(result.get)
+                if not isinstance(opened, Exception):
+                    self._discard_stream(*opened)
+            if pool:
+                pool.terminate()
+        return columns
+
+    def get_many(self, ids, concurrency=4):
+        """Retrieve several records by ID.
+
+        Returns a list with an item for each ID, in the order given:
+        the record; the exception raised while retrieving it; or None
+        if no such record exists. A failure to retrieve one record
+        doesn't prevent the others from being retrieved.
+
+        Requests are made on `concurrency` threads. Where the endpoint
+        supports it, records are requested in batches with the IDs
+        parameter; otherwise, one request is made per record.
+        """
+        ids = list(ids)
+        pool = thread_pool(concurrency)
+        try:
+            if self.name not in self.IDS_OBJECTS:
+                return pool.map(lambda id: capture(self.get, id), ids)
+
+            batches = self._id_batches(ids)
+            fetched = {}
+            for batch, result in zip(batches, pool.map(lambda batch: capture(self.filter, ids=batch), batches)):
+                if isinstance(result, Exception):
+                    fetched.update((id.lower(), result) for id in batch)
+                else:
+                    id_field = self.singular + u'ID'
+                    fetched.update(
+                        (record[id_field].lower(), record)
+                        for record in as_list(result) if id_field in record
+                    )
+            return [fetched.get(id.lower()) for id in ids]
+        finally:
+            pool.terminate()
+
+    def _id_batches(self, ids):
+        "Split a list of IDs into batches that fit in a URI"
+        space = self.MAX_URI_LENGTH - len('/'.join([self.url, self.name]) + '?IDs=')
+        batches = []
+        batch = []
+        length = 0
+        for id in ids:
+            if batch and length + len(id) + 1 > space:
+                batches.append(batch)
+                batch = []
+                length = 0
+            batch.append(id)
+            length += len(id) + 1
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def iter_filter(self, **kwargs):
+        return type(self).filter.request(self, **kwargs)
+
+    def iter_all(self):
+        return type(self).all.request(self)
+
+
+def _get_data(func):
+    """Turn a method describing a request (as a (uri, method, body,
+    headers) tuple) into one that makes the request, and decodes its
+    results. The original method remains available as `request`."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        uri, method, body, headers = func(self, *args, **kwargs)
+
+        if self.profiler:
+            with self.profiler.call(self, method):
+                return self._fetch(uri, method, body, headers)
+        return self._fetch(uri, method, body, headers)
+
+    wrapper.request = func
+    return wrapper
+
+
+def _get_stream(func):
+    """Turn a method describing a request into one that makes the
+    request, and returns an iterator over its records."""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        response, call = self._open_stream(*func(self, *args, **kwargs))
+        return self._iter_results(response, call)
+
+    wrapper.request = func
+    return wrapper
+
+
+# The API methods are wrapped once, here, rather than for every manager.
+for method_name in Manager.DECORATED_METHODS:
+    setattr(Manager, method_name, _get_data(Manager.__dict__[method_name]))
+
+for method_name in Manager.STREAMED_METHODS:
+    setattr(Manager, method_name, _get_stream(Manager.__dict__[method_name]))
@@ -0,0 +1,192 @@
+from collections import defaultdict
+from bisect import bisect_left
+import socket
+import threading
+
+from .hooks import Hook
+
+# The upper bounds of the histogram buckets for durations (in seconds)
+# and sizes (in bytes).
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram(object):
+    "Counts observations into buckets, as a Prometheus histogram does"
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        "Yield (upper bound, number of observations <= bound) for each bucket"
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+# The metrics collected for each endpoint and method, with their
+# Prometheus name, type and help text.
+METRICS = [
+    ('request_seconds', 'xero_request_duration_seconds', 'histogram',
+     'Time taken to receive the response to a request'),
+    ('response_bytes', 'xero_response_size_bytes', 'histogram',
+     'Size of the body of each response'),
+    ('decode_seconds', 'xero_decode_duration_seconds', 'histogram',
+     'Time taken to decode the records in a response'),
+    ('records', 'xero_records_decoded_total', 'counter',
+     'Number of records decoded'),
+    ('responses', 'xero_responses_total', 'counter',
+     'Number of responses received, by status code'),
+    ('errors', 'xero_errors_total', 'counter',
+     'Number of failed attempts to make a request, by exception'),
+    ('retries', 'xero_retries_total', 'counter',
+     'Number of requests retried'),
+]
+
+
+def response_size(response):
+    "The size of the body of a response, if it's known without reading it"
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return int(headers['content-length'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    # The body of a response that wasn't streamed has already been read.
+    content = getattr(response, '_content', None)
+    if isinstance(content, bytes):
+        return len(content)
+
+
+def escape_label(value):
+    return unicode(value).replace(u'\\', u'\\\\').replace(u'"', u'\\"').replace(u'\n', u'\\n')
+
+
+class MetricsCollector(Hook):
+    """Collects metrics about the requests made to each endpoint.
+
+    Usage:
+
+        >>> metrics = MetricsCollector()
+        >>> xero = Xero(credentials, hooks=[metrics])
+        >>> xero.invoices.all()
+        >>> print metrics.prometheus()
+        # HELP xero_request_duration_seconds ...
+
+    For each endpoint and method, it records histograms of the time
+    taken by requests, the size of responses and the time taken to
+    decode them, and counts responses (by status code), records
+    decoded, errors (by exception) and retries. These can be exported
+    in the Prometheus text format with prometheus(); with a StatsD
+    `statsd` address (a (host, port) tuple), each observation is also
+    sent to StatsD as it's made.
+    """
+    def __init__(self, statsd=None, statsd_prefix='xero',
+                 duration_buckets=DURATION_BUCKETS, size_buckets=SIZE_BUCKETS):
+        self.lock = threading.Lock()
+        self.duration_buckets = duration_buckets
+        self.size_buckets = size_buckets
+        self.histograms = {}
+        self.counters = defaultdict(int)
+
+        self.statsd = statsd
+        self.statsd_prefix = statsd_prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) if statsd else None
+
+    def _observe(self, metric, manager, method, value, buckets):
+        key = (metric, manager.name, method)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def _count(self, metric, manager, method, label=None, value=1):
+        with self.lock:
+            self.counters[(metric, manager.name, method, label)] += value
+
+    def _send(self, name, manager, method, value, kind):
+        "Send a metric to StatsD (if configured). Delivery isn't guaranteed"
+        if not self.socket:
+            return
+        line = '%s.%s.%s.%s:%s|%s' % (self.statsd_prefix, manager.name, method, name, value, kind)
+        try:
+            self.socket.sendto(line.encode('utf-8'), self.statsd)
+        except socket.error:
+            pass
+
+    def after_response(self, manager, method, uri, response, elapsed):
+        self._observe('request_seconds', manager, method, elapsed, self.duration_buckets)
+        self._count('responses', manager, method, response.status_code)
+        self._send('request', manager, method, int(elapsed * 1000), 'ms')
+        self._send('responses.%s' % response.status_code, manager, method, 1, 'c')
+
+        size = response_size(response)
+        if size is not None:
+            self._observe('response_bytes', manager, method, size, self.size_buckets)
+            self._send('bytes', manager, method, size, 'c')
+
+    def on_error(self, manager, method, uri, exception, attempt, delay):
+        error = type(exception).__name__
+        self._count('errors', manager, method, error)
+        self._send('errors.%s' % error, manager, method, 1, 'c')
+        if delay is not None:
+            self._count('retries', manager, method)
+            self._send('retries', manager, method, 1, 'c')
+
+    def on_decode(self, manager, method, response, elapsed, records):
+        self._observe('decode_seconds', manager, method, elapsed, self.duration_buckets)
+        self._count('records', manager, method, value=records)
+        self._send('decode', manager, method, int(elapsed * 1000), 'ms')
+        self._send('records', manager, method, records, 'c')
+
+    def requests(self):
+        "The number of requests made to each (endpoint, method)"
+        with self.lock:
+            return dict(
+                ((endpoint, method), histogram.count)
+                for (metric, endpoint, method), histogram in self.histograms.items()
+                if metric == 'request_seconds'
+            )
+
+    def prometheus(self):
+        "The metrics collected so far, in the Prometheus text exposition format"
+        with self.lock:
+            lines = []
+            for metric, name, kind, help in METRICS:
+                samples = []
+                if kind == 'histogram':
+                    for (key, endpoint, method), histogram in sorted(self.histograms.items()):
+                        if key != metric:
+                            continue
+                        labels = u'endpoint="%s",method="%s"' % (escape_label(endpoint), escape_label(method))
+                        for bound, count in histogram.cumulative():
+                            samples.append(u'%s_bucket{%s,le="%r"} %d' % (name, labels, bound, count))
+                        samples.append(u'%s_bucket{%s,le="+Inf"} %d' % (name, labels, histogram.count))
+                        samples.append(u'%s_sum{%s} %r' % (name, labels, histogram.sum))
+                        samples.append(u'%s_count{%s} %d' % (name, labels, histogram.count))
+                else:
+                    label_name = {'responses': 'status', 'errors': 'error'}.get(metric)
+                    for (key, endpoint, method, label), count in sorted(self.counters.items()):
+                        if key != metric:
+                            continue
+                        labels = u'endpoint="%s",method="%s"' % (escape_label(endpoint), escape_label(method))
+                        if label_name:
+                            labels += u',%s="%s"' % (label_name, escape_label(label))
+                        samples.append(u'%s{%s} %d' % (name, labels, count))
+
+                if samples:
+                    lines.append(u'# HELP %s %s' % (name, help))
+                    lines.append(u'# TYPE %s %s' % (name, kind))
+                    lines.extend(samples)
+            return u'\n'.join(lines) + u'\n'
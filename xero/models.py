@@ -0,0 +1,291 @@
+"""Compact record classes, as an alternative to decoding into dicts.
+
+Usage:
+
+    >>> xero = Xero(credentials, models=True)
+    >>> invoice = xero.invoices.get(u'0b1b2d3b-ea9e-4bb1-96be-6b0c7a71a37f')
+    >>> invoice.Total
+    u'850.00'
+    >>> invoice.LineItems[0].Description
+    u'Line item 1'
+    >>> invoice.to_dict()
+    {u'InvoiceID': u'0b1b2d3b-...', u'Total': u'850.00', ...}
+
+Each record is an instance of a class with a slot for every field Xero
+documents for that type, so it takes a fraction of the memory of the
+equivalent dict. Fields that Xero doesn't return are None; fields that
+aren't known are kept in a dict, `extra`.
+"""
+
+# The fields of each type of record, by the tag that holds it.
+MODEL_FIELDS = {
+    # Accounting API
+    u'Account': (
+        u'AccountID', u'Code', u'Name', u'Type', u'BankAccountNumber',
+        u'Status', u'Description', u'BankAccountType', u'CurrencyCode',
+        u'TaxType', u'EnablePaymentsToAccount', u'ShowInExpenseClaims',
+        u'Class', u'SystemAccount', u'ReportingCode', u'ReportingCodeName',
+        u'HasAttachments', u'UpdatedDateUTC',
+    ),
+    u'Contact': (
+        u'ContactID', u'ContactNumber', u'AccountNumber', u'ContactStatus',
+        u'Name', u'FirstName', u'LastName', u'EmailAddress',
+        u'SkypeUserName', u'BankAccountDetails', u'TaxNumber',
+        u'AccountsReceivableTaxType', u'AccountsPayableTaxType',
+        u'Addresses', u'Phones', u'IsSupplier', u'IsCustomer',
+        u'DefaultCurrency', u'UpdatedDateUTC', u'ContactGroups', u'Website',
+        u'BrandingTheme', u'Discount', u'Balances', u'PaymentTerms',
+        u'HasAttachments',
+    ),
+    u'CreditNote': (
+        u'CreditNoteID', u'CreditNoteNumber', u'Type', u'Contact', u'Date',
+        u'Status', u'LineAmountTypes', u'LineItems', u'SubTotal',
+        u'TotalTax', u'Total', u'UpdatedDateUTC', u'CurrencyCode',
+        u'CurrencyRate', u'FullyPaidOnDate', u'Reference', u'SentToContact',
+        u'RemainingCredit', u'Allocations', u'BrandingThemeID',
+        u'HasAttachments',
+    ),
+    u'Currency': (
+        u'Code', u'Description',
+    ),
+    u'Invoice': (
+        u'InvoiceID', u'InvoiceNumber', u'Type', u'Contact', u'Date',
+        u'DueDate', u'Status', u'LineAmountTypes', u'LineItems',
+        u'SubTotal', u'TotalTax', u'Total', u'TotalDiscount',
+        u'UpdatedDateUTC', u'CurrencyCode', u'CurrencyRate', u'Reference',
+        u'BrandingThemeID', u'Url', u'SentToContact',
+        u'ExpectedPaymentDate', u'PlannedPaymentDate', u'Payments',
+        u'CreditNotes', u'Prepayments', u'Overpayments', u'AmountDue',
+        u'AmountPaid', u'AmountCredited', u'FullyPaidOnDate',
+        u'HasAttachments',
+    ),
+    u'Organisation': (
+        u'APIKey', u'Name', u'LegalName', u'PaysTax', u'Version',
+        u'OrganisationType', u'BaseCurrency', u'CountryCode',
+        u'IsDemoCompany', u'OrganisationStatus', u'RegistrationNumber',
+        u'TaxNumber', u'FinancialYearEndDay', u'FinancialYearEndMonth',
+        u'SalesTaxBasis', u'SalesTaxPeriod', u'DefaultSalesTax',
+        u'DefaultPurchasesTax', u'PeriodLockDate', u'EndOfYearLockDate',
+        u'CreatedDateUTC', u'Timezone', u'OrganisationEntityType',
+        u'ShortCode', u'LineOfBusiness', u'Addresses', u'Phones',
+        u'ExternalLinks', u'PaymentTerms',
+    ),
+    u'Payment': (
+        u'PaymentID', u'Date', u'CurrencyRate', u'Amount', u'Reference',
+        u'IsReconciled', u'Status', u'PaymentType', u'UpdatedDateUTC',
+        u'Account', u'Invoice', u'CreditNote', u'HasAccount',
+    ),
+    u'TaxRate': (
+        u'Name', u'TaxType', u'TaxComponents', u'Status', u'ReportTaxType',
+        u'CanApplyToAssets', u'CanApplyToEquity', u'CanApplyToExpenses',
+        u'CanApplyToLiabilities', u'CanApplyToRevenue', u'DisplayTaxRate',
+        u'EffectiveRate',
+    ),
+    u'TrackingCategory': (
+        u'TrackingCategoryID', u'Name', u'Status', u'Options', u'Option',
+    ),
+
+    # The items of collections held by accounting records
+    u'LineItem': (
+        u'LineItemID', u'Description', u'Quantity', u'UnitAmount',
+        u'ItemCode', u'AccountCode', u'TaxType', u'TaxAmount',
+        u'LineAmount', u'DiscountRate', u'Tracking',
+    ),
+    u'Phone': (
+        u'PhoneType', u'PhoneNumber', u'PhoneAreaCode', u'PhoneCountryCode',
+    ),
+    u'Address': (
+        u'AddressType', u'AddressLine1', u'AddressLine2', u'AddressLine3',
+        u'AddressLine4', u'City', u'Region', u'PostalCode', u'Country',
+        u'AttentionTo',
+    ),
+
+    # Payroll API
+    u'Employee': (
+        u'EmployeeID', u'Title', u'FirstName', u'MiddleNames', u'LastName',
+        u'Status', u'Email', u'DateOfBirth', u'Gender', u'Phone', u'Mobile',
+        u'StartDate', u'TerminationDate', u'HomeAddress',
+        u'OrdinaryEarningsRateID', u'PayrollCalendarID',
+        u'IsAuthorisedToApproveLeave', u'IsAuthorisedToApproveTimesheets',
+        u'Classification', u'EmployeeGroupName', u'BankAccounts',
+        u'PayTemplate', u'OpeningBalances', u'SuperMemberships',
+        u'LeaveBalances', u'TaxDeclaration', u'UpdatedDateUTC',
+    ),
+    u'LeaveApplication': (
+        u'LeaveApplicationID', u'EmployeeID', u'LeaveTypeID', u'Title',
+        u'StartDate', u'EndDate', u'Description', u'LeavePeriods',
+        u'UpdatedDateUTC',
+    ),
+    u'PayItem': (
+        u'EarningsRates', u'DeductionTypes', u'LeaveTypes',
+        u'ReimbursementTypes',
+    ),
+    u'PayrollCalendar': (
+        u'PayrollCalendarID', u'Name', u'CalendarType', u'StartDate',
+        u'PaymentDate', u'UpdatedDateUTC',
+    ),
+    u'PayRun': (
+        u'PayRunID', u'PayrollCalendarID', u'PayRunPeriodStartDate',
+        u'PayRunPeriodEndDate', u'PayRunStatus', u'PaymentDate',
+        u'PayslipMessage', u'Payslips', u'Wages', u'Deductions', u'Tax',
+        u'Super', u'Reimbursement', u'NetPay', u'UpdatedDateUTC',
+    ),
+    u'Payslip': (
+        u'PayslipID', u'EmployeeID', u'FirstName', u'LastName',
+        u'EmployeeGroup', u'Wages', u'Deductions', u'Tax', u'Super',
+        u'Reimbursements', u'NetPay', u'EarningsLines',
+        u'LeaveEarningsLines', u'TimesheetEarningsLines', u'DeductionLines',
+        u'LeaveAccrualLines', u'ReimbursementLines', u'SuperannuationLines',
+        u'TaxLines', u'UpdatedDateUTC',
+    ),
+    u'SuperFund': (
+        u'SuperFundID', u'Type', u'Name', u'ABN', u'BSB', u'AccountNumber',
+        u'AccountName', u'ElectronicServiceAddress', u'EmployerNumber',
+        u'SPIN', u'USI', u'UpdatedDateUTC',
+    ),
+    u'SuperFundProduct': (
+        u'ABN', u'USI', u'SPIN', u'ProductName',
+    ),
+    u'Timesheet': (
+        u'TimesheetID', u'EmployeeID', u'StartDate', u'EndDate', u'Status',
+        u'Hours', u'TimesheetLines', u'UpdatedDateUTC',
+    ),
+}
+
+
+def to_dict(value):
+    "Convert records (and lists of them) back into plain dicts"
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, to_dict(item)) for key, item in value.items())
+    return value
+
+
+class Record(object):
+    """The base class of every record class.
+
+    A record can be constructed from a dict (or a sequence of pairs),
+    and can be read like one: `record[u'Name']`, `u'Name' in record`,
+    `record.get(u'Name')` and `record.keys()` only see the fields that
+    have been set.
+    """
+    __slots__ = ('extra',)
+    fields = ()
+    _known = frozenset()
+
+    def __init__(self, data=()):
+        if isinstance(data, dict):
+            data = data.iteritems()
+        known = self._known
+        extra = None
+        for key, value in data:
+            if key in known:
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    def __getattr__(self, name):
+        # Only called for fields that haven't been set.
+        if name in self._known:
+            return None
+        if name != 'extra' and self.extra and name in self.extra:
+            return self.extra[name]
+        raise AttributeError(name)
+
+    def __setitem__(self, key, value):
+        if key in self._known:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __getitem__(self, key):
+        for key, value in self._items(key):
+            return value
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(True for item in self._items(key))
+
+    def _items(self, only=None):
+        "Yield the (field, value) pairs that have been set (or just `only`)"
+        if only is None:
+            fields = self.fields
+        elif only in self._known:
+            fields = (only,)
+        else:
+            fields = ()
+        for field in fields:
+            try:
+                # Bypass __getattr__, so unset fields are skipped.
+                yield field, object.__getattribute__(self, field)
+            except AttributeError:
+                pass
+        if self.extra:
+            if only is None:
+                for item in self.extra.items():
+                    yield item
+            elif only in self.extra:
+                yield only, self.extra[only]
+
+    def get(self, key, default=None):
+        for key, value in self._items(key):
+            return value
+        return default
+
+    def keys(self):
+        return [key for key, value in self._items()]
+
+    def items(self):
+        return list(self._items())
+
+    def to_dict(self):
+        "The record, as the dict it would have been decoded into"
+        return dict((key, to_dict(value)) for key, value in self._items())
+
+    def __getstate__(self):
+        return dict(self._items())
+
+    def __setstate__(self, state):
+        self.extra = None
+        for key, value in state.items():
+            self[key] = value
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == to_dict(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.to_dict())
+
+
+def model(name, fields):
+    "Make a record class with the given fields"
+    fields = tuple(str(field) for field in fields)
+    return type(str(name), (Record,), {
+        '__slots__': fields,
+        '__module__': __name__,
+        'fields': fields,
+        '_known': frozenset(fields),
+    })
+
+
+# The record class for each tag, which are also importable from this
+# module (e.g., xero.models.Invoice).
+MODELS = {}
+for _name, _fields in MODEL_FIELDS.items():
+    MODELS[_name] = globals()[str(_name)] = model(_name, _fields)
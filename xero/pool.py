@@ -0,0 +1,155 @@
+import threading
+
+from .api import Xero
+from .ratelimit import (APP_CALLS_PER_MINUTE, CALLS_PER_DAY, CALLS_PER_MINUTE,
+                        MemoryBackend, RateLimiter)
+from .scheduler import DONE, Scheduler
+from .transport import DEFAULT_MAX_RETRIES, DEFAULT_POOL_SIZE, make_session
+
+# The key of the application-wide rate limit, in the backend
+APP_KEY = u'app'
+
+
+class XeroPool(object):
+    """Clients for many organisations (tenants), sharing what they can.
+
+    Usage:
+
+        >>> pool = XeroPool(cache=MemoryCache(), decoding='typed')
+        >>> pool.register(u'acme', acme_credentials)
+        >>> pool.register(u'globex', globex_credentials)
+        >>> pool[u'acme'].invoices.all()
+
+    Each tenant's client is built when it's first used, and kept. Every
+    client shares a single HTTP session (and so, a single pool of
+    keep-alive connections), the decoders of each endpoint, and the
+    `cache` (whose entries belong to their tenant). Requests are paced
+    by a RateLimiter for each tenant (`per_minute` and `per_day`),
+    within one for the whole application (`app_per_minute`), all kept
+    in `backend` (by default, in memory; use a FileBackend to share the
+    budgets between processes). Any other options are passed on to
+    every Xero client.
+
+    Instead of registering every tenant up front, a `loader` can be
+    given: it's called with a tenant that hasn't been registered, and
+    returns its credentials (or None, if there's no such tenant).
+    """
+    def __init__(self, loader=None, session=None,
+                 pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES,
+                 backend=None, per_minute=CALLS_PER_MINUTE, per_day=CALLS_PER_DAY,
+                 app_per_minute=APP_CALLS_PER_MINUTE, cache=None, **options):
+        # As for Xero, the session is created when it's first needed.
+        if session is not None:
+            self.session = session
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.loader = loader
+        self.cache = cache
+        self.options = options
+
+        self.backend = backend or MemoryBackend()
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.app_limiter = None
+        if app_per_minute:
+            self.app_limiter = RateLimiter(per_minute=app_per_minute, per_day=None,
+                                           backend=self.backend, key=APP_KEY)
+
+        # The credentials of each registered tenant, and the clients
+        # that have been built.
+        self.credentials = {}
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name != 'session':
+            raise AttributeError(name)
+        return self.__dict__.setdefault(name, make_session(self.pool_size, self.max_retries))
+
+    def register(self, tenant, credentials):
+        "Add a tenant, or replace its credentials (e.g., once refreshed)"
+        with self.lock:
+            self.credentials[tenant] = credentials
+            self.clients.pop(tenant, None)
+
+    def unregister(self, tenant):
+        "Remove a tenant"
+        with self.lock:
+            self.credentials.pop(tenant, None)
+            self.clients.pop(tenant, None)
+
+    def tenants(self):
+        "The tenants that have been registered"
+        return list(self.credentials)
+
+    def get(self, tenant):
+        "The client of a tenant; raises KeyError for an unknown tenant"
+        client = self.clients.get(tenant)
+        if client is not None:
+            return client
+
+        credentials = self.credentials.get(tenant)
+        if credentials is None and self.loader is not None:
+            credentials = self.loader(tenant)
+            if credentials is not None:
+                with self.lock:
+                    credentials = self.credentials.setdefault(tenant, credentials)
+        if credentials is None:
+            raise KeyError(tenant)
+
+        client = self._client(tenant, credentials)
+        with self.lock:
+            # Unless its credentials have been replaced in the meantime,
+            # use the client built first.
+            if self.credentials.get(tenant) is not credentials:
+                return client
+            return self.clients.setdefault(tenant, client)
+
+    __getitem__ = get
+
+    def __contains__(self, tenant):
+        return tenant in self.credentials
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def _client(self, tenant, credentials):
+        "Construct the client of a tenant"
+        return Xero(credentials, session=self.session, rate_limiter=self._rate_limiter(tenant),
+                    cache=self.cache, tenant=tenant, **self.options)
+
+    def _rate_limiter(self, tenant):
+        "The rate limiter of a tenant, within the application's"
+        if not (self.per_minute or self.per_day or self.app_limiter):
+            return None
+        return RateLimiter(per_minute=self.per_minute, per_day=self.per_day,
+                           backend=self.backend, key=tenant, within=self.app_limiter)
+
+    def run(self, tasks, workers=DEFAULT_POOL_SIZE, per_tenant=1):
+        """Run tasks for many tenants on a pool of threads, fairly.
+
+        `tasks` is a sequence of (tenant, func) pairs; each func is
+        called with the tenant's client. The tasks are run as jobs of a
+        Scheduler: tenants take turns (each tenant's tasks are started
+        in the order they were given), no more than `per_tenant` tasks
+        of a tenant run at once, and a task refused by a rate limit is
+        retried once the limit allows it.
+
+        Returns the result of each task, in the order of `tasks`; a
+        task that failed has the exception it raised as its result.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        scheduler = Scheduler(self, workers=min(workers, len(tasks)), per_tenant=per_tenant)
+        for tenant, func in tasks:
+            scheduler.submit(tenant, None, func)
+        return [job.result if job.state == DONE else job.error for job in scheduler.run()]
+
+    def map(self, func, tenants=None, workers=DEFAULT_POOL_SIZE, per_tenant=1):
+        """Call func with the client of each tenant (by default, every
+        registered tenant), as run() does; returns a dict of the result
+        for each tenant."""
+        tenants = self.tenants() if tenants is None else list(tenants)
+        results = self.run([(tenant, func) for tenant in tenants], workers, per_tenant)
+        return dict(zip(tenants, results))
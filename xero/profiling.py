@@ -0,0 +1,273 @@
+from collections import defaultdict, deque
+import copy
+import threading
+from timeit import default_timer as timer
+
+from .hooks import Hook
+
+# The phases the time taken by a call is split into:
+#  * network - waiting for responses (every attempt)
+#  * parse   - parsing the XML or JSON of responses
+#  * convert - converting the text of typed fields into values
+#  * build   - assembling records (dicts or models) from elements
+#  * other   - everything else: rate limiting, retry delays, the
+#              cache, and encoding requests
+PHASES = ('network', 'parse', 'convert', 'build', 'other')
+
+
+class Call(object):
+    "The time taken by a single call to a manager, split into phases"
+
+    def __init__(self, endpoint, method):
+        self.endpoint = endpoint
+        self.method = method
+        self.start = timer()
+        self.total = 0.0
+        self.network = 0.0
+        # The time spent decoding responses (everything but network),
+        # the part of it spent folding elements into records, and the
+        # part of that spent converting values.
+        self.decode = 0.0
+        self.fold = 0.0
+        self.convert = 0.0
+        self.conversions = 0
+        self.requests = 0
+        self.records = 0
+        self.error = None
+
+    def phases(self):
+        "The time spent in each of PHASES, in seconds"
+        parse = max(self.decode - self.fold, 0.0)
+        build = max(self.fold - self.convert, 0.0)
+        other = max(self.total - self.network - self.decode, 0.0)
+        return dict(zip(PHASES, (self.network, parse, self.convert, build, other)))
+
+    def __repr__(self):
+        return '<Call %s.%s %.3fs>' % (self.endpoint, self.method, self.total)
+
+
+class Totals(object):
+    "The calls made to an endpoint (with a method), added together"
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.requests = 0
+        self.records = 0
+        self.conversions = 0
+        self.total = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, call):
+        self.calls += 1
+        self.errors += call.error is not None
+        self.requests += call.requests
+        self.records += call.records
+        self.conversions += call.conversions
+        self.total += call.total
+        for phase, elapsed in call.phases().items():
+            self.phases[phase] += elapsed
+
+
+class Profiler(Hook):
+    """Splits the time taken by each call to a manager into phases.
+
+    Usage:
+
+        >>> profiler = Profiler()
+        >>> xero = Xero(credentials, profiler=profiler)
+        >>> xero.invoices.all()
+        >>> print profiler.report()
+        Endpoint          Method  Calls ...  Network   Parse  Convert  Build ...
+        Invoices          get         1 ...   1.204s  0.310s   0.121s  0.087s ...
+
+    Each call (e.g. to all(), filter() or save()) is timed from start
+    to finish, and its time split into PHASES. The phases of every call
+    are added up per endpoint and method; the most recent `keep` calls
+    are also kept individually, as `calls`.
+
+    To split the time spent decoding, the managers' decoder is replaced
+    with an instrumented copy, which makes decoding a little slower.
+    With `cprofile`, every call is also run under cProfile, for the
+    whole picture; stats() and dump_stats() report it in the usual
+    pstats form.
+
+    A profiler can be shared by many managers, on many threads. The
+    phases of a streamed call (e.g. iter_all()) include the time spent
+    decoding whatever else is decoded on the same thread while it's
+    being consumed, and the time spent reading its response counts
+    towards parsing it.
+    """
+    def __init__(self, keep=1000, cprofile=False):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.calls = deque(maxlen=keep)
+        self.totals = defaultdict(Totals)
+        self.cprofile = cprofile
+        # A cProfile.Profile per thread, as it only profiles the thread
+        # that enables it.
+        self.profiles = []
+
+    def _active(self):
+        "The calls in progress on this thread, innermost last"
+        try:
+            return self.local.active
+        except AttributeError:
+            self.local.active = []
+            return self.local.active
+
+    def _current(self):
+        active = self._active()
+        return active[-1] if active else None
+
+    def _profile(self):
+        "The cProfile.Profile for this thread"
+        profile = getattr(self.local, 'profile', None)
+        if profile is None:
+            import cProfile
+            profile = self.local.profile = cProfile.Profile()
+            with self.lock:
+                self.profiles.append(profile)
+        return profile
+
+    def start(self, manager, method):
+        "Start timing a call to `manager`"
+        call = Call(manager.name, method)
+        active = self._active()
+        if self.cprofile and not active:
+            self._profile().enable()
+        active.append(call)
+        return call
+
+    def finish(self, call, error=None):
+        "Finish timing a call, and add it to the totals"
+        call.total = timer() - call.start
+        call.error = error
+        active = self._active()
+        if call in active:
+            active.remove(call)
+            if self.cprofile and not active:
+                self._profile().disable()
+
+        with self.lock:
+            self.calls.append(call)
+            self.totals[(call.endpoint, call.method)].add(call)
+
+    def call(self, manager, method):
+        "A context manager timing a call to `manager`"
+        return _Timing(self, manager, method)
+
+    def after_response(self, manager, method, uri, response, elapsed):
+        call = self._current()
+        if call:
+            call.requests += 1
+            call.network += elapsed
+
+    def on_decode(self, manager, method, response, elapsed, records):
+        call = self._current()
+        if call:
+            call.decode += elapsed
+            call.records += records
+
+    def instrument(self, decoder):
+        """An instrumented copy of `decoder`, which times the folding of
+        elements into records and the conversion of values."""
+        instrumented = copy.copy(decoder)
+        # Folding calls on the copy's converters, so fold with the copy.
+        instrumented.fold = self._timed_fold(instrumented.fold)
+        instrumented.converters = dict(
+            (key, self._timed_converter(converter))
+            for key, converter in decoder.converters.items()
+        )
+        return instrumented
+
+    def _timed_fold(self, fold):
+        current = self._current
+
+        def timed_fold(tag, children):
+            call = current()
+            if call is None:
+                return fold(tag, children)
+            start = timer()
+            try:
+                return fold(tag, children)
+            finally:
+                call.fold += timer() - start
+
+        return timed_fold
+
+    def _timed_converter(self, converter):
+        current = self._current
+
+        def timed_converter(value):
+            call = current()
+            if call is None:
+                return converter(value)
+            start = timer()
+            try:
+                return converter(value)
+            finally:
+                call.convert += timer() - start
+                call.conversions += 1
+
+        return timed_converter
+
+    def reset(self):
+        "Forget every call profiled so far"
+        with self.lock:
+            self.calls.clear()
+            self.totals.clear()
+            for profile in self.profiles:
+                profile.clear()
+
+    def report(self):
+        "A table of the time spent in each phase, per endpoint and method"
+        with self.lock:
+            totals = sorted(self.totals.items(), key=lambda item: -item[1].total)
+
+        header = ['Endpoint', 'Method', 'Calls', 'Errors', 'Requests', 'Records', 'Total']
+        header.extend(phase.capitalize() for phase in PHASES)
+        lines = ['%-20s %-6s %6s %6s %8s %8s %9s' % tuple(header[:7]) +
+                 ''.join(' %9s' % name for name in header[7:])]
+        for (endpoint, method), total in totals:
+            line = '%-20s %-6s %6d %6d %8d %8d %8.3fs' % (
+                endpoint, method, total.calls, total.errors, total.requests, total.records, total.total)
+            line += ''.join(' %8.3fs' % total.phases[phase] for phase in PHASES)
+            lines.append(line)
+        return '\n'.join(lines)
+
+    def stats(self):
+        """The cProfile statistics of the calls profiled so far, as a
+        pstats.Stats. Only available with `cprofile`, once the calls
+        in progress have finished."""
+        if not self.cprofile:
+            raise ValueError('The profiler was created without cprofile')
+        import pstats
+        with self.lock:
+            profiles = list(self.profiles)
+        stats = pstats.Stats(profiles[0]) if profiles else None
+        for profile in profiles[1:]:
+            stats.add(profile)
+        if stats is None:
+            raise ValueError('No calls have been profiled')
+        return stats
+
+    def dump_stats(self, filename):
+        "Write the cProfile statistics to a file (see stats())"
+        self.stats().dump_stats(filename)
+
+
+class _Timing(object):
+    "Times a call to a manager, as a context manager"
+
+    def __init__(self, profiler, manager, method):
+        self.profiler = profiler
+        self.manager = manager
+        self.method = method
+
+    def __enter__(self):
+        self.call = self.profiler.start(self.manager, self.method)
+        return self.call
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.finish(self.call, exc_type.__name__ if exc_type else None)
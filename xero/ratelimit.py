@@ -0,0 +1,216 @@
+import json
+import threading
+import time
+
+# Xero's published limits for a single organisation.
+CALLS_PER_MINUTE = 60
+CALLS_PER_DAY = 5000
+
+# Xero's published limit for an application, across every organisation.
+APP_CALLS_PER_MINUTE = 10000
+
+MINUTE = 60
+DAY = 24 * 60 * 60
+
+# The number of slots each limit's period is counted in; see reserve().
+SLOTS = 60
+
+
+def reserve(windows, limits, now):
+    """Count a request against every limit described by `limits`.
+
+    `limits` is a sequence of (calls, period) pairs, and `windows` maps
+    each period onto the requests counted against it: a dict of the
+    number of requests made in each slot (1/SLOTS of the period) of
+    the latest period. A request counts against a limit until a whole
+    period has passed since the end of its slot, so no more than
+    `calls` requests are ever made in any `period` seconds; at worst,
+    a slot's worth of the limit goes unused. The state of each limit is
+    at most SLOTS + 1 counters, however many requests are made.
+
+    Either the request is counted against every limit (and 0 is
+    returned), or against none of them, in which case the number of
+    seconds until every limit allows it is returned.
+    """
+    return reserve_all([(windows, limits)], now)
+
+
+def reserve_all(buckets, now):
+    """Count a request against the limits of several keys at once.
+
+    `buckets` is a sequence of (windows, limits) pairs, one for each
+    key, as taken by reserve(). The request is counted against every
+    limit of every key, or against none of them.
+    """
+    delay = 0
+    for windows, limits in buckets:
+        for calls, period in limits:
+            slots = windows.setdefault(period, {})
+            size = float(period) / SLOTS
+            current = int(now // size)
+            for slot in [slot for slot in slots if slot < current - SLOTS]:
+                del slots[slot]
+            excess = sum(slots.values()) + 1 - calls
+            if excess > 0:
+                # Wait until enough of the oldest slots have expired.
+                for slot in sorted(slots):
+                    excess -= slots[slot]
+                    if excess <= 0:
+                        delay = max(delay, (slot + SLOTS + 1) * size - now)
+                        break
+
+    if delay:
+        return delay
+
+    for windows, limits in buckets:
+        for calls, period in limits:
+            slots = windows[period]
+            current = int(now // (float(period) / SLOTS))
+            slots[current] = slots.get(current, 0) + 1
+    return 0
+
+
+class MemoryBackend(object):
+    """Keeps rate limiting state in memory.
+
+    The state is shared by all the threads of a process that use the
+    same backend instance.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows = {}
+
+    def reserve(self, key, limits, now):
+        return self.reserve_all([(key, limits)], now)
+
+    def reserve_all(self, reservations, now):
+        "Reserve a request against several (key, limits) at once"
+        with self.lock:
+            return reserve_all([
+                (self.windows.setdefault(key, {}), limits)
+                for key, limits in reservations
+            ], now)
+
+
+class FileBackend(object):
+    """Keeps rate limiting state in a SQLite database, shared between processes.
+
+    Every process (or machine, if the database is on shared storage
+    that supports locking) that uses the same path shares the same
+    quotas. Each key's count for each limit is a row of its own, so a
+    request only reads and writes the rows of the keys it's counted
+    against, in a transaction that holds the database's write lock.
+    """
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        # How long to wait for another process's transaction to finish
+        self.timeout = timeout
+        db = self._connect()
+        try:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS xero_rate_limits ('
+                ' key TEXT NOT NULL,'
+                ' period INTEGER NOT NULL,'
+                ' slots TEXT NOT NULL,'
+                ' PRIMARY KEY (key, period))'
+            )
+        finally:
+            db.close()
+
+    def _connect(self):
+        # sqlite3 is only imported once a FileBackend is used. A
+        # connection can't be shared between threads; each reservation
+        # makes its own, and manages its own transaction.
+        import sqlite3
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def reserve(self, key, limits, now):
+        return self.reserve_all([(key, limits)], now)
+
+    def reserve_all(self, reservations, now):
+        "Reserve a request against several (key, limits) at once"
+        db = self._connect()
+        try:
+            # Closing the connection without committing rolls back.
+            db.execute('BEGIN IMMEDIATE')
+            windows = dict((key, {}) for key, limits in reservations)
+            for key, limits in reservations:
+                for calls, period in limits:
+                    row = db.execute(
+                        'SELECT slots FROM xero_rate_limits WHERE key = ? AND period = ?',
+                        (key, period)
+                    ).fetchone()
+                    if row:
+                        windows[key][period] = dict(
+                            (int(slot), count) for slot, count in json.loads(row[0]).items()
+                        )
+
+            delay = reserve_all([
+                (windows[key], limits) for key, limits in reservations
+            ], now)
+            if not delay:
+                for key, key_windows in windows.items():
+                    for period, slots in key_windows.items():
+                        db.execute(
+                            'INSERT OR REPLACE INTO xero_rate_limits (key, period, slots) VALUES (?, ?, ?)',
+                            (key, period, json.dumps(slots))
+                        )
+            db.execute('COMMIT')
+            return delay
+        finally:
+            db.close()
+
+
+class RateLimiter(object):
+    """Paces requests so they stay within Xero's rate limits.
+
+    Usage:
+
+        >>> limiter = RateLimiter(per_minute=60, per_day=5000)
+        >>> xero = Xero(credentials, rate_limiter=limiter)
+
+    Every request made by the Xero instance then waits, if necessary,
+    until it can be made without exceeding either limit. Limits apply
+    per `key` (typically, one per organisation); to share a quota
+    between processes, use a FileBackend (or any object implementing
+    the same reserve() method).
+
+    A limiter can also be `within` another, using the same backend
+    (typically, one for the whole application):
+
+        >>> app = RateLimiter(per_minute=APP_CALLS_PER_MINUTE, per_day=None, key='app')
+        >>> limiter = RateLimiter(key=tenant_id, backend=app.backend, within=app)
+
+    Each request then counts against both, and waits until both allow
+    it (the backend must implement reserve_all()).
+    """
+    def __init__(self, per_minute=CALLS_PER_MINUTE, per_day=CALLS_PER_DAY,
+                 backend=None, key='default', within=None):
+        self.limits = []
+        if per_minute:
+            self.limits.append((per_minute, MINUTE))
+        if per_day:
+            self.limits.append((per_day, DAY))
+        if within is not None and backend is not None and backend is not within.backend:
+            raise ValueError('A limiter must use the same backend as the limiter it is within')
+        self.backend = backend or (within.backend if within is not None else MemoryBackend())
+        self.key = key
+        self.within = within
+
+    def reservations(self):
+        "The (key, limits) this limiter, and those it's within, reserve against"
+        reservations = [(self.key, self.limits)]
+        if self.within is not None:
+            reservations.extend(self.within.reservations())
+        return reservations
+
+    def acquire(self):
+        "Block until a request can be made"
+        while True:
+            if self.within is None:
+                delay = self.backend.reserve(self.key, self.limits, time.time())
+            else:
+                delay = self.backend.reserve_all(self.reservations(), time.time())
+            if not delay:
+                return
+            time.sleep(delay)
@@ -0,0 +1,112 @@
+import random
+
+from .exceptions import *
+
+# Methods that can safely be repeated if the outcome of a request is
+# unknown. Xero creates records on both POST and PUT.
+IDEMPOTENT_METHODS = ('get',)
+
+# How long to wait after exceeding the per-minute rate limit, if Xero
+# doesn't say. The limit is over a rolling minute, so this is always
+# enough.
+RATE_LIMIT_BACKOFF = 60.0
+
+
+class RetryPolicy(object):
+    """Decides whether (and when) a failed request should be retried.
+
+    Usage:
+
+        >>> xero = Xero(credentials, retry_policy=RetryPolicy(max_attempts=8))
+
+    Requests that fail because the rate limit was exceeded, the API is
+    unavailable, Xero reported an internal error or a gateway failed
+    (any other 5xx response, e.g. 502 or 504) are retried, with an
+    exponential backoff of `backoff` * 2 ** (attempt - 1) seconds (up
+    to `max_backoff`), randomized when `jitter` is set. A wait requested
+    by Xero in a Retry-After header is honoured instead.
+
+    The 503 responses (rate limiting and unavailability) are returned
+    before a request is processed, so any request can be retried after
+    one. After an internal or gateway error the request may have been
+    processed; only GETs are retried unless `retry_non_idempotent` is set.
+
+    No request is retried more than `max_attempts` times in total, or
+    if the wait would take it past `max_elapsed` seconds since the
+    first attempt. Requests that exceed the daily rate limit aren't
+    retried at all.
+    """
+    RETRY_ON = (XeroRateLimitExceeded, XeroNotAvailable, XeroInternalError)
+    RETRY_ANY_METHOD = (XeroRateLimitExceeded, XeroNotAvailable)
+
+    def __init__(self, max_attempts=5, backoff=1.0, max_backoff=RATE_LIMIT_BACKOFF,
+                 max_elapsed=600.0, jitter=True, retry_non_idempotent=False):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.jitter = jitter
+        self.retry_non_idempotent = retry_non_idempotent
+
+    def should_retry(self, method, exception):
+        "Can a request made with `method` be retried after `exception`?"
+        if not (isinstance(exception, self.RETRY_ON) or self.server_error(exception)):
+            return False
+
+        if isinstance(exception, XeroRateLimitExceeded) and self.daily_limit_exceeded(exception):
+            return False
+
+        return (
+            isinstance(exception, self.RETRY_ANY_METHOD) or
+            method in IDEMPOTENT_METHODS or
+            self.retry_non_idempotent
+        )
+
+    def delay(self, method, attempt, exception, elapsed):
+        """How many seconds to wait before retrying a request.
+
+        `attempt` is the number of attempts made so far, and `elapsed`
+        the time since the first one started. Returns None if the
+        request shouldn't be retried.
+        """
+        if attempt >= self.max_attempts or not self.should_retry(method, exception):
+            return None
+
+        delay = self.retry_after(exception)
+        if delay is None:
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+            if isinstance(exception, XeroRateLimitExceeded):
+                delay = max(delay, min(self.max_backoff, RATE_LIMIT_BACKOFF))
+            if self.jitter:
+                delay = random.uniform(delay / 2, delay)
+
+        if elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+    def server_error(self, exception):
+        "Is `exception` an unmapped 5xx response, such as a 502 or 504 from a gateway?"
+        status_code = getattr(getattr(exception, 'response', None), 'status_code', None)
+        return (
+            isinstance(exception, XeroExceptionUnknown) and
+            isinstance(status_code, int) and status_code >= 500
+        )
+
+    def daily_limit_exceeded(self, exception):
+        """Was the daily limit (rather than the per-minute one) exceeded?
+
+        Xero identifies the limit in a X-Rate-Limit-Problem header, and
+        in the oauth_problem_advice of the response.
+        """
+        headers = getattr(exception.response, 'headers', None) or {}
+        problem = headers.get('X-Rate-Limit-Problem') or ''
+        advice = unicode(exception.args[0] if exception.args else '')
+        return problem.lower() == 'day' or 'daily' in advice.lower()
+
+    def retry_after(self, exception):
+        "The wait requested by Xero in a Retry-After header, if any"
+        headers = getattr(exception.response, 'headers', None) or {}
+        try:
+            return float(headers['Retry-After'])
+        except (KeyError, TypeError, ValueError):
+            return None
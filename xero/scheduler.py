@@ -0,0 +1,280 @@
+from collections import defaultdict
+import heapq
+import itertools
+import threading
+import time
+
+from .asynchronous import AsyncXero
+from .exceptions import XeroRateLimitExceeded
+from .manager import thread_pool
+from .retry import RATE_LIMIT_BACKOFF, RetryPolicy
+from .transport import DEFAULT_POOL_SIZE
+
+# The states of a job
+PENDING, RUNNING, DONE, FAILED = 'pending', 'running', 'done', 'failed'
+
+# The key under which a pause of every tenant (when the application's
+# limit has been exceeded) is kept.
+APP = object()
+
+# Reads which limit was exceeded, and the wait requested by Xero, from
+# a XeroRateLimitExceeded.
+_LIMITS = RetryPolicy()
+
+
+class Job(object):
+    """An operation on an endpoint of a tenant, run by a Scheduler.
+
+    `operation` is the name of a Manager method (e.g. 'all', 'filter' or
+    'save'), called with `args` and `kwargs`; or a function, called with
+    the manager and them. Without an `endpoint`, the function is called
+    with the tenant's client instead. Once the job has run, `state` is DONE and
+    `result` holds its result, or `state` is FAILED and `error` holds
+    the exception it raised.
+    """
+    def __init__(self, tenant, endpoint, operation, args=(), kwargs=None, priority=0):
+        self.tenant = tenant
+        self.endpoint = endpoint
+        self.operation = operation
+        self.args = tuple(args)
+        self.kwargs = kwargs or {}
+        self.priority = priority
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        # The number of times the job has been started
+        self.attempts = 0
+
+    def __call__(self, client):
+        if self.endpoint is None:
+            return self.operation(client, *self.args, **self.kwargs)
+        manager = getattr(client, self.endpoint.lower())
+        if callable(self.operation):
+            return self.operation(manager, *self.args, **self.kwargs)
+        return getattr(manager, self.operation)(*self.args, **self.kwargs)
+
+    def __repr__(self):
+        operation = getattr(self.operation, '__name__', self.operation)
+        return '<Job %s %s.%s: %s>' % (self.tenant, self.endpoint, operation, self.state)
+
+
+class Progress(object):
+    "A snapshot of the progress of a Scheduler's jobs"
+
+    def __init__(self, total, done, failed, running, throttled, elapsed, tenants):
+        self.total = total
+        self.done = done
+        self.failed = failed
+        self.running = running
+        # The number of times a job was refused by Xero's rate limit
+        self.throttled = throttled
+        self.elapsed = elapsed
+        # The number of jobs of each tenant that haven't finished
+        self.tenants = tenants
+
+    @property
+    def remaining(self):
+        return self.total - self.done - self.failed
+
+    def __repr__(self):
+        return '<Progress %d/%d done, %d failed, %d running, %d throttled in %.1fs>' % (
+            self.done, self.total, self.failed, self.running, self.throttled, self.elapsed)
+
+
+class Scheduler(object):
+    """Runs jobs for many tenants on a pool of threads, fairly.
+
+    Usage:
+
+        >>> scheduler = Scheduler(pool, workers=20, per_tenant=2, progress=report)
+        >>> for tenant in pool.tenants():
+        ...     scheduler.submit(tenant, u'Invoices', 'all')
+        ...     scheduler.submit(tenant, u'Contacts', 'filter', kwargs={'IsCustomer': True}, priority=1)
+        >>> for job in scheduler.run():
+        ...     save(job.tenant, job.endpoint, job.result)
+
+    `pool` is a XeroPool (or anything with a get(tenant) method returning
+    a client). The clients must be plain Xero clients: the calls of an
+    AsyncXero return before they have run, so a job run on one fails
+    with a TypeError. Jobs with the highest `priority` are started first; among
+    tenants with jobs of the same priority, the tenant that has waited
+    longest since one of its jobs was started goes next, and no more than
+    `per_tenant` jobs of a tenant run at once. So a tenant with many jobs
+    can't starve the others.
+
+    When Xero refuses a job because a rate limit has been exceeded, the
+    job is put back in the queue, and none of that tenant's jobs (or, if
+    the application's limit was exceeded, no jobs at all) are started
+    until Xero says the limit will allow them (at most `max_attempts`
+    times a job). A job refused by a tenant's daily limit fails, as do
+    that tenant's other jobs. Meanwhile, other tenants' jobs carry on.
+
+    If given, `progress` is called with a Progress each time a job
+    finishes. Jobs are run on a pool of `workers` threads made for each
+    run.
+    """
+    def __init__(self, pool, workers=DEFAULT_POOL_SIZE, per_tenant=1, max_attempts=5,
+                 progress=None):
+        self.pool = pool
+        self.workers = workers
+        self.per_tenant = per_tenant
+        self.max_attempts = max_attempts
+        self.callback = progress
+
+        self.jobs = []
+        self.condition = threading.Condition()
+        # The jobs waiting to be started, in a heap for each tenant
+        self.queues = defaultdict(list)
+        self.running = defaultdict(int)
+        # When each tenant (or APP) may next start a job, if paused
+        self.paused = {}
+        # When each tenant last had a job started, in the same sequence
+        # as the jobs were queued
+        self.served = {}
+        self.sequence = itertools.count()
+        self.done = self.failed = self.throttled = 0
+        self.started = None
+
+    def submit(self, tenant, endpoint, operation, args=(), kwargs=None, priority=0):
+        "Add a job; it can be submitted before or during run()"
+        job = Job(tenant, endpoint, operation, args, kwargs, priority)
+        with self.condition:
+            self.jobs.append(job)
+            self._queue(job)
+            self.condition.notify_all()
+        return job
+
+    def run(self):
+        "Run the jobs until every one has finished; returns the jobs"
+        self.started = time.time()
+        executor = thread_pool(self.workers)
+        try:
+            workers = [executor.apply_async(self._work) for i in range(self.workers)]
+            for worker in workers:
+                worker.get()
+        finally:
+            executor.terminate()
+        return list(self.jobs)
+
+    def progress(self):
+        "The progress of the jobs so far"
+        with self.condition:
+            tenants = defaultdict(int)
+            for job in self.jobs:
+                if job.state in (PENDING, RUNNING):
+                    tenants[job.tenant] += 1
+            return Progress(len(self.jobs), self.done, self.failed, sum(self.running.values()),
+                            self.throttled, time.time() - (self.started or time.time()),
+                            dict(tenants))
+
+    def _queue(self, job):
+        job.state = PENDING
+        heapq.heappush(self.queues[job.tenant], (-job.priority, next(self.sequence), job))
+
+    def _take(self, now):
+        """The next job to start (or None), and when the next paused
+        tenant may start one (or None); with the condition held"""
+        app = self.paused.get(APP, 0)
+        if app > now:
+            return None, app
+
+        best = wake = None
+        for tenant, queue in self.queues.items():
+            if not queue or self.running[tenant] >= self.per_tenant:
+                continue
+            until = self.paused.get(tenant, 0)
+            if until > now:
+                wake = until if wake is None else min(wake, until)
+                continue
+            key = (queue[0][0], self.served.get(tenant, -1))
+            if best is None or key < best[0]:
+                best = (key, tenant)
+        if best is None:
+            return None, wake
+
+        tenant = best[1]
+        job = heapq.heappop(self.queues[tenant])[2]
+        self.served[tenant] = next(self.sequence)
+        self.running[tenant] += 1
+        job.state = RUNNING
+        job.attempts += 1
+        return job, None
+
+    def _work(self):
+        "Start jobs until there are none left, in a worker thread"
+        while True:
+            with self.condition:
+                while True:
+                    job, wake = self._take(time.time())
+                    if job is not None:
+                        break
+                    if not any(self.queues.values()) and not any(self.running.values()):
+                        return
+                    self.condition.wait(None if wake is None else max(wake - time.time(), 0))
+
+            try:
+                job.result = job(self._client(job.tenant))
+            except XeroRateLimitExceeded as e:
+                finished = self._throttled(job, e)
+            except Exception as e:
+                finished = self._finish(job, FAILED, e)
+            else:
+                finished = self._finish(job, DONE)
+
+            if finished and self.callback is not None:
+                self.callback(self.progress())
+
+    def _client(self, tenant):
+        "The client of a tenant, which must be a plain Xero client"
+        client = self.pool.get(tenant)
+        if isinstance(client, AsyncXero):
+            raise TypeError('A Scheduler runs jobs on Xero clients, not AsyncXero clients')
+        return client
+
+    def _finish(self, job, state, error=None):
+        with self.condition:
+            self.running[job.tenant] -= 1
+            if state == FAILED:
+                self._fail(job, error)
+            else:
+                self._done(job)
+            self.condition.notify_all()
+        return True
+
+    def _done(self, job):
+        job.state = DONE
+        self.done += 1
+
+    def _fail(self, job, error):
+        job.state = FAILED
+        job.error = error
+        self.failed += 1
+
+    def _throttled(self, job, exception):
+        "Pause the tenant (or every tenant) whose limit was exceeded; returns whether the job finished"
+        headers = getattr(exception.response, 'headers', None) or {}
+        problem = (headers.get('X-Rate-Limit-Problem') or '').lower()
+        delay = _LIMITS.retry_after(exception)
+        if delay is None:
+            delay = RATE_LIMIT_BACKOFF
+
+        with self.condition:
+            self.throttled += 1
+            self.running[job.tenant] -= 1
+            try:
+                if _LIMITS.daily_limit_exceeded(exception):
+                    # Nothing more can be done for this tenant today.
+                    self._fail(job, exception)
+                    for priority, sequence, queued in self.queues.pop(job.tenant, ()):
+                        self._fail(queued, exception)
+                    return True
+
+                key = APP if problem == 'appminute' else job.tenant
+                self.paused[key] = max(self.paused.get(key, 0), time.time() + delay)
+                if job.attempts >= self.max_attempts:
+                    self._fail(job, exception)
+                    return True
+                self._queue(job)
+                return False
+            finally:
+                self.condition.notify_all()
@@ -0,0 +1,110 @@
+from datetime import date, datetime
+import re
+
+# The ISO 8601 timestamps Xero emits, e.g. 2013-05-31T06:07:35.3732465Z
+ISO_DATETIME = re.compile(
+    r'(\d{4})-(\d\d)-(\d\d)'
+    r'(?:T(\d\d):(\d\d)(?::(\d\d)(?:\.(\d+))?)?)?'
+    r'(Z|[+-]\d\d:?\d\d)?$'
+)
+
+# dateutil's UTC timezone; see utc().
+UTC = None
+
+
+def utc():
+    "dateutil's UTC timezone (dateutil is only imported once it's needed)"
+    global UTC
+    if UTC is None:
+        from dateutil.tz import tzutc
+        UTC = tzutc()
+    return UTC
+
+
+def parse(val):
+    "Parse a timestamp in any format dateutil understands"
+    from dateutil.parser import parse
+    return parse(val)
+
+
+def parse_boolean(val):
+    return True if val.lower() == 'true' else False
+
+
+def parse_datetime(val):
+    """Parse a timestamp into a datetime.
+
+    ISO 8601 timestamps (the only kind Xero emits) are parsed directly;
+    anything else is left to dateutil. Fractions of a second beyond
+    microseconds are truncated, as dateutil does.
+    """
+    match = ISO_DATETIME.match(val)
+    if match is None:
+        return parse(val)
+
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    tzinfo = None
+    if zone == 'Z':
+        tzinfo = UTC or utc()
+    elif zone:
+        from dateutil.tz import tzoffset
+        offset = (int(zone[1:3]) * 60 + int(zone[-2:])) * 60
+        tzinfo = tzoffset(None, -offset if zone[0] == '-' else offset)
+
+    return datetime(
+        int(year), int(month), int(day),
+        int(hour or 0), int(minute or 0), int(second or 0),
+        int(fraction[:6].ljust(6, '0')) if fraction else 0,
+        tzinfo
+    )
+
+
+def parse_date(val):
+    match = ISO_DATETIME.match(val)
+    if match is None:
+        return parse(val).date()
+    year, month, day = match.groups()[:3]
+    return date(int(year), int(month), int(day))
+
+
+# decimal is slow to import; it's imported by the first parse_decimal().
+Decimal = None
+
+
+def parse_decimal(val):
+    global Decimal
+    if Decimal is None:
+        from decimal import Decimal
+    return Decimal(val)
+
+
+# The callable that converts the text of each type of field.
+CONVERTERS = {
+    'boolean': parse_boolean,
+    'datetime': parse_datetime,
+    'date': parse_date,
+    'decimal': parse_decimal,
+}
+
+
+class Schema(object):
+    """The compiled field types of an endpoint.
+
+    Usage:
+
+        >>> schema = Schema(u'Invoice', MULTI_LINES, {u'Date': 'date', ...})
+        >>> schema.converters[u'Date'](u'2013-02-01T00:00:00')
+        datetime.date(2013, 2, 1)
+
+    `collections` is the set of tag names that represent an item in a
+    collection (the singular is always one), and `fields` maps a tag
+    name onto its type (a key of `converters`, CONVERTERS by default).
+    Fields not listed are left as unicode strings.
+    """
+    def __init__(self, singular, collections, fields, converters=CONVERTERS):
+        self.singular = singular
+        self.collections = frozenset(collections) | frozenset([singular])
+        self.fields = dict(fields)
+        self.converters = dict(
+            (field, converters[kind]) for field, kind in self.fields.items()
+        )
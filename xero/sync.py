@@ -0,0 +1,155 @@
+from datetime import datetime
+import json
+import os
+import tempfile
+import threading
+
+from .schema import parse_datetime
+
+# The field recording when a record was last modified.
+UPDATED_FIELD = u'UpdatedDateUTC'
+
+WATERMARK_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+def to_utc(value):
+    "Express a datetime as a naive datetime in UTC"
+    if value.tzinfo is not None:
+        value = (value - value.utcoffset()).replace(tzinfo=None)
+    return value
+
+
+class MemoryStore(object):
+    "Keeps watermarks in memory, for the lifetime of the process"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.watermarks = {}
+
+    def get(self, tenant, endpoint):
+        with self.lock:
+            return self.watermarks.get((tenant, endpoint))
+
+    def set(self, tenant, endpoint, watermark):
+        with self.lock:
+            self.watermarks[(tenant, endpoint)] = watermark
+
+
+class FileStore(object):
+    "Keeps watermarks in a JSON file"
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path) as store:
+                return json.load(store)
+        except IOError:
+            return {}
+
+    def get(self, tenant, endpoint):
+        with self.lock:
+            watermark = self._load().get(tenant, {}).get(endpoint)
+        if watermark:
+            return datetime.strptime(watermark, WATERMARK_FORMAT)
+
+    def set(self, tenant, endpoint, watermark):
+        with self.lock:
+            watermarks = self._load()
+            watermarks.setdefault(tenant, {})[endpoint] = watermark.strftime(WATERMARK_FORMAT)
+
+            # Replace the file atomically, so a crash can't corrupt it.
+            fd, path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+            with os.fdopen(fd, 'w') as store:
+                json.dump(watermarks, store)
+            os.rename(path, self.path)
+
+
+class SQLiteStore(object):
+    "Keeps watermarks in a SQLite database"
+
+    def __init__(self, path):
+        self.path = path
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS xero_watermarks ('
+            ' tenant TEXT NOT NULL,'
+            ' endpoint TEXT NOT NULL,'
+            ' watermark TEXT NOT NULL,'
+            ' PRIMARY KEY (tenant, endpoint))'
+        )
+
+    def _execute(self, sql, params=()):
+        "Execute a statement in its own transaction, returning the first row"
+        # A connection can't be shared between threads; make a new one
+        # for every statement.
+        import sqlite3
+        db = sqlite3.connect(self.path)
+        try:
+            with db:
+                return db.execute(sql, params).fetchone()
+        finally:
+            db.close()
+
+    def get(self, tenant, endpoint):
+        row = self._execute(
+            'SELECT watermark FROM xero_watermarks WHERE tenant = ? AND endpoint = ?',
+            (tenant, endpoint)
+        )
+        if row:
+            return datetime.strptime(row[0], WATERMARK_FORMAT)
+
+    def set(self, tenant, endpoint, watermark):
+        self._execute(
+            'INSERT OR REPLACE INTO xero_watermarks (tenant, endpoint, watermark) VALUES (?, ?, ?)',
+            (tenant, endpoint, watermark.strftime(WATERMARK_FORMAT))
+        )
+
+
+class Sync(object):
+    """Incrementally retrieves the records that changed since the last sync.
+
+    Usage:
+
+        >>> sync = Sync(xero, SQLiteStore('xero.db'), tenant=org_id)
+        >>> for invoice in sync.changes(u'Invoices'):
+        ...     save_to_warehouse(invoice)
+
+    The first sync of an endpoint retrieves every record; later syncs
+    only retrieve the records modified since the latest UpdatedDateUTC
+    seen by the previous one (its "watermark"), page by page. The
+    watermark is only stored once every change has been consumed, so
+    an interrupted sync is repeated in full next time. Records modified
+    in the same second as the watermark may be delivered again.
+    """
+    def __init__(self, xero, store, tenant='default'):
+        self.xero = xero
+        self.store = store
+        self.tenant = tenant
+
+    def watermark(self, endpoint):
+        "The modification time of the latest change already synced"
+        return self.store.get(self.tenant, endpoint)
+
+    def changes(self, endpoint, prefetch=0, **kwargs):
+        "Yield each record of the named endpoint changed since the last sync"
+        manager = getattr(self.xero, endpoint.lower())
+        since = self.watermark(endpoint)
+        if since:
+            kwargs['since'] = since
+
+        latest = since
+        for record in manager.paginate(prefetch=prefetch, **kwargs):
+            updated = record.get(UPDATED_FIELD)
+            if isinstance(updated, basestring):
+                # Decoded without conversion.
+                updated = parse_datetime(updated)
+            if isinstance(updated, datetime):
+                updated = to_utc(updated)
+                if latest is None or updated > latest:
+                    latest = updated
+            yield record
+
+        if latest and latest != since:
+            self.store.set(self.tenant, endpoint, latest)
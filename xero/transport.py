@@ -0,0 +1,29 @@
+# Number of connections kept alive to each host. Only needs to be
+# raised when requests are issued concurrently (e.g., with prefetching).
+DEFAULT_POOL_SIZE = 10
+
+# Number of times a request is retried when a connection to the
+# server can't be established. Requests that have reached the server
+# are never retried at this level.
+DEFAULT_MAX_RETRIES = 3
+
+
+def make_session(pool_size=DEFAULT_POOL_SIZE, max_retries=DEFAULT_MAX_RETRIES):
+    """Construct a requests Session with a pool of keep-alive connections.
+
+    `max_retries` can be an integer or a urllib3 Retry instance, as
+    accepted by requests' HTTPAdapter.
+    """
+    # requests is slow to import; it isn't needed until a session is.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=max_retries,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session